@@ -54,11 +54,12 @@ if __name__ == "__main__":
     for mensa in mensen:
         logging.info(f"\nGet dishes of {mensa} by category...")
         # Get dishes by category
-        dishes_by_category = scraper.scrape_menu_by_category(
+        menu = scraper.scrape_menu(
             mensa=mensa
         )
 
-        if dishes_by_category:
+        if menu:
+            dishes_by_category = menu.dishes_by_category
             for key in dishes_by_category:
                 logging.info(f"\nDishes for {key}:")
                 for value in dishes_by_category[key]:
@@ -66,8 +67,8 @@ if __name__ == "__main__":
 
             notifier.send_notification(
                 message=dishes_by_category,
-                website=scraper.full_url,
-                location=scraper.mensa_name
+                website=menu.url,
+                location=menu.mensa_name
             )
 
     logging.info(
@@ -75,11 +75,12 @@ if __name__ == "__main__":
 
     logging.info(f"\nGet dishes of {mensa} by category...")
     # Get dishes by category
-    dishes_by_category = scraper.scrape_menu_by_category(
+    menu = scraper.scrape_menu(
         mensa=mensa
     )
 
-    if dishes_by_category:
+    if menu:
+        dishes_by_category = menu.dishes_by_category
         for key in dishes_by_category:
             logging.info(f"\nDishes for {key}:")
             for value in dishes_by_category[key]:
@@ -87,8 +88,7 @@ if __name__ == "__main__":
 
         # Find matches with favourite food
         logging.info("Find matches with favourite food...")
-        matches = scraper.find_matches(
-            # dishes=dishes_by_category,  # Optional
+        matches = menu.find_matches(
             keywords=favorite_foods
         )
 
@@ -97,8 +97,8 @@ if __name__ == "__main__":
 
             notifier.send_notification(
                 message=matches,
-                website=scraper.full_url,
-                location=scraper.mensa_name
+                website=menu.url,
+                location=menu.mensa_name
             )
             logging.info("Finished execution of example_2.py.")
 
@@ -25,10 +25,12 @@ setup(
     install_requires=[
         "requests>=2.32.3",
         "beautifulsoup4>=4.13.3",
-        "dash>=3.0.0"
+        "dash>=3.0.0",
+        "plotly"
     ],
     extras_require={
         "dev": [
+            "aiosmtpd",
             "pytest",
             "ruff"
         ]
@@ -37,6 +39,8 @@ setup(
     entry_points={
         'console_scripts': [
             'lunchhunt-web = lunchhunt.web.webUI:main',
+            'lunchhunt-run = lunchhunt.schedule.cli:main',
+            'lunchhunt-import-profiles = lunchhunt.profiles.sqlite_store:main',
         ]
     },
 )
@@ -1,13 +1,17 @@
 __version__ = "0.1.0"
 __author__ = "Thomas R. Holy"
 
-from .notify import Notifier
-from .scrap import MensaScraper
+from .notify import NotificationDispatcher, Notifier
+from .profiles import SubscriptionIndex
+from .scrap import MensaScraper, MenuResult
 from .utils import load_settings, update_menu_categories
 
 __all__ = [
     "MensaScraper",
+    "MenuResult",
+    "NotificationDispatcher",
     "Notifier",
+    "SubscriptionIndex",
     "load_settings",
     "update_menu_categories"
 ]
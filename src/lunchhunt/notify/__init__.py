@@ -1,5 +1,25 @@
+from .dispatcher import NotificationDispatcher
 from .notifier import Notifier
+from .sinks import (
+    GotifySink,
+    NotificationSink,
+    NtfySink,
+    SmtpSink,
+    WebhookSink,
+    create_sinks,
+)
+from .throttle import SEND_THROTTLE, SendThrottle, TokenBucket
 
 __all__ = [
+    "SEND_THROTTLE",
+    "GotifySink",
+    "NotificationDispatcher",
+    "NotificationSink",
     "Notifier",
+    "NtfySink",
+    "SendThrottle",
+    "SmtpSink",
+    "TokenBucket",
+    "WebhookSink",
+    "create_sinks",
 ]
@@ -0,0 +1,118 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Optional, Union
+
+from lunchhunt.notify.formatter import render_message
+from lunchhunt.notify.sinks import NotificationSink
+
+
+class NotificationDispatcher:
+    """
+    Fans a notification out to several sinks in parallel.
+
+    Every sink gets its own thread pool, so a slow or hanging backend only
+     ever backs up its own deliveries and never delays the other sinks.
+    """
+
+    def __init__(
+            self,
+            sinks: list[NotificationSink],
+            priority: int = 5
+    ):
+        """
+        Initializes the dispatcher with the sinks to deliver to.
+
+        :param sinks: Sinks that receive every notification.
+        :param priority: Default message priority level (default: 5).
+        """
+        self.sinks = sinks
+        self.priority = priority
+
+        self._pools = [
+            ThreadPoolExecutor(
+                max_workers=sink.max_workers,
+                thread_name_prefix=f"sink-{sink.name}"
+            ) for sink in sinks
+        ]
+
+        self.logger = logging.getLogger(__name__)
+
+    def send_notification(
+            self,
+            message: Union[list[str], str, dict[str, list[str]]],
+            website: Optional[str] = None,
+            location: Optional[str] = None,
+            title: Optional[str] = "‼️LunchHunt‼️",
+            priority: Optional[int] = None,
+    ) -> dict[str, bool]:
+        """
+        Sends a notification to all sinks and waits at most each sink's
+         timeout for its delivery. The timeout of a rate-limited sink starts
+         when its reserved send slot is due, so waiting for the rate limit
+         is not counted as a timeout.
+
+        :param message: Single message, list of messages,
+         or categorized dictionary.
+        :param location: Mensa location (optional).
+        :param website: Mensa website (optional).
+        :param title: Notification title (optional, default: '‼️LunchHunt‼️').
+        :param priority: Message priority
+         (optional, default: class default priority).
+        :return: Dictionary mapping sink names to delivery success.
+        """
+        full_message = render_message(location, website, message)
+
+        if not full_message.strip():
+            self.logger.warning(
+                "No valid message content to send. Skipping notification.")
+            return {}
+
+        priority = priority or self.priority
+        results = {}
+        futures = []
+        for sink, pool in zip(self.sinks, self._pools):
+            # Reserve the slot before the delivery deadline starts
+            try:
+                due = time.monotonic() + sink.reserve()
+            except Exception as e:
+                results[sink.name] = False
+                self.logger.error(
+                    f"Failed to send notification to {sink.name}: {e}")
+                continue
+            futures.append((sink, due, pool.submit(
+                sink.send, title, full_message, priority
+            )))
+
+        for sink, due, future in futures:
+            remaining = max(0.0, due + sink.timeout - time.monotonic())
+            try:
+                future.result(timeout=remaining)
+                results[sink.name] = True
+                self.logger.info(f"Notification sent to {sink.name}!")
+            except FutureTimeoutError:
+                results[sink.name] = False
+                self.logger.error(
+                    f"Sink {sink.name} timed out after {sink.timeout}s.")
+            except Exception as e:
+                results[sink.name] = False
+                self.logger.error(
+                    f"Failed to send notification to {sink.name}: {e}")
+
+        return results
+
+    def close(self) -> None:
+        """
+        Shuts down the sink pools without waiting for pending deliveries.
+
+        :return: None
+        """
+        for pool in self._pools:
+            pool.shutdown(wait=False)
+
+    def __enter__(self) -> "NotificationDispatcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,132 @@
+import logging
+from functools import lru_cache
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Number of distinct rendered digests kept for reuse within a run
+RENDER_CACHE_SIZE = 128
+
+
+def render_message(
+        location: Optional[str],
+        website: Optional[str],
+        msg_input: Union[list[str], str, dict[str, list[str]]],
+) -> str:
+    """
+    Formats a message like `format_message`, but reuses the rendered string
+     for identical (location, website, message) content. Profiles that match
+     the same dishes at the same Mensa therefore share a single rendering.
+
+    :param location: Mensa location (optional).
+    :param website: Mensa website (optional).
+    :param msg_input: Message input (string, list, or dictionary).
+    :return: Formatted string ready to send as a notification.
+    """
+    try:
+        if isinstance(msg_input, dict):
+            key = ("dict", tuple(
+                (category, tuple(dishes))
+                for category, dishes in msg_input.items()
+            ))
+        elif isinstance(msg_input, list):
+            key = ("list", tuple(msg_input))
+        else:
+            key = ("str", msg_input)
+        return _render_cached(location, website, key)
+    except TypeError:
+        # Unhashable content cannot be cached
+        return format_message(location, website, msg_input)
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _render_cached(
+        location: Optional[str],
+        website: Optional[str],
+        key: tuple
+) -> str:
+    """
+    Renders the frozen message content produced by `render_message`.
+
+    :param location: Mensa location (optional).
+    :param website: Mensa website (optional).
+    :param key: Tuple of the input kind and its frozen content.
+    :return: Formatted string ready to send as a notification.
+    """
+    kind, content = key
+    if kind == "dict":
+        msg_input = {category: list(dishes) for category, dishes in content}
+    elif kind == "list":
+        msg_input = list(content)
+    else:
+        msg_input = content
+    return format_message(location, website, msg_input)
+
+
+def render_cache_info():
+    """
+    Returns hit and miss statistics of the rendered-message cache.
+
+    :return: Named tuple with hits, misses, maxsize and currsize.
+    """
+    return _render_cached.cache_info()
+
+
+def format_message(
+        location: Optional[str],
+        website: Optional[str],
+        msg_input: Union[list[str], str, dict[str, list[str]]],
+) -> str:
+    """
+    Parses the input message and ensures proper formatting
+     for notifications.
+
+    :param location: Mensa location (optional).
+    :param website: Mensa website (optional).
+    :param msg_input: Message input (string, list, or dictionary).
+    :return: Formatted string ready to send as a notification.
+    """
+    if isinstance(msg_input, str):
+        msg_input = [msg_input]  # Convert single message to list
+
+    if isinstance(msg_input, dict):
+        return format_dict_message(location, website, msg_input)
+
+    if isinstance(msg_input, list):
+        msg_list = msg_input.copy()
+        if location:
+            msg_list.insert(0, location)
+        if website:
+            msg_list.append(website)
+        return "\n".join(msg_list)
+
+    logger.error("Invalid message format. Expected str, list, or dict.")
+    return ""
+
+
+def format_dict_message(
+        location: Optional[str],
+        website: Optional[str],
+        msg_dict: dict[str, list[str]]
+) -> str:
+    """
+    Formats a dictionary of messages into a structured string.
+
+    :param location: Mensa location (optional).
+    :param website: Mensa website (optional).
+    :param msg_dict: Dictionary where keys are categories and
+     values are lists of messages.
+    :return: Formatted string representation of the dictionary.
+    """
+    message_parts = []
+
+    for category, dishes in msg_dict.items():
+        category_header = f"\n{category.upper()} - {location}"\
+            if location else f"\n{category.upper()}"
+        message_parts.append(category_header)
+        message_parts.extend(dishes)
+
+    if website:
+        message_parts.append(website)
+
+    return "\n".join(message_parts)
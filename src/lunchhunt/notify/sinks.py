@@ -0,0 +1,386 @@
+import logging
+import smtplib
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from email.message import EmailMessage
+from typing import Any, Optional, Union
+from urllib.parse import urlparse, urlunparse
+
+import requests
+
+from lunchhunt.notify.throttle import SEND_THROTTLE, SendThrottle
+
+
+def build_url(
+        server_url: str,
+        path: str = "",
+        secure: bool = False
+) -> str:
+    """
+    Normalizes a server address into a full URL with the given path.
+
+    :param server_url: Server address with or without scheme.
+    :param path: Path to append to the server address (default: '').
+    :param secure: Use HTTPS if True, otherwise HTTP (default: False).
+    :return: Full URL with the scheme chosen by the secure flag.
+    """
+    parsed = urlparse(server_url)
+
+    # If no scheme, treat entire input as netloc
+    if not parsed.scheme:
+        netloc = parsed.path
+    else:
+        netloc = parsed.netloc or parsed.path
+
+    # Override scheme based on secure flag
+    scheme = "https" if secure else "http"
+
+    return urlunparse((scheme, netloc, path, '', '', ''))
+
+
+class NotificationSink(ABC):
+    """
+    Base class for notification backends.
+
+    A sink delivers an already formatted message and raises on failure,
+     so that callers can decide how to log and report errors.
+    """
+
+    def __init__(
+            self,
+            name: Optional[str] = None,
+            timeout: Union[int, float] = 10,
+            max_workers: int = 1
+    ):
+        """
+        Initializes the sink.
+
+        :param name: Name used in logs and dispatch results
+         (default: class name).
+        :param timeout: Timeout in seconds for a single delivery (default: 10).
+        :param max_workers: Size of the sink's own delivery pool (default: 1).
+        """
+        self.name = name or type(self).__name__
+        self.timeout = timeout
+        self.max_workers = max_workers
+
+        self.logger = logging.getLogger(__name__)
+
+    def reserve(self) -> float:
+        """
+        Reserves a delivery slot ahead of a call to `send`, for backends
+         that are rate limited. The dispatcher starts a delivery's timeout
+         only once its slot is due.
+
+        :return: Seconds until the reserved slot is due (default: 0.0).
+        """
+        return 0.0
+
+    @abstractmethod
+    def send(
+            self,
+            title: str,
+            message: str,
+            priority: int
+    ) -> None:
+        """
+        Delivers a message, using a slot reserved with `reserve` if there
+         is one.
+
+        :param title: Notification title.
+        :param message: Formatted message body.
+        :param priority: Message priority on the Gotify scale (0-10).
+        """
+
+
+class GotifySink(NotificationSink):
+    """
+    Delivers messages to the '/message' endpoint of a Gotify server.
+    """
+
+    def __init__(
+            self,
+            server_url: str,
+            token: str,
+            secure: bool = False,
+            server_rate: Optional[Union[int, float]] = None,
+            token_rate: Optional[Union[int, float]] = None,
+            burst: int = 1,
+            throttle: Optional[SendThrottle] = None,
+            **kwargs: Any
+    ):
+        """
+        Initializes the sink with server details and application token.
+
+        :param server_url: The URL of the Gotify server.
+        :param token: Application token for the server.
+        :param secure: Use HTTPS if True, otherwise HTTP (default: False).
+        :param server_rate: Maximum sends per second to this server across
+         all tokens (default: no limit).
+        :param token_rate: Maximum sends per second with this token
+         (default: no limit).
+        :param burst: Maximum number of sends allowed back to back
+         (default: 1).
+        :param throttle: Throttle holding the rate limits
+         (default: process-wide throttle).
+        """
+        super().__init__(**kwargs)
+        self.server_url = build_url(server_url, '/message', secure)
+        self.token = token
+        self.session = requests.Session()
+
+        self.server_rate = server_rate
+        self.token_rate = token_rate
+        self.burst = burst
+        self.throttle = throttle or SEND_THROTTLE
+
+        # Monotonic times the slots reserved for coming sends are due
+        self._reserved: deque[float] = deque()
+        self._reserved_lock = threading.Lock()
+
+    def reserve(self) -> float:
+        wait = self.throttle.reserve(
+            self.server_url, self.token,
+            server_rate=self.server_rate,
+            token_rate=self.token_rate,
+            burst=self.burst
+        )
+        with self._reserved_lock:
+            self._reserved.append(time.monotonic() + wait)
+        return wait
+
+    def send(
+            self,
+            title: str,
+            message: str,
+            priority: int
+    ) -> None:
+        payload = {
+            "title": title,
+            "message": message,
+            "priority": priority,
+        }
+        headers = {"X-Gotify-Key": self.token}
+
+        with self._reserved_lock:
+            due = self._reserved.popleft() if self._reserved else None
+        if due is None:
+            self.throttle.acquire(
+                self.server_url, self.token,
+                server_rate=self.server_rate,
+                token_rate=self.token_rate,
+                burst=self.burst
+            )
+        elif due > time.monotonic():
+            time.sleep(due - time.monotonic())
+        response = self.session.post(
+            self.server_url, json=payload, headers=headers,
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+
+
+class WebhookSink(NotificationSink):
+    """
+    Posts messages as JSON to a generic webhook URL.
+    """
+
+    def __init__(
+            self,
+            url: str,
+            headers: Optional[dict[str, str]] = None,
+            **kwargs: Any
+    ):
+        """
+        Initializes the sink with the webhook URL.
+
+        :param url: Full URL of the webhook.
+        :param headers: Additional HTTP headers, e.g. for authentication.
+        """
+        super().__init__(**kwargs)
+        self.url = url
+        self.headers = headers or {}
+        self.session = requests.Session()
+
+    def send(
+            self,
+            title: str,
+            message: str,
+            priority: int
+    ) -> None:
+        payload = {
+            "title": title,
+            "message": message,
+            "priority": priority,
+        }
+
+        response = self.session.post(
+            self.url, json=payload, headers=self.headers,
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+
+
+class NtfySink(NotificationSink):
+    """
+    Publishes messages to a topic of an ntfy-compatible server.
+    """
+
+    def __init__(
+            self,
+            server_url: str,
+            topic: str,
+            token: Optional[str] = None,
+            secure: bool = False,
+            **kwargs: Any
+    ):
+        """
+        Initializes the sink with server details and topic.
+
+        :param server_url: The URL of the ntfy server.
+        :param topic: Topic to publish to.
+        :param token: Access token for protected topics (optional).
+        :param secure: Use HTTPS if True, otherwise HTTP (default: False).
+        """
+        super().__init__(**kwargs)
+        self.url = build_url(server_url, '/', secure)
+        self.topic = topic
+        self.token = token
+        self.session = requests.Session()
+
+    @staticmethod
+    def _ntfy_priority(priority: int) -> int:
+        """
+        Maps a Gotify priority (0-10) onto the ntfy scale (1-5).
+
+        :param priority: Gotify priority.
+        :return: ntfy priority.
+        """
+        return min(5, max(1, round(priority / 2)))
+
+    def send(
+            self,
+            title: str,
+            message: str,
+            priority: int
+    ) -> None:
+        # JSON publishing keeps non-ASCII titles out of HTTP headers
+        payload = {
+            "topic": self.topic,
+            "title": title,
+            "message": message,
+            "priority": self._ntfy_priority(priority),
+        }
+        headers = {"Authorization": f"Bearer {self.token}"}\
+            if self.token else {}
+
+        response = self.session.post(
+            self.url, json=payload, headers=headers, timeout=self.timeout
+        )
+        response.raise_for_status()
+
+
+class SmtpSink(NotificationSink):
+    """
+    Sends messages as e-mail through an SMTP server.
+    """
+
+    def __init__(
+            self,
+            sender: str,
+            recipients: Union[list[str], str],
+            host: str = "localhost",
+            port: int = 25,
+            username: Optional[str] = None,
+            password: Optional[str] = None,
+            starttls: bool = False,
+            **kwargs: Any
+    ):
+        """
+        Initializes the sink with SMTP server details and addresses.
+
+        :param sender: Sender address.
+        :param recipients: Single recipient or list of recipients.
+        :param host: SMTP server host (default: 'localhost').
+        :param port: SMTP server port (default: 25).
+        :param username: Login user (optional).
+        :param password: Login password (optional).
+        :param starttls: Upgrade the connection with STARTTLS (default: False).
+        """
+        super().__init__(**kwargs)
+        self.sender = sender
+        self.recipients = (
+            [recipients] if isinstance(recipients, str) else recipients
+        )
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+
+    def send(
+            self,
+            title: str,
+            message: str,
+            priority: int
+    ) -> None:
+        email = EmailMessage()
+        email["Subject"] = title
+        email["From"] = self.sender
+        email["To"] = ", ".join(self.recipients)
+        email.set_content(message)
+
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.starttls:
+                smtp.starttls()
+            if self.username and self.password:
+                smtp.login(self.username, self.password)
+            smtp.send_message(email)
+
+
+SINK_TYPES: dict[str, type[NotificationSink]] = {
+    "gotify": GotifySink,
+    "webhook": WebhookSink,
+    "ntfy": NtfySink,
+    "smtp": SmtpSink,
+}
+
+
+def create_sinks(
+        gotify_settings: Optional[dict] = None,
+        sink_settings: Optional[list[dict]] = None
+) -> list[NotificationSink]:
+    """
+    Creates the notification sinks of a profile.
+
+    :param gotify_settings: The profile's 'gotify_settings'. A Gotify sink
+     is created if a server URL is set.
+    :param sink_settings: List of additional sink configurations. Each entry
+     needs a 'type' key ('gotify', 'webhook', 'ntfy' or 'smtp'); all other
+     keys are passed to the sink's constructor.
+    :return: List of configured sinks.
+    """
+    sinks: list[NotificationSink] = []
+
+    if gotify_settings and gotify_settings.get("server_url"):
+        sinks.append(GotifySink(
+            server_url=gotify_settings["server_url"],
+            token=gotify_settings["token"],
+            secure=gotify_settings.get("secure", False),
+            server_rate=gotify_settings.get("server_rate"),
+            token_rate=gotify_settings.get("token_rate"),
+            burst=gotify_settings.get("burst", 1),
+            name="gotify"
+        ))
+
+    for index, settings in enumerate(sink_settings or []):
+        settings = dict(settings)
+        sink_type = settings.pop("type", None)
+        if sink_type not in SINK_TYPES:
+            raise ValueError(f"Unknown sink type: {sink_type}")
+        settings.setdefault("name", f"{sink_type}-{index}")
+        sinks.append(SINK_TYPES[sink_type](**settings))
+
+    return sinks
@@ -0,0 +1,217 @@
+import logging
+import threading
+import time
+from typing import Optional, Union
+
+
+class TokenBucket:
+    """
+    Token bucket that hands out send slots at a steady rate.
+
+    Callers reserve a slot and are told how long to wait for it. Reservations
+     may drive the bucket below zero, which queues later callers behind
+     earlier ones in arrival order.
+    """
+
+    def __init__(
+            self,
+            rate: Union[int, float],
+            burst: int = 1
+    ):
+        """
+        Initializes a full bucket.
+
+        :param rate: Refill rate in sends per second.
+        :param burst: Maximum number of sends allowed back to back
+         (default: 1).
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be positive.")
+
+        self.rate = float(rate)
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Reserves one send slot.
+
+        :return: Seconds to wait before the reserved slot may be used.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            self.tokens -= 1
+            return max(0.0, -self.tokens / self.rate)
+
+    def update(
+            self,
+            rate: Union[int, float],
+            burst: int = 1
+    ) -> None:
+        """
+        Changes the rate and burst; slots reserved so far keep their times.
+
+        :param rate: Refill rate in sends per second.
+        :param burst: Maximum number of sends allowed back to back
+         (default: 1).
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be positive.")
+
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            self.rate = float(rate)
+            self.burst = max(1, burst)
+            self.tokens = min(self.tokens, float(self.burst))
+
+
+class SendThrottle:
+    """
+    Rate limits sends per server and per application token, and records how
+     long senders waited in the queue.
+
+    Senders of one server or token may ask for different limits, e.g.
+     profiles configured differently. The strictest limit asked for wins,
+     so the server is never sent more than any of its senders allows.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty throttle; buckets are created on first use.
+        """
+        self._buckets: dict[tuple, TokenBucket] = {}
+        self._conflicts: set[tuple] = set()
+        self._lock = threading.Lock()
+
+        self._wait_count = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+        self.logger = logging.getLogger(__name__)
+
+    def __bucket(
+            self,
+            key: tuple,
+            rate: Optional[Union[int, float]],
+            burst: int
+    ) -> Optional[TokenBucket]:
+        """
+        Returns the bucket for a key, creating it with the given rate. If
+         the bucket exists with a different limit, the stricter rate and
+         burst are applied.
+
+        :param key: Bucket key.
+        :param rate: Sends per second, or None for no limit.
+        :param burst: Maximum number of sends allowed back to back.
+        :return: Bucket or None if the key is not rate limited.
+        """
+        if not rate:
+            return None
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(rate, burst)
+            elif (rate, max(1, burst)) != (bucket.rate, bucket.burst):
+                previous = (bucket.rate, bucket.burst)
+                strict = (min(bucket.rate, float(rate)),
+                          min(bucket.burst, max(1, burst)))
+                if strict != previous:
+                    bucket.update(*strict)
+                if (key, rate, burst) not in self._conflicts:
+                    self._conflicts.add((key, rate, burst))
+                    self.logger.warning(
+                        "Conflicting rate limits for %s: %s/s (burst %d) "
+                        "requested, %s/s (burst %d) set before; applying "
+                        "%s/s (burst %d).",
+                        key[:2], rate, burst, *previous, *strict
+                    )
+            return bucket
+
+    def reserve(
+            self,
+            server: str,
+            token: Optional[str] = None,
+            server_rate: Optional[Union[int, float]] = None,
+            token_rate: Optional[Union[int, float]] = None,
+            burst: int = 1
+    ) -> float:
+        """
+        Reserves a send to the server with the token without waiting for it.
+
+        :param server: Server URL.
+        :param token: Application token (optional).
+        :param server_rate: Sends per second for the server (default: no limit).
+        :param token_rate: Sends per second for the token (default: no limit).
+        :param burst: Maximum number of sends allowed back to back
+         (default: 1).
+        :return: Seconds until the reserved send is allowed.
+        """
+        buckets = [
+            self.__bucket(("server", server), server_rate, burst),
+            self.__bucket(("token", server, token), token_rate, burst),
+        ]
+        wait = max(
+            [bucket.reserve() for bucket in buckets if bucket] or [0.0]
+        )
+
+        with self._lock:
+            self._wait_count += 1
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+        return wait
+
+    def acquire(
+            self,
+            server: str,
+            token: Optional[str] = None,
+            server_rate: Optional[Union[int, float]] = None,
+            token_rate: Optional[Union[int, float]] = None,
+            burst: int = 1
+    ) -> float:
+        """
+        Blocks until a send to the server with the token is allowed.
+
+        :param server: Server URL.
+        :param token: Application token (optional).
+        :param server_rate: Sends per second for the server (default: no limit).
+        :param token_rate: Sends per second for the token (default: no limit).
+        :param burst: Maximum number of sends allowed back to back
+         (default: 1).
+        :return: Seconds spent waiting in the queue.
+        """
+        wait = self.reserve(server, token, server_rate, token_rate, burst)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def wait_stats(self) -> dict[str, float]:
+        """
+        Returns queue wait time statistics of all sends so far.
+
+        :return: Dictionary with 'count', 'total', 'mean' and 'max' wait time
+         in seconds.
+        """
+        with self._lock:
+            return {
+                "count": self._wait_count,
+                "total": self._wait_total,
+                "mean": (self._wait_total / self._wait_count
+                         if self._wait_count else 0.0),
+                "max": self._wait_max,
+            }
+
+
+# Shared by all Gotify senders of a process, so that limits hold across
+# profiles that notify the same server
+SEND_THROTTLE = SendThrottle()
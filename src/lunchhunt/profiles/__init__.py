@@ -0,0 +1,9 @@
+from .index import SubscriptionIndex
+from .sqlite_store import SqliteProfileStore
+from .store import ProfileStore
+
+__all__ = [
+    "ProfileStore",
+    "SqliteProfileStore",
+    "SubscriptionIndex",
+]
@@ -0,0 +1,163 @@
+import logging
+import threading
+from typing import Optional, Union
+
+from lunchhunt.utils import load_profiles
+
+
+class SubscriptionIndex:
+    """
+    In-memory index from (mensa, category) to the profiles subscribed to it.
+
+    The index answers "which profiles care about this menu" without loading
+     every settings file, and is updated incrementally when a single profile
+     is saved or deleted.
+    """
+
+    def __init__(
+            self,
+            profiles: Optional[dict[str, dict]] = None
+    ):
+        """
+        Initializes the index from a mapping of profile names to settings.
+
+        :param profiles: Dictionary mapping profile names (settings file
+         names) to their loaded settings (default: empty index).
+        """
+        self._subscribers: dict[tuple[str, str], set[str]] = {}
+        self._keys: dict[str, set[tuple[str, str]]] = {}
+        self._lock = threading.Lock()
+
+        self.logger = logging.getLogger(__name__)
+
+        for name, settings in (profiles or {}).items():
+            self.add(name, settings)
+
+    @classmethod
+    def from_directory(
+            cls,
+            settings_dir: str
+    ) -> "SubscriptionIndex":
+        """
+        Builds the index from all profiles in a settings directory.
+
+        :param settings_dir: Directory containing the JSON settings files.
+        :return: Populated SubscriptionIndex.
+        """
+        return cls(load_profiles(settings_dir))
+
+    @staticmethod
+    def __subscription_keys(
+            settings: dict
+    ) -> set[tuple[str, str]]:
+        """
+        Extracts the (mensa, category) pairs a profile subscribes to.
+
+        :param settings: Loaded profile settings.
+        :return: Set of (mensa, category) tuples.
+        """
+        scraper_settings = settings.get("scraper_settings", {})
+        mensen = scraper_settings.get("mensen") or []
+        categories = scraper_settings.get("menu_categories") or []
+
+        mensen = [mensen] if isinstance(mensen, str) else mensen
+        categories = [categories] if isinstance(categories, str) \
+            else categories
+
+        return {
+            (mensa, category) for mensa in mensen for category in categories
+        }
+
+    def add(
+            self,
+            name: str,
+            settings: dict
+    ) -> None:
+        """
+        Adds a profile or replaces its previous subscriptions.
+
+        :param name: Profile name (settings file name).
+        :param settings: Loaded profile settings.
+        :return: None
+        """
+        keys = self.__subscription_keys(settings)
+        with self._lock:
+            self.__discard(name)
+            self._keys[name] = keys
+            for key in keys:
+                self._subscribers.setdefault(key, set()).add(name)
+
+    def remove(
+            self,
+            name: str
+    ) -> None:
+        """
+        Removes a profile from the index.
+
+        :param name: Profile name (settings file name).
+        :return: None
+        """
+        with self._lock:
+            self.__discard(name)
+
+    def __discard(
+            self,
+            name: str
+    ) -> None:
+        """
+        Removes a profile's subscriptions; the caller holds the lock.
+
+        :param name: Profile name (settings file name).
+        :return: None
+        """
+        for key in self._keys.pop(name, set()):
+            subscribers = self._subscribers.get(key)
+            if subscribers is not None:
+                subscribers.discard(name)
+                if not subscribers:
+                    del self._subscribers[key]
+
+    def subscribers(
+            self,
+            mensa: str,
+            categories: Optional[Union[list[str], str]] = None
+    ) -> set[str]:
+        """
+        Returns the profiles subscribed to a Mensa.
+
+        :param mensa: Mensa code.
+        :param categories: Category or categories to restrict the lookup to
+         (default: all categories).
+        :return: Set of profile names.
+        """
+        if isinstance(categories, str):
+            categories = [categories]
+
+        with self._lock:
+            if categories is None:
+                return {
+                    name for (code, _), names in self._subscribers.items()
+                    if code == mensa for name in names
+                }
+            return {
+                name for category in categories
+                for name in self._subscribers.get((mensa, category), ())
+            }
+
+    def subscriptions(self) -> dict[str, set[str]]:
+        """
+        Returns every subscribed Mensa with the union of its categories.
+
+        :return: Dictionary mapping Mensa codes to category sets.
+        """
+        with self._lock:
+            mensen: dict[str, set[str]] = {}
+            for mensa, category in self._subscribers:
+                mensen.setdefault(mensa, set()).add(category)
+            return mensen
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
@@ -0,0 +1,473 @@
+import argparse
+import json
+import logging
+import sqlite3
+import sys
+import threading
+from typing import Optional
+
+from lunchhunt.profiles.store import ChangeListener
+from lunchhunt.utils import load_profiles
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    name TEXT PRIMARY KEY,
+    settings TEXT NOT NULL,
+    hour INTEGER,
+    minute INTEGER,
+    revision INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS subscriptions (
+    name TEXT NOT NULL REFERENCES profiles(name) ON DELETE CASCADE,
+    mensa TEXT NOT NULL,
+    category TEXT NOT NULL,
+    PRIMARY KEY (name, mensa, category)
+);
+CREATE INDEX IF NOT EXISTS idx_subscriptions_mensa_category
+    ON subscriptions (mensa, category);
+CREATE INDEX IF NOT EXISTS idx_subscriptions_category
+    ON subscriptions (category);
+CREATE INDEX IF NOT EXISTS idx_profiles_schedule
+    ON profiles (hour, minute);
+"""
+
+
+class SqliteProfileStore:
+    """
+    Profile store backed by a SQLite database, as an alternative to loose
+     JSON files for large numbers of profiles.
+
+    Besides the settings of each profile, its subscriptions and schedule
+     time are stored in indexed columns, so listing, searching, and finding
+     the subscribers of a Mensa or the profiles due at a time are single
+     index lookups. The store offers the same interface as `ProfileStore`.
+
+    Every write stamps its profile with a new revision. Reads first check
+     `PRAGMA data_version`, which only changes when another connection,
+     e.g. another worker process, committed; only then are the revisions
+     compared and the listeners notified of the other connection's changes.
+    """
+
+    def __init__(
+            self,
+            path: str
+    ):
+        """
+        Opens or creates the database.
+
+        :param path: Path of the SQLite database file, or ':memory:'.
+        """
+        self.path = path
+
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.executescript(SCHEMA)
+        columns = {
+            row[1] for row in
+            self._connection.execute("PRAGMA table_info(profiles)")
+        }
+        if "revision" not in columns:
+            # Databases created before profiles carried revisions
+            self._connection.execute(
+                "ALTER TABLE profiles "
+                "ADD COLUMN revision INTEGER NOT NULL DEFAULT 0"
+            )
+        self._listeners: list[ChangeListener] = []
+        self._lock = threading.Lock()
+
+        # name -> revision of the profiles as last seen by this connection
+        self._revisions: dict[str, int] = dict(self._connection.execute(
+            "SELECT name, revision FROM profiles"
+        ).fetchall())
+        self._data_version = self.__data_version()
+
+        self.logger = logging.getLogger(__name__)
+
+    def subscribe(
+            self,
+            listener: ChangeListener
+    ) -> None:
+        """
+        Registers a listener that is called on every profile change.
+
+        :param listener: Callable receiving the profile name and its new
+         settings, or None if the profile was deleted.
+        :return: None
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def __notify(
+            self,
+            name: str,
+            settings: Optional[dict]
+    ) -> None:
+        """
+        Notifies all listeners of a change.
+
+        :param name: Profile name.
+        :param settings: New settings or None if deleted.
+        :return: None
+        """
+        for listener in list(self._listeners):
+            try:
+                listener(name, settings)
+            except Exception as e:
+                self.logger.error("Profile listener failed for %s: %s",
+                                  name, e)
+
+    def __data_version(self) -> int:
+        """
+        Returns the data version of the connection, which changes whenever
+         another connection committed to the database.
+
+        :return: Data version.
+        """
+        return self._connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def refresh(self) -> None:
+        """
+        Notifies the listeners of the profiles other connections changed
+         since the last check. Without such changes, this costs one pragma.
+
+        :return: None
+        """
+        changes = []
+        with self._lock:
+            data_version = self.__data_version()
+            if data_version == self._data_version:
+                return
+            self._data_version = data_version
+
+            revisions = dict(self._connection.execute(
+                "SELECT name, revision FROM profiles"
+            ).fetchall())
+            for name in set(self._revisions) - set(revisions):
+                changes.append((name, None))
+            for name, revision in revisions.items():
+                if self._revisions.get(name) == revision:
+                    continue
+                row = self._connection.execute(
+                    "SELECT settings FROM profiles WHERE name = ?", (name,)
+                ).fetchone()
+                if row is not None:
+                    changes.append((name, json.loads(row[0])))
+            self._revisions = revisions
+
+        for name, settings in changes:
+            self.__notify(name, settings)
+
+    def __query(
+            self,
+            sql: str,
+            parameters: tuple = ()
+    ) -> list[tuple]:
+        """
+        Runs a read query, after notifying the listeners of the changes of
+         other connections.
+
+        :param sql: SQL statement.
+        :param parameters: Statement parameters.
+        :return: List of result rows.
+        """
+        self.refresh()
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    def __write(
+            self,
+            name: str,
+            settings: dict
+    ) -> None:
+        """
+        Inserts or replaces a profile within the current transaction.
+
+        :param name: Profile name (settings file name).
+        :param settings: Settings to store.
+        :return: None
+        """
+        schedule_settings = settings.get("schedule_settings") or {}
+        scraper_settings = settings.get("scraper_settings") or {}
+        mensen = scraper_settings.get("mensen") or []
+        categories = scraper_settings.get("menu_categories") or []
+        mensen = [mensen] if isinstance(mensen, str) else mensen
+        categories = [categories] if isinstance(categories, str) \
+            else categories
+
+        self._connection.execute(
+            "INSERT INTO meta (key, value) VALUES ('revision', 1) "
+            "ON CONFLICT (key) DO UPDATE SET value = value + 1"
+        )
+        revision = self._connection.execute(
+            "SELECT value FROM meta WHERE key = 'revision'"
+        ).fetchone()[0]
+        self._connection.execute(
+            "INSERT OR REPLACE INTO profiles "
+            "(name, settings, hour, minute, revision) VALUES (?, ?, ?, ?, ?)",
+            (name, json.dumps(settings),
+             schedule_settings.get("hour"), schedule_settings.get("minute"),
+             revision)
+        )
+        self._revisions[name] = revision
+        self._connection.execute(
+            "DELETE FROM subscriptions WHERE name = ?", (name,)
+        )
+        self._connection.executemany(
+            "INSERT OR IGNORE INTO subscriptions (name, mensa, category) "
+            "VALUES (?, ?, ?)",
+            [(name, mensa, category)
+             for mensa in mensen for category in categories]
+        )
+
+    @staticmethod
+    def __pattern(
+            query: Optional[str]
+    ) -> str:
+        """
+        Turns a search text into a LIKE pattern matching it anywhere.
+
+        :param query: Search text (optional).
+        :return: LIKE pattern with wildcards escaped.
+        """
+        query = (query or "").replace("\\", "\\\\") \
+            .replace("%", "\\%").replace("_", "\\_")
+        return f"%{query}%"
+
+    def names(self) -> list[str]:
+        """
+        Lists the profile names (settings file names).
+
+        :return: Sorted list of profile names.
+        """
+        return [row[0] for row in self.__query(
+            "SELECT name FROM profiles ORDER BY name"
+        )]
+
+    def search(
+            self,
+            query: Optional[str] = None,
+            limit: int = 50,
+            offset: int = 0
+    ) -> list[str]:
+        """
+        Returns one page of the profile names containing a text.
+
+        :param query: Text the names must contain, case-insensitive
+         (default: all profiles).
+        :param limit: Page size (default: 50).
+        :param offset: Number of matches to skip (default: 0).
+        :return: Sorted list of profile names.
+        """
+        return [row[0] for row in self.__query(
+            "SELECT name FROM profiles WHERE name LIKE ? ESCAPE '\\' "
+            "ORDER BY name LIMIT ? OFFSET ?",
+            (self.__pattern(query), limit, offset)
+        )]
+
+    def count(
+            self,
+            query: Optional[str] = None
+    ) -> int:
+        """
+        Counts the profile names containing a text.
+
+        :param query: Text the names must contain, case-insensitive
+         (default: all profiles).
+        :return: Number of matching profiles.
+        """
+        return self.__query(
+            "SELECT COUNT(*) FROM profiles WHERE name LIKE ? ESCAPE '\\'",
+            (self.__pattern(query),)
+        )[0][0]
+
+    def get(
+            self,
+            name: str
+    ) -> Optional[dict]:
+        """
+        Returns a profile's settings.
+
+        :param name: Profile name (settings file name).
+        :return: Settings or None if the profile does not exist.
+        """
+        rows = self.__query(
+            "SELECT settings FROM profiles WHERE name = ?", (name,)
+        )
+        return json.loads(rows[0][0]) if rows else None
+
+    def all(self) -> dict[str, dict]:
+        """
+        Returns all profiles.
+
+        :return: Dictionary mapping profile names to settings.
+        """
+        return {
+            name: json.loads(settings) for name, settings in self.__query(
+                "SELECT name, settings FROM profiles ORDER BY name"
+            )
+        }
+
+    def subscribers(
+            self,
+            mensa: str,
+            category: Optional[str] = None
+    ) -> list[str]:
+        """
+        Returns the profiles subscribed to a Mensa, optionally restricted to
+         one category.
+
+        :param mensa: Mensa code.
+        :param category: Menu category (default: any).
+        :return: Sorted list of profile names.
+        """
+        if category is None:
+            rows = self.__query(
+                "SELECT DISTINCT name FROM subscriptions WHERE mensa = ? "
+                "ORDER BY name", (mensa,)
+            )
+        else:
+            rows = self.__query(
+                "SELECT name FROM subscriptions "
+                "WHERE mensa = ? AND category = ? ORDER BY name",
+                (mensa, category)
+            )
+        return [row[0] for row in rows]
+
+    def scheduled_at(
+            self,
+            hour: int,
+            minute: Optional[int] = None
+    ) -> list[str]:
+        """
+        Returns the profiles scheduled at an hour or a time.
+
+        :param hour: Hour of the day.
+        :param minute: Minute of the hour (default: any).
+        :return: Sorted list of profile names.
+        """
+        if minute is None:
+            rows = self.__query(
+                "SELECT name FROM profiles WHERE hour = ? ORDER BY name",
+                (hour,)
+            )
+        else:
+            rows = self.__query(
+                "SELECT name FROM profiles WHERE hour = ? AND minute = ? "
+                "ORDER BY name", (hour, minute)
+            )
+        return [row[0] for row in rows]
+
+    def save(
+            self,
+            name: str,
+            settings: dict
+    ) -> str:
+        """
+        Stores a profile.
+
+        :param name: Profile name (settings file name).
+        :param settings: Settings to store.
+        :return: Location of the profile, as '<database>#<name>'.
+        """
+        with self._lock, self._connection:
+            self.__write(name, settings)
+        self.__notify(name, settings)
+        return f"{self.path}#{name}"
+
+    def delete(
+            self,
+            name: str
+    ) -> bool:
+        """
+        Deletes a profile.
+
+        :param name: Profile name (settings file name).
+        :return: True if the profile existed.
+        """
+        with self._lock, self._connection:
+            deleted = self._connection.execute(
+                "DELETE FROM profiles WHERE name = ?", (name,)
+            ).rowcount
+            self._revisions.pop(name, None)
+        if deleted:
+            self.__notify(name, None)
+        return bool(deleted)
+
+    def import_directory(
+            self,
+            settings_dir: str,
+            file_type: str = ".json"
+    ) -> int:
+        """
+        Imports all profiles of a settings directory in one transaction.
+         Existing profiles with the same name are replaced.
+
+        :param settings_dir: Directory containing the JSON settings files.
+        :param file_type: File extension of settings files (default: '.json').
+        :return: Number of imported profiles.
+        """
+        profiles = load_profiles(settings_dir, file_type)
+        with self._lock, self._connection:
+            for name, settings in profiles.items():
+                self.__write(name, settings)
+        self.logger.info(
+            "Imported %d profile(s) from %s.", len(profiles), settings_dir
+        )
+        return len(profiles)
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+
+        :return: None
+        """
+        with self._lock:
+            self._connection.close()
+
+    def __contains__(self, name: str) -> bool:
+        return bool(self.__query(
+            "SELECT 1 FROM profiles WHERE name = ?", (name,)
+        ))
+
+    def __len__(self) -> int:
+        return self.__query("SELECT COUNT(*) FROM profiles")[0][0]
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Command line entry point `lunchhunt-import-profiles`.
+
+    :param argv: Command line arguments (default: sys.argv[1:]).
+    :return: Exit code.
+    """
+    parser = argparse.ArgumentParser(
+        prog="lunchhunt-import-profiles",
+        description="Import JSON profiles into a SQLite profile database."
+    )
+    parser.add_argument(
+        "database", help="SQLite profile database, created if missing."
+    )
+    parser.add_argument(
+        "--profiles", default="settings",
+        help="Directory containing the profile settings files "
+             "(default: settings)."
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    store = SqliteProfileStore(args.database)
+    try:
+        store.import_directory(args.profiles)
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Optional, Union
+
+# Called with the profile name and its new settings, or None when deleted
+ChangeListener = Callable[[str, Optional[dict]], None]
+
+
+class ProfileStore:
+    """
+    Cache of the parsed profiles of a settings directory.
+
+    Listings and lookups are served from memory. The directory's mtime is
+     checked on every access, which detects added, removed and renamed
+     files with a single `stat`. Edits to existing files do not change the
+     directory's mtime, so the mtimes of all files are revalidated at most
+     once per `check_interval`. Listeners are notified of every change,
+     whether it was made through the store or on disk.
+    """
+
+    def __init__(
+            self,
+            settings_dir: str,
+            file_type: str = ".json",
+            check_interval: Union[int, float] = 2.0
+    ):
+        """
+        Initializes the store and loads all profiles.
+
+        :param settings_dir: Directory containing the JSON settings files.
+        :param file_type: File extension of settings files (default: '.json').
+        :param check_interval: Seconds between revalidations of the file
+         mtimes (default: 2.0).
+        """
+        self.settings_dir = settings_dir
+        self.file_type = file_type
+        self.check_interval = check_interval
+
+        # name -> ((mtime_ns, size), settings)
+        self._profiles: dict[str, tuple[tuple[int, int], dict]] = {}
+        self._dir_mtime: Optional[int] = None
+        self._checked = 0.0
+        self._listeners: list[ChangeListener] = []
+        self._lock = threading.RLock()
+
+        self.logger = logging.getLogger(__name__)
+
+        self.refresh(force=True)
+
+    def subscribe(
+            self,
+            listener: ChangeListener
+    ) -> None:
+        """
+        Registers a listener that is called on every profile change.
+
+        :param listener: Callable receiving the profile name and its new
+         settings, or None if the profile was deleted.
+        :return: None
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def __notify(
+            self,
+            name: str,
+            settings: Optional[dict]
+    ) -> None:
+        """
+        Notifies all listeners of a change.
+
+        :param name: Profile name.
+        :param settings: New settings or None if deleted.
+        :return: None
+        """
+        for listener in list(self._listeners):
+            try:
+                listener(name, settings)
+            except Exception as e:
+                self.logger.error("Profile listener failed for %s: %s",
+                                  name, e)
+
+    def __path(
+            self,
+            name: str
+    ) -> str:
+        """
+        Returns the file path of a profile.
+
+        :param name: Profile name.
+        :return: Path of the settings file.
+        """
+        return os.path.join(self.settings_dir, name)
+
+    def refresh(
+            self,
+            force: bool = False
+    ) -> None:
+        """
+        Brings the cache up to date with the directory. Only files whose
+         mtime or size changed are parsed again.
+
+        :param force: Revalidate all files regardless of the check interval.
+        :return: None
+        """
+        try:
+            dir_mtime = os.stat(self.settings_dir).st_mtime_ns
+        except FileNotFoundError:
+            dir_mtime = None
+
+        now = time.monotonic()
+        with self._lock:
+            if not force and dir_mtime == self._dir_mtime \
+                    and now - self._checked < self.check_interval:
+                return
+            self._dir_mtime = dir_mtime
+            self._checked = now
+
+            names = set()
+            if dir_mtime is not None:
+                names = {
+                    name for name in os.listdir(self.settings_dir)
+                    if name.endswith(self.file_type)
+                }
+
+            changes = []
+            for name in set(self._profiles) - names:
+                del self._profiles[name]
+                changes.append((name, None))
+
+            for name in names:
+                try:
+                    stat = os.stat(self.__path(name))
+                except FileNotFoundError:
+                    continue
+                version = (stat.st_mtime_ns, stat.st_size)
+                cached = self._profiles.get(name)
+                if cached and cached[0] == version:
+                    continue
+                try:
+                    with open(self.__path(name), encoding='utf-8') as file:
+                        settings = json.load(file)
+                except (OSError, json.JSONDecodeError) as e:
+                    self.logger.error("Failed to load profile %s: %s",
+                                      name, e)
+                    continue
+                self._profiles[name] = (version, settings)
+                changes.append((name, settings))
+
+        for name, settings in changes:
+            self.__notify(name, settings)
+
+    def names(self) -> list[str]:
+        """
+        Lists the profile names (settings file names).
+
+        :return: Sorted list of profile names.
+        """
+        self.refresh()
+        with self._lock:
+            return sorted(self._profiles)
+
+    def search(
+            self,
+            query: Optional[str] = None,
+            limit: int = 50,
+            offset: int = 0
+    ) -> list[str]:
+        """
+        Returns one page of the profile names containing a text.
+
+        :param query: Text the names must contain, case-insensitive
+         (default: all profiles).
+        :param limit: Page size (default: 50).
+        :param offset: Number of matches to skip (default: 0).
+        :return: Sorted list of profile names.
+        """
+        query = (query or "").lower()
+        matches = [name for name in self.names() if query in name.lower()]
+        return matches[offset:offset + limit]
+
+    def count(
+            self,
+            query: Optional[str] = None
+    ) -> int:
+        """
+        Counts the profile names containing a text.
+
+        :param query: Text the names must contain, case-insensitive
+         (default: all profiles).
+        :return: Number of matching profiles.
+        """
+        query = (query or "").lower()
+        return sum(query in name.lower() for name in self.names())
+
+    def get(
+            self,
+            name: str
+    ) -> Optional[dict]:
+        """
+        Returns a copy of a profile's settings.
+
+        :param name: Profile name (settings file name).
+        :return: Settings or None if the profile does not exist.
+        """
+        self.refresh()
+        with self._lock:
+            cached = self._profiles.get(name)
+        return copy.deepcopy(cached[1]) if cached else None
+
+    def all(self) -> dict[str, dict]:
+        """
+        Returns copies of all profiles.
+
+        :return: Dictionary mapping profile names to settings.
+        """
+        self.refresh()
+        with self._lock:
+            return {
+                name: copy.deepcopy(settings)
+                for name, (_, settings) in sorted(self._profiles.items())
+            }
+
+    def save(
+            self,
+            name: str,
+            settings: dict
+    ) -> str:
+        """
+        Writes a profile to disk and updates the cache.
+
+        :param name: Profile name (settings file name).
+        :param settings: Settings to save.
+        :return: Path of the written file.
+        """
+        os.makedirs(self.settings_dir, exist_ok=True)
+        path = self.__path(name)
+        with self._lock:
+            with open(path, 'w') as file:
+                json.dump(settings, file, indent=4)
+            stat = os.stat(path)
+            self._profiles[name] = (
+                (stat.st_mtime_ns, stat.st_size), copy.deepcopy(settings)
+            )
+        self.__notify(name, settings)
+        return path
+
+    def delete(
+            self,
+            name: str
+    ) -> bool:
+        """
+        Deletes a profile from disk and the cache.
+
+        :param name: Profile name (settings file name).
+        :return: True if the profile existed.
+        """
+        with self._lock:
+            try:
+                os.remove(self.__path(name))
+            except FileNotFoundError:
+                return False
+            self._profiles.pop(name, None)
+        self.__notify(name, None)
+        return True
+
+    def __contains__(self, name: str) -> bool:
+        self.refresh()
+        with self._lock:
+            return name in self._profiles
+
+    def __len__(self) -> int:
+        self.refresh()
+        with self._lock:
+            return len(self._profiles)
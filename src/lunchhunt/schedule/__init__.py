@@ -0,0 +1,21 @@
+from .jobs import Job, JobQueue
+from .mensa_calendar import MensaCalendar
+from .pipeline import MenuPipeline
+from .poller import AdaptivePoller
+from .registry import ScheduleRegistry
+from .runner import ProfileReport, run_profile, run_profiles
+from .scheduler import Scheduler, fire_times
+
+__all__ = [
+    "AdaptivePoller",
+    "Job",
+    "JobQueue",
+    "MensaCalendar",
+    "MenuPipeline",
+    "ProfileReport",
+    "ScheduleRegistry",
+    "Scheduler",
+    "fire_times",
+    "run_profile",
+    "run_profiles",
+]
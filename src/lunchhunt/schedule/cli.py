@@ -0,0 +1,203 @@
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from lunchhunt.profiles import SqliteProfileStore, SubscriptionIndex
+from lunchhunt.schedule.mensa_calendar import MensaCalendar
+from lunchhunt.schedule.pipeline import MenuPipeline
+from lunchhunt.schedule.poller import AdaptivePoller
+from lunchhunt.schedule.runner import run_profiles
+from lunchhunt.schedule.scheduler import Scheduler
+from lunchhunt.scrap import MensaScraper
+from lunchhunt.utils import load_profiles
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Command line entry point `lunchhunt-run`.
+
+    :param argv: Command line arguments (default: sys.argv[1:]).
+    :return: Exit code, the highest exit code of all profiles.
+    """
+    parser = argparse.ArgumentParser(
+        prog="lunchhunt-run",
+        description="Run LunchHunt profiles and send their notifications."
+    )
+    parser.add_argument(
+        "--profiles", default="settings",
+        help="Directory containing the profile settings files "
+             "(default: settings)."
+    )
+    parser.add_argument(
+        "--profile-db", metavar="FILE",
+        help="SQLite profile database to read the profiles from instead of "
+             "the --profiles directory."
+    )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 4,
+        help="Number of concurrent scrapes and profile runs "
+             "(default: number of CPUs)."
+    )
+    parser.add_argument(
+        "--executor", choices=["thread", "process"], default="thread",
+        help="Pool used for profile runs (default: thread)."
+    )
+    parser.add_argument(
+        "--only", nargs="+", metavar="PROFILE",
+        help="Run only the given settings files of the directory."
+    )
+    parser.add_argument(
+        "--pipeline", action="store_true",
+        help="Stream the run through fetch, parse, match and notify stages "
+             "that overlap instead of scraping everything first."
+    )
+    parser.add_argument(
+        "--parse-processes", type=int, default=0, metavar="N",
+        help="Parse pages in N worker processes instead of the fetching "
+             "threads (default: 0, no worker processes)."
+    )
+    parser.add_argument(
+        "--calendar", metavar="FILE",
+        help="Opening calendar used to skip closed Mensas; learned closed "
+             "days are saved back to it."
+    )
+    parser.add_argument(
+        "--serve", action="store_true",
+        help="Keep running and fire profiles at their scheduled times "
+             "instead of running them once."
+    )
+    parser.add_argument(
+        "--prefetch-window", type=float, default=10, metavar="MINUTES",
+        help="With --serve: prefetch menus for profiles firing within the "
+             "next MINUTES (default: 10)."
+    )
+    parser.add_argument(
+        "--prefetch-lead", type=float, default=2, metavar="MINUTES",
+        help="With --serve: warm the cache MINUTES before the earliest fire "
+             "time (default: 2)."
+    )
+    parser.add_argument(
+        "--jitter-window", type=float, default=5, metavar="MINUTES",
+        help="With --serve: spread profiles scheduled at the same time "
+             "across MINUTES, never past their meal deadline (default: 5)."
+    )
+    parser.add_argument(
+        "--poll-budget", type=int, metavar="REQUESTS",
+        help="With --serve: poll the subscribed Mensas adaptively between "
+             "fire times, with at most REQUESTS requests per day."
+    )
+    parser.add_argument(
+        "--poll-state", metavar="FILE",
+        help="With --poll-budget: file the learned update times are loaded "
+             "from and saved to."
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        handlers=[logging.StreamHandler(sys.stdout)]
+    )
+
+    if args.profile_db:
+        store = SqliteProfileStore(args.profile_db)
+        if args.only:
+            profiles = {
+                name: settings for name in args.only
+                if (settings := store.get(name)) is not None
+            }
+        else:
+            profiles = store.all()
+        store.close()
+    else:
+        # Scheduled runs name their profile; read just that file
+        profiles = load_profiles(args.profiles, names=args.only)
+    source = args.profile_db or args.profiles
+    if args.only:
+        missing = [name for name in args.only if name not in profiles]
+        for name in missing:
+            logging.error("Profile %s not found in %s.", name, source)
+        profiles = {
+            name: settings for name, settings in profiles.items()
+            if name in args.only
+        }
+        if missing and not profiles:
+            return 1
+
+    logging.info(
+        "Running %d profile(s) with %d %s worker(s).",
+        len(profiles), args.workers, args.executor
+    )
+    calendar = MensaCalendar.load(args.calendar) if args.calendar else None
+
+    if args.serve:
+        scheduler = Scheduler(
+            profiles,
+            calendar=calendar,
+            prefetch_window=args.prefetch_window,
+            prefetch_lead=args.prefetch_lead,
+            workers=args.workers,
+            jitter_window=args.jitter_window
+        )
+        if args.poll_budget:
+            scheduler.poller = AdaptivePoller(
+                sorted(SubscriptionIndex(profiles).subscriptions()),
+                budget=args.poll_budget,
+                scraper=scheduler.scraper,
+                cache=scheduler.cache
+            )
+            if args.poll_state:
+                scheduler.poller.load(args.poll_state)
+        scheduler.run_forever()
+        if calendar:
+            calendar.save(args.calendar)
+        if scheduler.poller and args.poll_state:
+            scheduler.poller.save(args.poll_state)
+        return 0
+
+    started = time.perf_counter()
+    parse_pool = ProcessPoolExecutor(max_workers=args.parse_processes) \
+        if args.parse_processes > 0 else None
+    scraper = MensaScraper(
+        pool_size=max(1, args.workers), parse_executor=parse_pool
+    )
+    try:
+        if args.pipeline:
+            reports = MenuPipeline(
+                scraper=scraper,
+                calendar=calendar,
+                fetch_workers=args.workers,
+                parse_workers=args.parse_processes or 2,
+                notify_workers=args.workers
+            ).run_sync(profiles)
+        else:
+            reports = run_profiles(
+                profiles, workers=args.workers, executor=args.executor,
+                calendar=calendar, scraper=scraper
+            )
+    finally:
+        if parse_pool:
+            parse_pool.shutdown()
+    if calendar:
+        calendar.save(args.calendar)
+
+    for report in reports:
+        logging.info(
+            "%s: exit code %d, %d notification(s), %.3fs",
+            report.name, report.exit_code, report.notifications,
+            report.duration
+        )
+    logging.info(
+        "Finished %d profile(s) in %.3fs.",
+        len(reports), time.perf_counter() - started
+    )
+
+    return max([report.exit_code for report in reports] or [0])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+import heapq
+import logging
+import threading
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from lunchhunt.schedule.mensa_calendar import MensaCalendar
+from lunchhunt.utils import default_meal_timetable
+
+
+def category_cutoffs(
+        settings: dict,
+        day: date,
+        calendar: Optional[MensaCalendar] = None
+) -> dict[str, datetime]:
+    """
+    Determines until when notifying a profile about each of its categories
+     is still useful: the end of the meal window minus the profile's offset.
+
+    Meal windows are taken from the calendar, using the latest end across the
+     profile's Mensas, and otherwise from `default_meal_timetable`. Unknown
+     categories last until the end of the day.
+
+    :param settings: Loaded profile settings.
+    :param day: Date the profile runs on.
+    :param calendar: Opening calendar with meal windows (optional).
+    :return: Dictionary mapping categories to their cutoff.
+    """
+    scraper_settings = settings['scraper_settings']
+    offset = timedelta(
+        minutes=settings['schedule_settings'].get('offset', 30)
+    )
+    timetable = default_meal_timetable()
+
+    cutoffs = {}
+    for category in scraper_settings['menu_categories']:
+        ends = []
+        if calendar:
+            for mensa in scraper_settings.get('mensen', []):
+                window = calendar.meal_window(mensa, category)
+                if window:
+                    ends.append(window[1])
+        end = max(ends) if ends else timetable.get(category, time.max)
+        cutoffs[category] = datetime.combine(day, end) - offset
+    return cutoffs
+
+
+@dataclass(order=True)
+class Job:
+    """
+    A profile run that is due, ordered by its deadline and then by its fire
+     time.
+
+    The deadline is the earliest cutoff among the job's categories, i.e. the
+     point in time after which part of the job becomes worthless.
+    """
+    deadline: datetime
+    fire_at: datetime
+    name: str = field(compare=False)
+    settings: dict = field(compare=False, repr=False)
+    cutoffs: dict[str, datetime] = field(compare=False, default_factory=dict)
+
+    @classmethod
+    def create(
+            cls,
+            name: str,
+            settings: dict,
+            fire_at: datetime,
+            calendar: Optional[MensaCalendar] = None
+    ) -> "Job":
+        """
+        Creates a job with cutoffs derived from the profile's categories.
+
+        :param name: Profile name.
+        :param settings: Loaded profile settings.
+        :param fire_at: Time the profile was scheduled for.
+        :param calendar: Opening calendar with meal windows (optional).
+        :return: Job.
+        """
+        cutoffs = category_cutoffs(settings, fire_at.date(), calendar)
+        return cls(
+            deadline=min(cutoffs.values(), default=datetime.max),
+            fire_at=fire_at,
+            name=name,
+            settings=settings,
+            cutoffs=cutoffs
+        )
+
+    def downgrade(
+            self,
+            now: datetime
+    ) -> Optional["Job"]:
+        """
+        Restricts the job to the categories whose cutoff has not passed.
+
+        :param now: Current time.
+        :return: The job itself if all categories are still live, a
+         downgraded copy if some are, or None if the job cannot make it.
+        """
+        live = {
+            category: cutoff for category, cutoff in self.cutoffs.items()
+            if now < cutoff
+        }
+        if len(live) == len(self.cutoffs):
+            return self
+        if not live:
+            return None
+
+        return replace(
+            self,
+            deadline=min(live.values()),
+            settings={
+                **self.settings,
+                "scraper_settings": {
+                    **self.settings['scraper_settings'],
+                    "menu_categories": [
+                        category for category in
+                        self.settings['scraper_settings']['menu_categories']
+                        if category in live
+                    ]
+                }
+            },
+            cutoffs=live
+        )
+
+
+class JobQueue:
+    """
+    Thread-safe earliest-deadline-first queue of due profile runs.
+
+    Jobs whose categories can no longer be served in time are downgraded to
+     the remaining categories or dropped when they are taken from the queue.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty queue.
+        """
+        self._heap: list[tuple[Job, int]] = []
+        self._counter = 0
+        self._lock = threading.Lock()
+
+        self.dropped = 0
+        self.downgraded = 0
+
+        self.logger = logging.getLogger(__name__)
+
+    def push(
+            self,
+            job: Job
+    ) -> None:
+        """
+        Adds a job to the queue.
+
+        :param job: Job to add.
+        :return: None
+        """
+        with self._lock:
+            # The counter keeps jobs with equal deadlines in arrival order
+            heapq.heappush(self._heap, (job, self._counter))
+            self._counter += 1
+
+    def pop_ready(
+            self,
+            now: datetime
+    ) -> list[Job]:
+        """
+        Takes all queued jobs in deadline order, downgrading or dropping those
+         that missed some or all of their cutoffs.
+
+        :param now: Current time.
+        :return: List of jobs to run, earliest deadline first.
+        """
+        with self._lock:
+            entries = [heapq.heappop(self._heap) for _ in range(len(self._heap))]
+
+        jobs = []
+        for job, _ in entries:
+            ready = job.downgrade(now)
+            if ready is None:
+                self.dropped += 1
+                self.logger.warning(
+                    "Dropping %s, all cutoffs passed (deadline %s).",
+                    job.name, job.deadline.strftime("%H:%M")
+                )
+                continue
+            if ready is not job:
+                self.downgraded += 1
+                self.logger.info(
+                    "Downgrading %s to %s.",
+                    job.name, ", ".join(ready.cutoffs)
+                )
+            jobs.append(ready)
+        return sorted(jobs)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of queued jobs.
+
+        :return: Number of jobs.
+        """
+        with self._lock:
+            return len(self._heap)
@@ -0,0 +1,388 @@
+import json
+import logging
+import os
+import threading
+from datetime import date, datetime, time, timedelta
+from typing import Optional, Union
+
+from lunchhunt.utils import default_mensa_calendar
+
+WEEKDAYS = [
+    "monday", "tuesday", "wednesday", "thursday", "friday", "saturday",
+    "sunday"
+]
+
+
+class MensaCalendar:
+    """
+    Per-Mensa opening calendar with opening days, meal windows and exception
+     dates.
+
+    The calendar answers whether a Mensa can serve a category at a given
+     time without any I/O, so schedulers can skip fetches and notifications
+     that cannot succeed. Opening days can be configured by hand or learned
+     from recorded scrape results: a weekday whose observed pages of the last
+     `window` weeks were all empty is treated as closed. A learned closed
+     weekday is still fetched every `probe_interval` weeks, so the calendar
+     notices when the Mensa opens on it again.
+    """
+
+    def __init__(
+            self,
+            calendar: Optional[dict[str, dict]] = None,
+            min_observations: int = 3,
+            probe_interval: int = 4,
+            window: int = 8
+    ):
+        """
+        Initializes the calendar.
+
+        :param calendar: Mapping of Mensa codes to 'opening_days',
+         'meal_windows' and 'closed_dates' as returned by
+         `default_mensa_calendar` (default: `default_mensa_calendar()`).
+        :param min_observations: Number of days with an empty result on a
+         weekday, without any non-empty one, after which the weekday is
+         learned as closed (default: 3).
+        :param probe_interval: Weeks between two fetches on a weekday learned
+         as closed (default: 4). 0 disables probing.
+        :param window: Weeks of observations, counted back from the newest
+         one of a Mensa, the opening days are learned from (default: 8).
+        """
+        self.min_observations = min_observations
+        self.probe_interval = probe_interval
+        self.window = window
+
+        # Guards the calendar and the observations; `learn` configures
+        self._lock = threading.RLock()
+        self._calendar: dict[str, dict] = {}
+        for mensa, entry in (calendar or default_mensa_calendar()).items():
+            self.configure(mensa, **entry)
+
+        # Observations per Mensa: date -> True if the page had a menu
+        self._observations: dict[str, dict[date, bool]] = {}
+
+        self.logger = logging.getLogger(__name__)
+
+    def configure(
+            self,
+            mensa: str,
+            opening_days: Optional[list[str]] = None,
+            meal_windows: Optional[dict[str, tuple]] = None,
+            closed_dates: Optional[list[Union[str, date]]] = None
+    ) -> None:
+        """
+        Sets the calendar of a Mensa by hand. Unset arguments keep their
+         current value. Opening days set by hand are never probed; closed
+         days learned before are applied again on the next `learn`.
+
+        :param mensa: Mensa code.
+        :param opening_days: Weekday names the Mensa is open on.
+        :param meal_windows: Mapping of categories to (start, end) times, as
+         `datetime.time` or 'HH:MM' strings.
+        :param closed_dates: Exception dates the Mensa is closed on, as
+         `datetime.date` or ISO strings.
+        :return: None
+        """
+        with self._lock:
+            entry = self._calendar.setdefault(mensa, {
+                "opening_days": set(WEEKDAYS),
+                "learned_closed": set(),
+                "meal_windows": {},
+                "closed_dates": set(),
+            })
+            if opening_days is not None:
+                entry["opening_days"] = {day.lower() for day in opening_days}
+                entry["learned_closed"] = set()
+            if meal_windows is not None:
+                entry["meal_windows"] = {
+                    category: tuple(
+                        value if isinstance(value, time)
+                        else time.fromisoformat(value) for value in window
+                    )
+                    for category, window in meal_windows.items()
+                }
+            if closed_dates is not None:
+                entry["closed_dates"] = {
+                    value if isinstance(value, date)
+                    else date.fromisoformat(value) for value in closed_dates
+                }
+
+    def add_closed_date(
+            self,
+            mensa: str,
+            day: Union[str, date]
+    ) -> None:
+        """
+        Marks a single date as closed, e.g. a holiday.
+
+        :param mensa: Mensa code.
+        :param day: Closed date as `datetime.date` or ISO string.
+        :return: None
+        """
+        with self._lock:
+            self.configure(mensa)
+            self._calendar[mensa]["closed_dates"].add(
+                day if isinstance(day, date) else date.fromisoformat(day)
+            )
+
+    def is_open(
+            self,
+            mensa: str,
+            day: date
+    ) -> bool:
+        """
+        Checks whether a Mensa is open on a date. Unknown Mensas are
+         assumed to be open, and so are weekdays learned as closed in every
+         `probe_interval`-th ISO week, to probe them.
+
+        :param mensa: Mensa code.
+        :param day: Date to check.
+        :return: True if the Mensa is open.
+        """
+        entry = self._calendar.get(mensa)
+        if entry is None:
+            return True
+        if day in entry["closed_dates"]:
+            return False
+        weekday = WEEKDAYS[day.weekday()]
+        if weekday in entry["opening_days"]:
+            return True
+        return (weekday in entry["learned_closed"]
+                and self.probe_interval > 0
+                and day.isocalendar()[1] % self.probe_interval == 0)
+
+    def meal_window(
+            self,
+            mensa: str,
+            category: str
+    ) -> Optional[tuple[time, time]]:
+        """
+        Returns the serving window of a category.
+
+        :param mensa: Mensa code.
+        :param category: Menu category.
+        :return: Tuple of (start, end) times or None if unknown.
+        """
+        return self._calendar.get(mensa, {}).get(
+            "meal_windows", {}).get(category)
+
+    def serves(
+            self,
+            mensa: str,
+            category: str,
+            at: Optional[datetime] = None,
+            offset: Union[int, float] = 0
+    ) -> bool:
+        """
+        Checks whether notifying about a category still makes sense: the
+         Mensa is open that day and the meal window, shortened by the offset,
+         has not ended yet. Categories without a window only depend on the
+         opening day.
+
+        :param mensa: Mensa code.
+        :param category: Menu category.
+        :param at: Point in time to check (default: now).
+        :param offset: Minutes before the end of the window after which a
+         notification is too late (default: 0).
+        :return: True if the category can still be served.
+        """
+        at = at or datetime.now()
+        if not self.is_open(mensa, at.date()):
+            return False
+
+        window = self.meal_window(mensa, category)
+        if window is None:
+            return True
+
+        cutoff = datetime.combine(at.date(), window[1]) - \
+            timedelta(minutes=offset)
+        return at < cutoff
+
+    def open_categories(
+            self,
+            mensa: str,
+            categories: list[str],
+            at: Optional[datetime] = None,
+            offset: Union[int, float] = 0
+    ) -> list[str]:
+        """
+        Filters categories down to those the Mensa can still serve.
+
+        :param mensa: Mensa code.
+        :param categories: Menu categories.
+        :param at: Point in time to check (default: now).
+        :param offset: Minutes before the end of the window after which a
+         notification is too late (default: 0).
+        :return: List of categories that can still be served.
+        """
+        return [
+            category for category in categories
+            if self.serves(mensa, category, at, offset)
+        ]
+
+    def record(
+            self,
+            mensa: str,
+            day: date,
+            empty: bool
+    ) -> None:
+        """
+        Records the outcome of a scrape and updates the learned opening days.
+         Each date counts once; a menu found on any scrape of the date wins
+         over empty pages, e.g. from before the menu was published.
+
+        :param mensa: Mensa code.
+        :param day: Date of the scrape.
+        :param empty: True if the page had no menu.
+        :return: None
+        """
+        with self._lock:
+            days = self._observations.setdefault(mensa, {})
+            days[day] = days.get(day, False) or not empty
+            self.__expire(mensa)
+            self.learn()
+
+    def __expire(
+            self,
+            mensa: str
+    ) -> None:
+        """
+        Drops the observations of a Mensa older than `window` weeks before
+         its newest one.
+
+        :param mensa: Mensa code.
+        :return: None
+        """
+        days = self._observations[mensa]
+        oldest = max(days) - timedelta(weeks=self.window)
+        for day in [day for day in days if day <= oldest]:
+            del days[day]
+
+    def learn(self) -> None:
+        """
+        Derives opening days from the observations within the window:
+         weekdays with at least `min_observations` empty dates and no menu are
+         closed, weekdays with a menu are open. Other weekdays keep their
+         state, so a closed weekday only reopens once a probe finds a menu.
+
+        :return: None
+        """
+        with self._lock:
+            for mensa, days in self._observations.items():
+                empty = dict.fromkeys(WEEKDAYS, 0)
+                served = set()
+                for day, menu in days.items():
+                    weekday = WEEKDAYS[day.weekday()]
+                    if menu:
+                        served.add(weekday)
+                    else:
+                        empty[weekday] += 1
+
+                self.configure(mensa)
+                entry = self._calendar[mensa]
+                for weekday in WEEKDAYS:
+                    if weekday in served:
+                        if weekday in entry["learned_closed"]:
+                            self.logger.info(
+                                "Learned that %s is open on %s again.",
+                                mensa, weekday
+                            )
+                        entry["opening_days"].add(weekday)
+                        entry["learned_closed"].discard(weekday)
+                    elif empty[weekday] >= self.min_observations \
+                            and weekday in entry["opening_days"]:
+                        entry["opening_days"].discard(weekday)
+                        entry["learned_closed"].add(weekday)
+                        self.logger.info(
+                            "Learned that %s is closed on %s.", mensa, weekday
+                        )
+
+    def to_dict(self) -> dict:
+        """
+        Serializes the calendar and its observations to JSON-compatible data.
+         Weekdays learned as closed are saved as opening days; loading
+         learns them again from the observations.
+
+        :return: Dictionary with 'mensen' and 'observations' keys.
+        """
+        with self._lock:
+            return {
+                "mensen": {
+                    mensa: {
+                        "opening_days": [
+                            day for day in WEEKDAYS
+                            if day in entry["opening_days"]
+                            or day in entry["learned_closed"]
+                        ],
+                        "meal_windows": {
+                            category: [value.strftime("%H:%M") for value in window]
+                            for category, window in entry["meal_windows"].items()
+                        },
+                        "closed_dates": sorted(
+                            day.isoformat() for day in entry["closed_dates"]
+                        ),
+                    }
+                    for mensa, entry in self._calendar.items()
+                },
+                "observations": [
+                    [mensa, day.isoformat(), menu]
+                    for mensa, days in self._observations.items()
+                    for day, menu in sorted(days.items())
+                ],
+            }
+
+    @classmethod
+    def load(
+            cls,
+            path: str,
+            min_observations: int = 3,
+            probe_interval: int = 4,
+            window: int = 8
+    ) -> "MensaCalendar":
+        """
+        Loads a calendar saved with `save`, on top of the default calendar.
+         A missing or invalid file yields the default calendar.
+
+        :param path: Path of the JSON calendar file.
+        :param min_observations: See `__init__`.
+        :param probe_interval: See `__init__`.
+        :param window: See `__init__`.
+        :return: MensaCalendar.
+        """
+        calendar = cls(
+            min_observations=min_observations, probe_interval=probe_interval,
+            window=window
+        )
+        if not os.path.exists(path):
+            return calendar
+
+        try:
+            with open(path, encoding='utf-8') as file:
+                data = json.load(file)
+            for mensa, entry in data.get("mensen", {}).items():
+                calendar.configure(mensa, **entry)
+            for observation in data.get("observations", []):
+                # Weekday counts of older files carry no dates; drop them
+                if len(observation) == 3:
+                    mensa, day, menu = observation
+                    calendar._observations.setdefault(mensa, {})[
+                        date.fromisoformat(day)] = menu
+            for mensa in calendar._observations:
+                calendar.__expire(mensa)
+            calendar.learn()
+        except (OSError, json.JSONDecodeError, TypeError, ValueError) as e:
+            calendar.logger.error("Failed to load calendar %s: %s", path, e)
+        return calendar
+
+    def save(
+            self,
+            path: str
+    ) -> None:
+        """
+        Saves the calendar and its observations as JSON.
+
+        :param path: Path of the JSON calendar file.
+        :return: None
+        """
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.to_dict(), file, indent=4, ensure_ascii=False)
@@ -0,0 +1,276 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable
+from datetime import datetime
+from typing import Callable, Optional
+
+from lunchhunt.notify import NotificationDispatcher, create_sinks
+from lunchhunt.profiles import SubscriptionIndex
+from lunchhunt.schedule.mensa_calendar import MensaCalendar
+from lunchhunt.schedule.runner import (
+    ProfileReport,
+    plan_scrapes,
+    prepare_profiles,
+    profile_dishes,
+    record_scrapes,
+)
+from lunchhunt.scrap import MensaScraper, MenuCache, MenuResult, NegativeCache
+
+# Marks the end of a stage's input
+_DONE = object()
+
+
+class MenuPipeline:
+    """
+    Streaming profile run with the stages fetch → parse → match → notify.
+
+    Stages are connected by bounded queues and each runs its own number of
+     workers, so parsing overlaps with fetching and notifying, and a slow
+     stage holds back the ones before it instead of letting work pile up in
+     memory. Blocking work runs in threads, and parsing in the scraper's
+     parse executor if it has one; the total time of a run is close to that
+     of its slowest stage.
+    """
+
+    STAGES = ("fetch", "parse", "match", "notify")
+
+    def __init__(
+            self,
+            scraper: Optional[MensaScraper] = None,
+            cache: Optional[MenuCache] = None,
+            calendar: Optional[MensaCalendar] = None,
+            fetch_workers: int = 4,
+            parse_workers: int = 2,
+            match_workers: int = 1,
+            notify_workers: int = 4,
+            queue_size: int = 8
+    ):
+        """
+        Initializes the pipeline.
+
+        :param scraper: Scraper used to fetch and parse pages
+         (default: new scraper).
+        :param cache: Menu cache to serve menus from and store parsed menus
+         in (optional).
+        :param calendar: Opening calendar used to skip closed Mensas and to
+         learn closed days from empty pages (optional).
+        :param fetch_workers: Number of concurrent page fetches (default: 4).
+        :param parse_workers: Number of concurrent page parses (default: 2).
+        :param match_workers: Number of concurrent matchers (default: 1).
+        :param notify_workers: Number of concurrent notifications
+         (default: 4).
+        :param queue_size: Capacity of each queue between two stages
+         (default: 8).
+        """
+        self.scraper = scraper or MensaScraper(pool_size=max(1, fetch_workers))
+        self.cache = cache
+        self.calendar = calendar
+        self.workers = {
+            "fetch": max(1, fetch_workers),
+            "parse": max(1, parse_workers),
+            "match": max(1, match_workers),
+            "notify": max(1, notify_workers),
+        }
+        self.queue_size = max(1, queue_size)
+
+        self.stage_times = dict.fromkeys(self.STAGES, 0.0)
+
+        self.logger = logging.getLogger(__name__)
+
+    async def __stage(
+            self,
+            name: str,
+            inbox: asyncio.Queue,
+            outbox: Optional[asyncio.Queue],
+            handle: Callable[..., Awaitable[list]]
+    ) -> None:
+        """
+        Runs the workers of a stage until its input is exhausted, then ends
+         the input of the next stage.
+
+        :param name: Stage name.
+        :param inbox: Queue of items to handle.
+        :param outbox: Queue of the next stage (None for the last stage).
+        :param handle: Coroutine function turning an item into a list of items
+         for the next stage.
+        :return: None
+        """
+        async def worker() -> None:
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    return
+                started = time.perf_counter()
+                try:
+                    results = await handle(*item)
+                except Exception as e:
+                    self.logger.error("%s stage failed on %s: %s",
+                                      name, item[0], e)
+                    results = []
+                self.stage_times[name] += time.perf_counter() - started
+                for result in results:
+                    await outbox.put(result)
+
+        await asyncio.gather(*(worker() for _ in range(self.workers[name])))
+        if outbox is not None:
+            index = self.STAGES.index(name) + 1
+            for _ in range(self.workers[self.STAGES[index]]):
+                await outbox.put(_DONE)
+
+    async def run(
+            self,
+            profiles: dict[str, dict]
+    ) -> list[ProfileReport]:
+        """
+        Runs many profiles through the pipeline. Every Mensa is fetched and
+         parsed once and its menu is matched against all subscribed profiles
+         as soon as it is available.
+
+        :param profiles: Dictionary mapping profile names to loaded settings.
+        :return: List of ProfileReports in profile name order.
+        """
+        started = time.monotonic()
+        self.stage_times = dict.fromkeys(self.STAGES, 0.0)
+
+        active, invalid = prepare_profiles(profiles)
+        now = datetime.now()
+        index = SubscriptionIndex(active)
+        wanted = plan_scrapes(index, self.calendar, now)
+
+        queues = {
+            stage: asyncio.Queue(maxsize=self.queue_size)
+            for stage in self.STAGES
+        }
+        menus: dict[str, MenuResult] = {}
+        dispatchers: dict[str, NotificationDispatcher] = {}
+        exit_codes = dict.fromkeys(invalid, 1)
+        notifications: dict[str, int] = {}
+        finished: dict[str, float] = {}
+
+        async def fetch(mensa: str) -> list:
+            url = self.scraper.mensa_url(mensa)
+            if self.scraper.negative_cache.get(url):
+                return []
+            html = await asyncio.to_thread(self.scraper.fetch_page, url)
+            if html is None:
+                self.scraper.negative_cache.add(url, NegativeCache.ERROR)
+                return []
+            return [(mensa, html)]
+
+        async def parse(mensa: str, html: bytes) -> list:
+            menu = await asyncio.to_thread(self.scraper.parse_page, html)
+            if not menu:
+                self.scraper.negative_cache.add(
+                    self.scraper.mensa_url(mensa), NegativeCache.EMPTY
+                )
+                return []
+            # Keep the whole page, so the cached menu serves every profile
+            result = self.scraper.menu_result(mensa, menu, list(menu))
+            if self.cache:
+                self.cache.put(result)
+            return [(mensa, result)]
+
+        async def match(mensa: str, complete: MenuResult) -> list:
+            menu = complete.filter(sorted(wanted[mensa]))
+            if not menu.dishes:
+                self.logger.info("No dishes found for %s.", mensa)
+                return []
+            menus[mensa] = menu
+
+            jobs = []
+            for name in sorted(index.subscribers(mensa, menu.categories)):
+                settings = active[name]
+                dishes = profile_dishes(
+                    settings, menu,
+                    settings['scraper_settings']['menu_categories']
+                )
+                if dishes:
+                    jobs.append((name, menu, dishes))
+            return jobs
+
+        async def notify(name: str, menu: MenuResult, dishes: dict) -> list:
+            if name not in dispatchers:
+                gotify_settings = active[name].get('gotify_settings', {})
+                dispatchers[name] = NotificationDispatcher(
+                    sinks=create_sinks(
+                        gotify_settings=gotify_settings,
+                        sink_settings=active[name].get('sink_settings')
+                    ),
+                    priority=gotify_settings.get('priority', 5)
+                )
+            try:
+                results = await asyncio.to_thread(
+                    dispatchers[name].send_notification,
+                    message=dishes,
+                    website=menu.url,
+                    location=menu.mensa_name
+                )
+                if not all(results.values()):
+                    exit_codes[name] = 1
+            except Exception as e:
+                self.logger.error("Profile %s failed: %s", name, e)
+                exit_codes[name] = 1
+            notifications[name] = notifications.get(name, 0) + 1
+            finished[name] = time.monotonic()
+            return []
+
+        async def feed() -> None:
+            for mensa in wanted:
+                cached = self.cache.get(mensa) if self.cache else None
+                if cached:
+                    # Served from memory, skip fetching and parsing
+                    await queues["match"].put((mensa, cached))
+                else:
+                    await queues["fetch"].put((mensa,))
+            for _ in range(self.workers["fetch"]):
+                await queues["fetch"].put(_DONE)
+
+        handlers = {
+            "fetch": fetch, "parse": parse, "match": match, "notify": notify
+        }
+        try:
+            await asyncio.gather(feed(), *(
+                self.__stage(
+                    stage, queues[stage],
+                    queues[self.STAGES[i + 1]]
+                    if i + 1 < len(self.STAGES) else None,
+                    handlers[stage]
+                )
+                for i, stage in enumerate(self.STAGES)
+            ))
+        finally:
+            for dispatcher in dispatchers.values():
+                dispatcher.close()
+
+        if self.calendar:
+            record_scrapes(self.calendar, self.scraper, wanted, menus, now)
+
+        self.logger.info(
+            "Pipeline finished in %.3fs (busy time per stage: %s).",
+            time.monotonic() - started,
+            ", ".join(f"{stage} {self.stage_times[stage]:.3f}s"
+                      for stage in self.STAGES)
+        )
+        return [
+            ProfileReport(
+                name=name,
+                exit_code=exit_codes.get(name, 0),
+                duration=finished[name] - started if name in finished else 0.0,
+                notifications=notifications.get(name, 0),
+                finished=finished.get(name, started)
+            )
+            for name in sorted(profiles)
+        ]
+
+    def run_sync(
+            self,
+            profiles: dict[str, dict]
+    ) -> list[ProfileReport]:
+        """
+        Runs `run` in a new event loop.
+
+        :param profiles: Dictionary mapping profile names to loaded settings.
+        :return: List of ProfileReports in profile name order.
+        """
+        return asyncio.run(self.run(profiles))
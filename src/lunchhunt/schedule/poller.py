@@ -0,0 +1,351 @@
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from lunchhunt.scrap import MensaScraper, MenuCache, MenuResult
+
+
+class AdaptivePoller:
+    """
+    Polls Mensa pages on a schedule learned from when their menus change.
+
+    The day between `start` and `end` is divided into slots. Whenever the
+     content hash of a Mensa's menu differs from the previous poll, the slot
+     of the change is counted. Each day's polls are then placed along the
+     distribution of observed changes: densely around the times a Mensa
+     usually publishes and sparsely elsewhere. A Mensa without observations
+     is polled evenly. The number of polls per day across all Mensas never
+     exceeds the request budget.
+    """
+
+    def __init__(
+            self,
+            mensen: list[str],
+            budget: int = 96,
+            scraper: Optional[MensaScraper] = None,
+            cache: Optional[MenuCache] = None,
+            start: time = time(6, 0),
+            end: time = time(20, 0),
+            slot_minutes: int = 15,
+            decay: float = 0.9
+    ):
+        """
+        Initializes the poller.
+
+        :param mensen: Mensa codes to poll.
+        :param budget: Maximum number of requests per day across all Mensas
+         (default: 96).
+        :param scraper: Scraper used for polling (default: new scraper).
+        :param cache: Menu cache updated with every polled menu (optional).
+        :param start: Time of the first possible poll of a day
+         (default: 6:00).
+        :param end: Time of the last possible poll of a day (default: 20:00).
+        :param slot_minutes: Resolution of the learned update times in
+         minutes (default: 15).
+        :param decay: Factor applied to older observations whenever a new
+         change is seen, so the schedule follows shifting publish times
+         (default: 0.9).
+        """
+        if budget < len(mensen):
+            raise ValueError("Budget must allow at least one poll per Mensa.")
+
+        self.mensen = list(mensen)
+        self.budget = budget
+        self.scraper = scraper or MensaScraper()
+        self.cache = cache
+        self.start = start
+        self.end = end
+        self.slot_minutes = slot_minutes
+        self.decay = decay
+
+        span = (datetime.combine(datetime.min, end)
+                - datetime.combine(datetime.min, start))
+        self.slots = max(1, int(span.total_seconds() // 60 // slot_minutes))
+
+        self._changes: dict[str, list[float]] = {}
+        self._hashes: dict[str, str] = {}
+        self._polled: dict[str, datetime] = {}
+        # Polls of each Mensa on the day of its last poll: (day, count)
+        self._daily: dict[str, tuple[date, int]] = {}
+        self._lock = threading.Lock()
+
+        self.logger = logging.getLogger(__name__)
+
+    def __slot(
+            self,
+            at: datetime
+    ) -> Optional[int]:
+        """
+        Returns the slot of a point in time.
+
+        :param at: Point in time.
+        :return: Slot index or None if outside the polling hours.
+        """
+        minutes = (at - datetime.combine(at.date(), self.start)
+                   ).total_seconds() / 60
+        slot = int(minutes // self.slot_minutes)
+        return slot if 0 <= slot < self.slots else None
+
+    def __polls_on(
+            self,
+            mensa: str,
+            day: date
+    ) -> int:
+        """
+        Returns the number of polls of a Mensa on a day. Must be called
+         while holding the lock.
+
+        :param mensa: Mensa code.
+        :param day: Day to count.
+        :return: Number of polls.
+        """
+        polled_on, count = self._daily.get(mensa, (day, 0))
+        return count if polled_on == day else 0
+
+    def polls_today(
+            self,
+            now: Optional[datetime] = None
+    ) -> dict[str, int]:
+        """
+        Counts the polls of each Mensa since midnight.
+
+        :param now: Current time (default: now).
+        :return: Dictionary mapping Mensa codes to polls.
+        """
+        day = (now or datetime.now()).date()
+        with self._lock:
+            return {mensa: self.__polls_on(mensa, day) for mensa in self.mensen}
+
+    def observe(
+            self,
+            mensa: str,
+            menu: Optional[MenuResult],
+            at: Optional[datetime] = None
+    ) -> bool:
+        """
+        Records the result of a poll and counts it against the day's budget.
+
+        :param mensa: Mensa code.
+        :param menu: Polled menu, or None if the page was empty or failed.
+        :param at: Time of the poll (default: now).
+        :return: True if the menu changed since the previous poll.
+        """
+        at = at or datetime.now()
+        with self._lock:
+            self._polled[mensa] = at
+            day = at.date()
+            self._daily[mensa] = (day, self.__polls_on(mensa, day) + 1)
+            if menu is None:
+                return False
+
+            digest = menu.digest
+            previous = self._hashes.get(mensa)
+            self._hashes[mensa] = digest
+            if previous is None or previous == digest:
+                return False
+
+            slot = self.__slot(at)
+            if slot is not None:
+                counts = self._changes.setdefault(mensa, [0.0] * self.slots)
+                for index, count in enumerate(counts):
+                    counts[index] = count * self.decay
+                counts[slot] += 1
+        self.logger.info(
+            "Menu of %s changed at %s.", mensa, at.strftime("%H:%M")
+        )
+        return True
+
+    def allocation(self) -> dict[str, int]:
+        """
+        Splits the daily budget between the Mensas. Every Mensa gets one
+         poll; the rest is shared in proportion to how often each menu
+         was seen changing.
+
+        :return: Dictionary mapping Mensa codes to polls per day.
+        """
+        with self._lock:
+            weights = {
+                mensa: 1 + sum(self._changes.get(mensa, []))
+                for mensa in self.mensen
+            }
+        total = sum(weights.values())
+        spare = self.budget - len(self.mensen)
+
+        shares = {
+            mensa: spare * weight / total for mensa, weight in weights.items()
+        }
+        polls = {mensa: 1 + int(share) for mensa, share in shares.items()}
+        # Hand out the remainder by largest fractional share
+        remainder = self.budget - sum(polls.values())
+        for mensa in sorted(
+                shares, key=lambda m: shares[m] - int(shares[m]), reverse=True
+        )[:remainder]:
+            polls[mensa] += 1
+        return polls
+
+    def plan(
+            self,
+            day: Optional[datetime] = None
+    ) -> dict[str, list[datetime]]:
+        """
+        Fits the polling schedule of a day.
+
+        Polls are placed at evenly spaced quantiles of each Mensa's change
+         distribution, smoothed so that every slot keeps a small chance of
+         being polled. At most one poll is placed per slot.
+
+        :param day: Day to plan (default: today).
+        :return: Dictionary mapping Mensa codes to sorted poll times.
+        """
+        day = (day or datetime.now()).date()
+        first = datetime.combine(day, self.start)
+        slot_length = timedelta(minutes=self.slot_minutes)
+
+        schedule = {}
+        for mensa, polls in self.allocation().items():
+            with self._lock:
+                counts = list(self._changes.get(mensa, [0.0] * self.slots))
+            # Smoothing keeps sparse polls outside observed update times
+            smoothing = max(sum(counts), 1.0) / self.slots
+            weights = [count + smoothing for count in counts]
+            total = sum(weights)
+
+            polls = min(polls, self.slots)
+            slots = []
+            cumulative = 0.0
+            slot = 0
+            for k in range(polls):
+                target = (k + 0.5) / polls * total
+                while slot < self.slots - 1 \
+                        and cumulative + weights[slot] < target:
+                    cumulative += weights[slot]
+                    slot += 1
+                if not slots or slots[-1] != slot:
+                    slots.append(slot)
+            schedule[mensa] = [first + slot_length * s for s in slots]
+        return schedule
+
+    def due(
+            self,
+            now: Optional[datetime] = None
+    ) -> list[str]:
+        """
+        Returns the Mensas with a planned poll since their last poll. The
+         plan moves as changes are observed, so a Mensa that used up its
+         allocation today is not due again before midnight, and no Mensa is
+         due once the day's polls reach the budget.
+
+        :param now: Current time (default: now).
+        :return: List of Mensa codes.
+        """
+        now = now or datetime.now()
+        allocation = self.allocation()
+        polls = self.polls_today(now)
+        spent = sum(polls.values())
+        due = []
+        for mensa, times in self.plan(now).items():
+            if spent + len(due) >= self.budget:
+                break
+            if polls[mensa] >= allocation[mensa]:
+                continue
+            with self._lock:
+                last = self._polled.get(mensa)
+            planned = [at for at in times if at <= now]
+            if planned and (last is None or last < planned[-1]):
+                due.append(mensa)
+        return due
+
+    def poll(
+            self,
+            now: Optional[datetime] = None,
+            workers: int = 4
+    ) -> list[str]:
+        """
+        Polls the Mensas that are due and updates the menu cache.
+
+        :param now: Current time (default: now).
+        :param workers: Number of concurrent fetches (default: 4).
+        :return: Mensa codes whose menu changed.
+        """
+        now = now or datetime.now()
+        due = self.due(now)
+        if not due:
+            return []
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            menus = list(pool.map(self.scraper.scrape_menu, due))
+
+        changed = []
+        for mensa, menu in zip(due, menus):
+            if menu and self.cache:
+                self.cache.put(menu)
+            if self.observe(mensa, menu, now):
+                changed.append(mensa)
+        return changed
+
+    def to_dict(self) -> dict:
+        """
+        Serializes the learned update times and last hashes.
+
+        :return: Dictionary with 'changes' and 'hashes' keys.
+        """
+        with self._lock:
+            return {
+                "slot_minutes": self.slot_minutes,
+                "start": self.start.strftime("%H:%M"),
+                "changes": {
+                    mensa: list(counts)
+                    for mensa, counts in self._changes.items()
+                },
+                "hashes": dict(self._hashes),
+            }
+
+    def load(
+            self,
+            path: str
+    ) -> None:
+        """
+        Restores state saved with `save`. State recorded with different
+         polling hours or slots is ignored.
+
+        :param path: Path of the JSON state file.
+        :return: None
+        """
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, json.JSONDecodeError) as e:
+            self.logger.error("Failed to load poller state %s: %s", path, e)
+            return
+
+        compatible = (
+            data.get("slot_minutes") == self.slot_minutes
+            and data.get("start") == self.start.strftime("%H:%M")
+        )
+        with self._lock:
+            if compatible:
+                self._changes = {
+                    mensa: [float(count) for count in counts]
+                    for mensa, counts in data.get("changes", {}).items()
+                    if len(counts) == self.slots
+                }
+            self._hashes = dict(data.get("hashes", {}))
+
+    def save(
+            self,
+            path: str
+    ) -> None:
+        """
+        Saves the learned update times and last hashes as JSON.
+
+        :param path: Path of the JSON state file.
+        :return: None
+        """
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.to_dict(), file, indent=4)
@@ -0,0 +1,466 @@
+import json
+import logging
+import os
+import subprocess
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional, Union
+
+from lunchhunt.utils import apply_cron_block, cron_entry, has_notification_sink
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows; changes are then serialized per process only
+    fcntl = None
+
+
+class ScheduleRegistry:
+    """
+    In-memory registry of profile schedules with persisted state.
+
+    The registry is the source of truth for which profiles are scheduled and
+     when. Queries are answered from memory; changes are saved to a JSON
+     state file and synchronized to the crontab by a background thread, so
+     callers never wait for a `crontab` subprocess. Requests made while a
+     synchronization is running are coalesced into one follow-up run.
+
+    Processes sharing the state file, e.g. the workers of the web UI, take
+     turns through the lock file `<state_path>.lock`: every change re-reads
+     the state, applies itself and saves while holding it, and so does every
+     crontab synchronization.
+    """
+
+    def __init__(
+            self,
+            state_path: Optional[str] = None,
+            user: Optional[str] = None,
+            sync: bool = True,
+            profile_db: Optional[str] = None,
+            **entry_kwargs
+    ):
+        """
+        Initializes an empty registry.
+
+        :param state_path: Path of the JSON state file (default: no
+         persistence).
+        :param user: System username whose crontab is synchronized
+         (default: 'lunchhunt').
+        :param sync: Whether changes are synchronized to the crontab
+         (default: True).
+        :param profile_db: SQLite profile database the scheduled runs read
+         their profiles from (default: the 'settings' directory).
+        :param entry_kwargs: Further arguments of `cron_entry`, e.g.
+         `env_path` or `jitter`.
+        """
+        self.state_path = state_path
+        self.user = user or "lunchhunt"
+        self.sync = sync
+        self.entry_kwargs = entry_kwargs
+        if profile_db:
+            self.entry_kwargs["profile_db"] = profile_db
+
+        # name -> {"schedule_settings": dict, "enabled": bool,
+        #          "menu_categories": list}
+        self._schedules: dict[str, dict] = {}
+        self._retired: set[str] = set()
+        # (inode, mtime, size) of the state file when last read or written
+        self._state_version: Optional[tuple[int, int, int]] = None
+        self._lock = threading.Lock()
+        self._file_lock = threading.Lock()
+
+        self._pending = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._worker: Optional[threading.Thread] = None
+
+        self.last_sync: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def load(
+            cls,
+            state_path: str,
+            **kwargs
+    ) -> "ScheduleRegistry":
+        """
+        Creates a registry from a state file saved by an earlier run or by
+         another process. A missing or invalid file yields an empty registry.
+
+        :param state_path: Path of the JSON state file.
+        :param kwargs: Further arguments of `__init__`.
+        :return: ScheduleRegistry.
+        """
+        registry = cls(state_path=state_path, **kwargs)
+        registry.reload()
+        return registry
+
+    def reload(self) -> None:
+        """
+        Reads the state file again if it changed since it was last read or
+         written, e.g. by another worker process of the web UI. A missing or
+         invalid file leaves the registry unchanged.
+
+        :return: None
+        """
+        if not self.state_path:
+            return
+        try:
+            version = self.__version(os.stat(self.state_path))
+        except FileNotFoundError:
+            return
+        with self._lock:
+            if version == self._state_version:
+                return
+
+        try:
+            with open(self.state_path, encoding='utf-8') as file:
+                # The file may have been replaced since the stat above
+                version = self.__version(os.fstat(file.fileno()))
+                data = json.load(file)
+            schedules = {
+                name: {
+                    "schedule_settings": entry["schedule_settings"],
+                    "enabled": bool(entry.get("enabled", True)),
+                    "menu_categories": list(entry.get("menu_categories", [])),
+                }
+                for name, entry in data.get("schedules", {}).items()
+            }
+            retired = set(data.get("retired", []))
+        except (OSError, json.JSONDecodeError, KeyError, TypeError,
+                AttributeError) as e:
+            self.logger.error(
+                "Failed to load schedule state %s: %s", self.state_path, e
+            )
+            return
+        with self._lock:
+            self._schedules = schedules
+            self._retired = retired
+            self._state_version = version
+
+    @staticmethod
+    def __version(
+            stat: os.stat_result
+    ) -> tuple[int, int, int]:
+        """
+        Identifies a version of the state file. Saving replaces the file, so
+         the inode changes even when the mtime does not.
+
+        :param stat: Result of `os.stat` of the state file.
+        :return: Tuple of inode, mtime in nanoseconds and size.
+        """
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    @contextmanager
+    def __locked(self) -> Iterator[None]:
+        """
+        Holds the lock file shared by all processes using the state file, and
+         the registry's own lock for the threads of this process.
+
+        :return: Context manager.
+        """
+        with self._file_lock:
+            if not self.state_path or fcntl is None:
+                yield
+                return
+            directory = os.path.dirname(self.state_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(f"{self.state_path}.lock", 'a') as file:
+                fcntl.flock(file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(file, fcntl.LOCK_UN)
+
+    def reconcile(
+            self,
+            profiles: dict[str, dict]
+    ) -> None:
+        """
+        Aligns the registry with the profiles on disk: new profiles are
+         added, changed schedules are updated and schedules of missing
+         profiles are removed. Profiles without a notification sink, such
+         as the sample settings file, are not scheduled. Disabled schedules
+         stay disabled.
+
+        :param profiles: Dictionary mapping settings file names to loaded
+         settings, as returned by `load_profiles`.
+        :return: None
+        """
+        profiles = {
+            name: settings for name, settings in profiles.items()
+            if has_notification_sink(settings)
+        }
+        with self.__locked():
+            self.reload()
+            with self._lock:
+                changed = False
+                for name in set(self._schedules) - set(profiles):
+                    del self._schedules[name]
+                    self._retired.add(name)
+                    changed = True
+                for name, settings in profiles.items():
+                    current = self._schedules.get(name)
+                    entry = {
+                        "schedule_settings": settings.get(
+                            "schedule_settings", {}
+                        ),
+                        "enabled": current["enabled"] if current else True,
+                        "menu_categories": list(settings.get(
+                            "scraper_settings", {}
+                        ).get("menu_categories", [])),
+                    }
+                    if entry != current:
+                        self._schedules[name] = entry
+                        changed = True
+            # Every worker of the web UI reconciles on start; unchanged
+            # profiles neither rewrite the state file nor the crontab
+            if not changed:
+                return
+            self.save()
+        self.__changed()
+
+    def update(
+            self,
+            name: str,
+            schedule_settings: dict,
+            enable: bool = False,
+            menu_categories: Optional[list[str]] = None
+    ) -> None:
+        """
+        Sets the schedule of a profile. New schedules are enabled; existing
+         ones keep their enabled flag unless `enable` is set, so a schedule
+         disabled by the user stays disabled when only the settings change.
+
+        :param name: Settings file name.
+        :param schedule_settings: The profile's 'schedule_settings'.
+        :param enable: Enable a disabled schedule as well (default: False).
+        :param menu_categories: The profile's menu categories, whose meal
+         cutoffs bound the jitter of its crontab entry (optional).
+        :return: None
+        """
+        with self.__locked():
+            self.reload()
+            with self._lock:
+                current = self._schedules.get(name)
+                enabled = enable or current is None or current["enabled"]
+                self._schedules[name] = {
+                    "schedule_settings": schedule_settings,
+                    "enabled": enabled,
+                    "menu_categories": list(menu_categories or []),
+                }
+                self._retired.discard(name)
+            self.save()
+        self.__changed()
+
+    def remove(
+            self,
+            name: str
+    ) -> None:
+        """
+        Removes the schedule of a deleted profile.
+
+        :param name: Settings file name.
+        :return: None
+        """
+        with self.__locked():
+            self.reload()
+            with self._lock:
+                self._schedules.pop(name, None)
+                self._retired.add(name)
+            self.save()
+        self.__changed()
+
+    def disable(
+            self,
+            entries: list[str]
+    ) -> int:
+        """
+        Stops scheduling the profiles of some crontab entries, while keeping
+         the profiles. Saving a profile again enables it.
+
+        :param entries: Crontab lines as returned by `jobs`.
+        :return: Number of disabled schedules.
+        """
+        entries = set(entries)
+        disabled = 0
+        with self.__locked():
+            self.reload()
+            with self._lock:
+                for name, schedule in self._schedules.items():
+                    if schedule["enabled"] and self.__entry(name) in entries:
+                        schedule["enabled"] = False
+                        disabled += 1
+            self.save()
+        self.__changed()
+        return disabled
+
+    def __entry(
+            self,
+            name: str
+    ) -> Optional[str]:
+        """
+        Builds the crontab line of a registered profile.
+
+        :param name: Settings file name.
+        :return: Crontab line or None if the schedule is incomplete.
+        """
+        try:
+            return cron_entry(
+                self._schedules[name]["schedule_settings"],
+                settings_name=name,
+                user=self.user,
+                categories=self._schedules[name].get("menu_categories"),
+                **self.entry_kwargs
+            )
+        except (ValueError, TypeError, AttributeError):
+            return None
+
+    def jobs(self) -> list[tuple[str, str]]:
+        """
+        Lists the enabled schedules, sorted by time.
+
+        :return: List of (label, crontab line) tuples, labelled
+         'HH:MM - profile'.
+        """
+        self.reload()
+        with self._lock:
+            jobs = []
+            for name, schedule in self._schedules.items():
+                entry = self.__entry(name)
+                if not schedule["enabled"] or entry is None:
+                    continue
+                settings = schedule["schedule_settings"]
+                label = (f"{int(settings['hour']):02d}:"
+                         f"{int(settings['minute']):02d} - "
+                         f"{name.removesuffix('.json')}")
+                jobs.append((label, entry))
+        return sorted(jobs)
+
+    def __changed(self) -> None:
+        """
+        Requests a background synchronization after a saved change.
+
+        :return: None
+        """
+        if self.sync:
+            self.request_sync()
+
+    def save(self) -> None:
+        """
+        Saves the registry to its state file, if it has one. Changes made
+         through the registry's methods are saved while holding the lock
+         file; callers saving on their own should not share the state file.
+
+        :return: None
+        """
+        if not self.state_path:
+            return
+        with self._lock:
+            data = {
+                "schedules": self._schedules,
+                "retired": sorted(self._retired),
+            }
+            content = json.dumps(data, indent=4)
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Write atomically, so a crash never leaves a truncated state file;
+        # the temporary name is unique per process and thread
+        temporary = (f"{self.state_path}.{os.getpid()}."
+                     f"{threading.get_ident()}.tmp")
+        with open(temporary, 'w', encoding='utf-8') as file:
+            file.write(content)
+        os.replace(temporary, self.state_path)
+        with self._lock:
+            self._state_version = self.__version(os.stat(self.state_path))
+
+    def request_sync(self) -> None:
+        """
+        Schedules a synchronization of the crontab in the background.
+
+        :return: None
+        """
+        with self._lock:
+            self._idle.clear()
+            self._pending.set()
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self.__sync_loop, name="schedule-sync", daemon=True
+                )
+                self._worker.start()
+
+    def __sync_loop(self) -> None:
+        """
+        Synchronizes the crontab until no more requests are pending.
+
+        :return: None
+        """
+        while True:
+            with self._lock:
+                if not self._pending.is_set():
+                    self._idle.set()
+                    self._worker = None
+                    return
+                self._pending.clear()
+            self.sync_now()
+
+    def sync_now(self) -> bool:
+        """
+        Synchronizes the crontab with the enabled schedules immediately.
+
+        :return: True if the crontab was written, False if it was up to date
+         or the synchronization failed.
+        """
+        # Hold the lock file, so no other process changes the state between
+        # reading it and writing the crontab
+        with self.__locked():
+            lines = [entry for _, entry in self.jobs()]
+            with self._lock:
+                names = [*self._schedules, *self._retired]
+                retired = set(self._retired)
+
+            try:
+                written = apply_cron_block(
+                    lines,
+                    profile_names=names,
+                    user=self.user,
+                    script_path=self.entry_kwargs.get("script_path")
+                )
+            except (OSError, subprocess.CalledProcessError) as e:
+                self.last_error = str(e)
+                self.logger.error("Failed to synchronize crontab: %s", e)
+                return False
+
+            with self._lock:
+                self._retired -= retired
+            self.last_sync = datetime.now()
+            self.last_error = None
+            if retired:
+                self.save()
+        return written
+
+    def flush(
+            self,
+            timeout: Optional[Union[int, float]] = None
+    ) -> bool:
+        """
+        Waits until all requested synchronizations have finished.
+
+        :param timeout: Maximum number of seconds to wait (default: no limit).
+        :return: True if no synchronization is pending.
+        """
+        return self._idle.wait(timeout)
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self._schedules
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._schedules)
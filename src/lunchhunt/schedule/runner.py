@@ -0,0 +1,333 @@
+import logging
+import time
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from lunchhunt.notify import NotificationDispatcher, create_sinks
+from lunchhunt.profiles import SubscriptionIndex
+from lunchhunt.schedule.mensa_calendar import MensaCalendar
+from lunchhunt.scrap import MensaScraper, MenuCache, MenuResult, NegativeCache
+from lunchhunt.utils import update_menu_categories
+
+
+@dataclass(frozen=True)
+class ProfileReport:
+    """
+    Outcome of running a single profile. `finished` is the
+     `time.monotonic()` timestamp at which the run completed.
+    """
+    name: str
+    exit_code: int
+    duration: float
+    notifications: int = 0
+    finished: float = 0.0
+
+
+def active_categories(
+        settings: dict
+) -> Optional[list[str]]:
+    """
+    Returns the menu categories of a profile that are still worth notifying
+     about at the current time.
+
+    :param settings: Loaded profile settings.
+    :return: List of categories or None if all mealtimes have passed.
+    """
+    return update_menu_categories(
+        categories=settings['scraper_settings']['menu_categories'],
+        timetable=None,
+        offset=settings['schedule_settings'].get('offset', 30)
+    )
+
+
+def profile_dishes(
+        settings: dict,
+        menu: MenuResult,
+        categories: list[str]
+) -> Optional[dict[str, list[str]]]:
+    """
+    Selects the dishes of a menu a profile is notified about: all dishes of
+     its categories, or only those matching its favorite foods.
+
+    :param settings: Loaded profile settings.
+    :param menu: Menu of one Mensa.
+    :param categories: Categories still worth notifying about.
+    :return: Dictionary of dishes per category or None if there are none.
+    """
+    favorite_foods = settings['scraper_settings'].get('favorite_foods')
+    menu = menu.filter(categories)
+    dishes = menu.find_matches(favorite_foods) \
+        if favorite_foods else menu.dishes_by_category
+    return dishes or None
+
+
+def prepare_profiles(
+        profiles: dict[str, dict]
+) -> tuple[dict[str, dict], set[str]]:
+    """
+    Restricts every profile to the categories still worth notifying about.
+
+    :param profiles: Dictionary mapping profile names to loaded settings.
+    :return: Tuple of the active profiles, with their 'menu_categories'
+     narrowed down, and the names of invalid profiles. Profiles without
+     active categories are in neither.
+    """
+    active = {}
+    invalid = set()
+    for name, settings in profiles.items():
+        try:
+            categories = active_categories(settings)
+        except (KeyError, TypeError) as e:
+            logging.error("Invalid profile %s: %s", name, e)
+            invalid.add(name)
+            continue
+        if categories:
+            active[name] = {
+                **settings,
+                "scraper_settings": {
+                    **settings['scraper_settings'],
+                    "menu_categories": categories
+                }
+            }
+    return active, invalid
+
+
+def scrape_menus(
+        wanted: dict[str, set[str]],
+        workers: int = 4,
+        scraper: Optional[MensaScraper] = None,
+        cache: Optional[MenuCache] = None
+) -> dict[str, MenuResult]:
+    """
+    Scrapes every wanted Mensa once, concurrently. Menus found in the cache
+     are served from memory; freshly scraped menus are added to it.
+
+    :param wanted: Dictionary mapping Mensa codes to the categories needed
+     by any profile.
+    :param workers: Number of concurrent fetches (default: 4).
+    :param scraper: Scraper shared by all fetches (default: new scraper).
+    :param cache: Cache of complete menus (optional).
+    :return: Dictionary mapping Mensa codes to their menu, restricted to the
+     wanted categories. Mensas without such dishes are omitted.
+    """
+    scraper = scraper or MensaScraper(pool_size=max(1, workers))
+
+    complete = {}
+    missing = {}
+    for mensa, categories in wanted.items():
+        cached = cache.get(mensa) if cache else None
+        if cached:
+            complete[mensa] = cached
+        else:
+            # Scrape the whole page, so the cached menu serves every profile
+            missing[mensa] = sorted(set(scraper.menu_categories) | categories)
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {
+                pool.submit(scraper.scrape_menu, mensa, categories): mensa
+                for mensa, categories in missing.items()
+            }
+            for future in as_completed(futures):
+                mensa = futures[future]
+                try:
+                    menu = future.result()
+                except Exception as e:
+                    logging.error("Failed to scrape %s: %s", mensa, e)
+                    continue
+                if menu:
+                    complete[mensa] = menu
+                    if cache:
+                        cache.put(menu)
+
+    menus = {}
+    for mensa, categories in wanted.items():
+        menu = complete[mensa].filter(sorted(categories)) \
+            if mensa in complete else None
+        if menu and menu.dishes:
+            menus[mensa] = menu
+        else:
+            logging.info("No dishes found for %s.", mensa)
+    return menus
+
+
+def run_profile(
+        name: str,
+        settings: dict,
+        menus: dict[str, MenuResult]
+) -> ProfileReport:
+    """
+    Matches a profile against the shared menus and sends its notifications.
+
+    :param name: Profile name (settings file name).
+    :param settings: Loaded profile settings.
+    :param menus: Menus scraped for this run, by Mensa code.
+    :return: ProfileReport with exit code 0 on success and 1 if the profile
+     failed or a notification could not be delivered.
+    """
+    started = time.perf_counter()
+    exit_code = 0
+    sent = 0
+
+    try:
+        categories = active_categories(settings) or []
+        scraper_settings = settings['scraper_settings']
+        gotify_settings = settings.get('gotify_settings', {})
+
+        with NotificationDispatcher(
+            sinks=create_sinks(
+                gotify_settings=gotify_settings,
+                sink_settings=settings.get('sink_settings')
+            ),
+            priority=gotify_settings.get('priority', 5)
+        ) as notifier:
+            for mensa in scraper_settings['mensen']:
+                if mensa not in menus:
+                    continue
+                dishes = profile_dishes(settings, menus[mensa], categories)
+                if not dishes:
+                    continue
+
+                results = notifier.send_notification(
+                    message=dishes,
+                    website=menus[mensa].url,
+                    location=menus[mensa].mensa_name
+                )
+                sent += 1
+                if not all(results.values()):
+                    exit_code = 1
+    except Exception as e:
+        logging.error("Profile %s failed: %s", name, e)
+        exit_code = 1
+
+    return ProfileReport(
+        name=name,
+        exit_code=exit_code,
+        duration=time.perf_counter() - started,
+        notifications=sent,
+        finished=time.monotonic()
+    )
+
+
+def plan_scrapes(
+        index: SubscriptionIndex,
+        calendar: Optional[MensaCalendar] = None,
+        at: Optional[datetime] = None
+) -> dict[str, set[str]]:
+    """
+    Determines which Mensas and categories have to be fetched. With a
+     calendar, closed Mensas and finished meal windows are skipped before
+     any request is made.
+
+    :param index: Subscriptions of the profiles to run.
+    :param calendar: Opening calendar (optional).
+    :param at: Point in time of the run (default: now).
+    :return: Dictionary mapping Mensa codes to the categories to fetch.
+    """
+    wanted = {}
+    for mensa, categories in index.subscriptions().items():
+        if calendar:
+            categories = set(calendar.open_categories(
+                mensa, sorted(categories), at
+            ))
+            if not categories:
+                logging.info("Skipping %s, closed or too late.", mensa)
+                continue
+        wanted[mensa] = categories
+    return wanted
+
+
+def record_scrapes(
+        calendar: MensaCalendar,
+        scraper: MensaScraper,
+        wanted: dict[str, set[str]],
+        menus: dict[str, MenuResult],
+        at: Optional[datetime] = None
+) -> None:
+    """
+    Records which fetched Mensas had a menu, so the calendar can learn
+     closed days. Failed requests are not recorded.
+
+    :param calendar: Opening calendar to update.
+    :param scraper: Scraper used for the fetches.
+    :param wanted: Fetched Mensas and categories.
+    :param menus: Scraped menus.
+    :param at: Point in time of the run (default: now).
+    :return: None
+    """
+    day = (at or datetime.now()).date()
+    for mensa in wanted:
+        if mensa in menus:
+            calendar.record(mensa, day, empty=False)
+        elif scraper.miss_reason(mensa) == NegativeCache.EMPTY:
+            calendar.record(mensa, day, empty=True)
+
+
+def run_profiles(
+        profiles: dict[str, dict],
+        workers: int = 4,
+        executor: str = "thread",
+        calendar: Optional[MensaCalendar] = None,
+        cache: Optional[MenuCache] = None,
+        scraper: Optional[MensaScraper] = None
+) -> list[ProfileReport]:
+    """
+    Runs many profiles in one invocation. Every Mensa is scraped once and
+     its menu is shared by all profiles subscribed to it.
+
+    :param profiles: Dictionary mapping profile names to loaded settings.
+     Profile runs are started in the order of the dictionary.
+    :param workers: Number of concurrent scrapes and profile runs
+     (default: 4).
+    :param executor: 'thread' or 'process' pool for the profile runs
+     (default: 'thread').
+    :param calendar: Opening calendar used to skip closed Mensas and to
+     learn closed days from empty pages (optional).
+    :param cache: Menu cache to serve prefetched menus from (optional).
+    :param scraper: Scraper shared across runs (default: new scraper).
+    :return: List of ProfileReports in profile name order.
+    """
+    active, invalid = prepare_profiles(profiles)
+
+    now = datetime.now()
+    index = SubscriptionIndex(active)
+    wanted = plan_scrapes(index, calendar, now)
+    scraper = scraper or MensaScraper(pool_size=max(1, workers))
+    menus = scrape_menus(wanted, workers=workers, scraper=scraper, cache=cache)
+    if calendar:
+        record_scrapes(calendar, scraper, wanted, menus, now)
+
+    # Only profiles subscribed to a Mensa with dishes have work to do
+    relevant = set().union(*(
+        index.subscribers(mensa, menu.categories)
+        for mensa, menu in menus.items()
+    ))
+
+    reports = {
+        name: ProfileReport(
+            name=name, exit_code=int(name in invalid), duration=0.0,
+            finished=time.monotonic()
+        )
+        for name in profiles if name not in relevant
+    }
+
+    pool_class: type[Executor] = (
+        ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+    )
+    with pool_class(max_workers=max(1, workers)) as pool:
+        futures = [
+            pool.submit(run_profile, name, profiles[name], menus)
+            for name in profiles if name in relevant
+        ]
+        for future in as_completed(futures):
+            report = future.result()
+            reports[report.name] = report
+
+    return [reports[name] for name in sorted(reports)]
@@ -0,0 +1,348 @@
+import logging
+import time as timer
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time, timedelta
+from typing import Optional, Union
+
+from lunchhunt.schedule.jobs import Job, JobQueue, category_cutoffs
+from lunchhunt.schedule.mensa_calendar import WEEKDAYS, MensaCalendar
+from lunchhunt.schedule.poller import AdaptivePoller
+from lunchhunt.schedule.runner import ProfileReport, run_profiles
+from lunchhunt.scrap import MensaScraper, MenuCache
+from lunchhunt.utils import profile_jitter
+
+
+def fire_times(
+        schedule_settings: dict,
+        start: datetime,
+        end: datetime
+) -> list[datetime]:
+    """
+    Lists the times a profile fires within a period.
+
+    :param schedule_settings: The profile's 'schedule_settings' with 'hour',
+     'minute' and 'alarm_days'.
+    :param start: Start of the period (exclusive).
+    :param end: End of the period (inclusive).
+    :return: Sorted list of fire times.
+    """
+    hour = schedule_settings.get("hour")
+    minute = schedule_settings.get("minute")
+    alarm_days = schedule_settings.get("alarm_days", {})
+    if hour is None or minute is None:
+        return []
+
+    times = []
+    day = start.date()
+    while day <= end.date():
+        if alarm_days.get(WEEKDAYS[day.weekday()]):
+            fire_at = datetime.combine(day, time(int(hour), int(minute)))
+            if start < fire_at <= end:
+                times.append(fire_at)
+        day += timedelta(days=1)
+    return times
+
+
+class Scheduler:
+    """
+    In-process scheduler that fires profiles at their configured times, as
+     an alternative to one cron job per profile.
+
+    Shortly before profiles fire, the menus of all Mensas they need are
+     fetched into the menu cache. At fire time, matching and notifying then
+     run from memory without waiting for the Mensa website.
+
+    Due profiles are run earliest meal cutoff first. Profiles that are too
+     late for some of their categories only notify about the remaining ones,
+     and profiles that are too late for all of them are dropped.
+    """
+
+    # Time a staggered profile keeps before its earliest meal cutoff, so it
+    # still runs with all of its categories
+    JITTER_MARGIN = timedelta(minutes=1)
+
+    def __init__(
+            self,
+            profiles: dict[str, dict],
+            cache: Optional[MenuCache] = None,
+            scraper: Optional[MensaScraper] = None,
+            calendar: Optional[MensaCalendar] = None,
+            prefetch_window: Union[int, float] = 10,
+            prefetch_lead: Union[int, float] = 2,
+            workers: int = 4,
+            poller: Optional[AdaptivePoller] = None,
+            jitter_window: Union[int, float] = 0
+    ):
+        """
+        Initializes the scheduler.
+
+        :param profiles: Dictionary mapping profile names to loaded settings.
+        :param cache: Menu cache shared by prefetch and profile runs
+         (default: new cache).
+        :param scraper: Scraper shared by all fetches (default: new scraper).
+        :param calendar: Opening calendar to skip closed Mensas (optional).
+        :param prefetch_window: Minutes ahead in which upcoming profiles are
+         considered for prefetching (default: 10).
+        :param prefetch_lead: Minutes before the earliest upcoming fire time
+         at which the cache is warmed (default: 2).
+        :param workers: Number of concurrent fetches and profile runs
+         (default: 4).
+        :param poller: Adaptive poller that keeps the menu cache up to date
+         between fire times (optional).
+        :param jitter_window: Minutes across which profiles scheduled at the
+         same time are spread by a fixed per-profile delay (default: 0).
+        """
+        self.profiles = profiles
+        self.cache = cache or MenuCache()
+        self.scraper = scraper or MensaScraper(pool_size=max(1, workers))
+        self.calendar = calendar
+        self.prefetch_window = timedelta(minutes=prefetch_window)
+        self.prefetch_lead = timedelta(minutes=prefetch_lead)
+        self.workers = workers
+        self.poller = poller
+        self.jitter_window = timedelta(minutes=jitter_window)
+
+        self.last_tick: Optional[datetime] = None
+        self.prefetched_for: Optional[datetime] = None
+        self.queue = JobQueue()
+
+        self._lateness_count = 0
+        self._lateness_total = 0.0
+        self._lateness_max: Optional[float] = None
+        self._late = 0
+
+        self.logger = logging.getLogger(__name__)
+
+    def upcoming(
+            self,
+            start: datetime,
+            end: datetime
+    ) -> list[tuple[datetime, str]]:
+        """
+        Lists all profile fire times within a period, including their
+         jitter.
+
+        :param start: Start of the period (exclusive).
+        :param end: End of the period (inclusive).
+        :return: Sorted list of (fire time, profile name) tuples.
+        """
+        # Jitter only delays, so earlier scheduled times may fire in the period
+        times = []
+        for name, settings in self.profiles.items():
+            for scheduled in fire_times(
+                    settings.get("schedule_settings", {}),
+                    start - self.jitter_window, end
+            ):
+                fire_at = self.staggered(name, scheduled)
+                if start < fire_at <= end:
+                    times.append((fire_at, name))
+        return sorted(times)
+
+    def staggered(
+            self,
+            name: str,
+            scheduled: datetime
+    ) -> datetime:
+        """
+        Delays a scheduled fire time by the profile's jitter, keeping it at
+         least `JITTER_MARGIN` before the earliest meal cutoff still ahead of
+         the scheduled time. The delay is never negative.
+
+        :param name: Profile name.
+        :param scheduled: Configured fire time.
+        :return: Actual fire time.
+        """
+        if not self.jitter_window:
+            return scheduled
+
+        jitter = timedelta(seconds=profile_jitter(
+            name, self.jitter_window.total_seconds()
+        ))
+        try:
+            cutoffs = category_cutoffs(
+                self.profiles[name], scheduled.date(), self.calendar
+            )
+        except (KeyError, TypeError):
+            cutoffs = {}
+        ahead = [cutoff for cutoff in cutoffs.values() if cutoff > scheduled]
+        if ahead:
+            latest = min(ahead) - scheduled - self.JITTER_MARGIN
+            jitter = max(timedelta(0), min(jitter, latest))
+        return scheduled + jitter
+
+    def prefetch(
+            self,
+            now: Optional[datetime] = None
+    ) -> list[str]:
+        """
+        Warms the menu cache for all profiles firing within the prefetch
+         window, once the earliest of them is less than the lead time away.
+
+        :param now: Current time (default: now).
+        :return: Mensa codes that were fetched.
+        """
+        now = now or datetime.now()
+        upcoming = self.upcoming(now, now + self.prefetch_window)
+        if not upcoming:
+            return []
+
+        earliest = upcoming[0][0]
+        if now < earliest - self.prefetch_lead \
+                or self.prefetched_for == earliest:
+            return []
+
+        mensen = set()
+        for fire_at, name in upcoming:
+            scraper_settings = self.profiles[name].get("scraper_settings", {})
+            for mensa in scraper_settings.get("mensen", []):
+                if self.calendar and not self.calendar.is_open(
+                        mensa, fire_at.date()):
+                    continue
+                if mensa not in self.cache:
+                    mensen.add(mensa)
+
+        def warm(mensa: str) -> Optional[str]:
+            menu = self.scraper.scrape_menu(mensa)
+            if menu:
+                self.cache.put(menu)
+                return mensa
+            return None
+
+        with ThreadPoolExecutor(max_workers=max(1, self.workers)) as pool:
+            fetched = [
+                mensa for mensa in pool.map(warm, sorted(mensen)) if mensa
+            ]
+
+        self.prefetched_for = earliest
+        self.logger.info(
+            "Prefetched %d menu(s) for %d profile run(s) from %s.",
+            len(fetched), len(upcoming), earliest.strftime("%H:%M")
+        )
+        return fetched
+
+    def due(
+            self,
+            now: datetime
+    ) -> list[str]:
+        """
+        Returns the profiles that fired since the last tick.
+
+        :param now: Current time.
+        :return: List of profile names.
+        """
+        start = self.last_tick or now - timedelta(seconds=1)
+        return sorted({name for _, name in self.upcoming(start, now)})
+
+    def tick(
+            self,
+            now: Optional[datetime] = None
+    ) -> list[ProfileReport]:
+        """
+        Polls changed menus, runs the profiles that are due and prefetches
+         for upcoming ones.
+
+        :param now: Current time (default: now).
+        :return: Reports of the profiles run in this tick.
+        """
+        now = now or datetime.now()
+        start = self.last_tick or now - timedelta(seconds=1)
+        self.last_tick = now
+
+        if self.poller:
+            self.poller.poll(now, self.workers)
+
+        queued = set()
+        for fire_at, name in self.upcoming(start, now):
+            if name not in queued:
+                queued.add(name)
+                self.queue.push(
+                    Job.create(name, self.profiles[name], fire_at, self.calendar)
+                )
+
+        reports = []
+        jobs = self.queue.pop_ready(now)
+        if jobs:
+            started = timer.monotonic()
+            reports = run_profiles(
+                {job.name: job.settings for job in jobs},
+                workers=self.workers,
+                calendar=self.calendar,
+                cache=self.cache,
+                scraper=self.scraper
+            )
+            deadlines = {job.name: job.deadline for job in jobs}
+            for report in reports:
+                lateness = self.__record_lateness(
+                    now + timedelta(seconds=report.finished - started),
+                    deadlines[report.name]
+                )
+                self.logger.info(
+                    "%s: exit code %d, %d notification(s), %.3fs, "
+                    "%+.0fs to deadline",
+                    report.name, report.exit_code, report.notifications,
+                    report.duration, lateness
+                )
+
+        self.prefetch(now)
+        return reports
+
+    def __record_lateness(
+            self,
+            completed: datetime,
+            deadline: datetime
+    ) -> float:
+        """
+        Records how late a job completed relative to its deadline.
+
+        :param completed: Completion time of the job.
+        :param deadline: Deadline of the job.
+        :return: Lateness in seconds; negative if the job finished early.
+        """
+        lateness = (completed - deadline).total_seconds()
+        self._lateness_count += 1
+        self._lateness_total += lateness
+        self._lateness_max = lateness if self._lateness_max is None \
+            else max(self._lateness_max, lateness)
+        if lateness > 0:
+            self._late += 1
+        return lateness
+
+    def lateness_stats(self) -> dict[str, float]:
+        """
+        Returns lateness statistics of all jobs run so far.
+
+        :return: Dictionary with 'count', 'mean' and 'max' lateness in seconds
+         (negative values mean the deadline was met with time to spare), the
+         number of 'late' jobs, and the number of 'dropped' and 'downgraded'
+         jobs.
+        """
+        return {
+            "count": self._lateness_count,
+            "mean": (self._lateness_total / self._lateness_count
+                     if self._lateness_count else 0.0),
+            "max": self._lateness_max or 0.0,
+            "late": self._late,
+            "dropped": self.queue.dropped,
+            "downgraded": self.queue.downgraded,
+        }
+
+    def run_forever(
+            self,
+            interval: Union[int, float] = 20
+    ) -> None:
+        """
+        Ticks until interrupted.
+
+        :param interval: Seconds between ticks (default: 20).
+        :return: None
+        """
+        self.logger.info(
+            "Scheduling %d profile(s), ticking every %ss.",
+            len(self.profiles), interval
+        )
+        try:
+            while True:
+                self.tick()
+                timer.sleep(interval)
+        except KeyboardInterrupt:
+            self.logger.info("Scheduler stopped.")
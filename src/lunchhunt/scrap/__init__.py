@@ -1,5 +1,15 @@
+from .cache import MenuCache, NegativeCache
+from .parser import parse_menu_html
+from .refresher import MenuRefresher
+from .result import MenuResult, match_dishes
 from .scraper import MensaScraper
 
 __all__ = [
     "MensaScraper",
+    "MenuCache",
+    "MenuRefresher",
+    "MenuResult",
+    "NegativeCache",
+    "match_dishes",
+    "parse_menu_html",
 ]
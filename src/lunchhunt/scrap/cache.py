@@ -0,0 +1,342 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Optional, Union
+
+from lunchhunt.scrap.result import MenuResult
+
+
+class NegativeCache:
+    """
+    Remembers recent misses, so that repeated requests for a failing or
+     empty page are answered without fetching it again.
+
+    Misses are kept per reason with their own time to live: HTTP errors
+     ('error') usually clear up sooner than closed days ('empty').
+    """
+
+    ERROR = "error"
+    EMPTY = "empty"
+
+    def __init__(
+            self,
+            error_ttl: Union[int, float] = 60,
+            empty_ttl: Union[int, float] = 300,
+            clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initializes an empty cache.
+
+        :param error_ttl: Seconds to remember failed requests (default: 60).
+         0 disables caching of errors.
+        :param empty_ttl: Seconds to remember pages without menu sections
+         (default: 300). 0 disables caching of empty pages.
+        :param clock: Monotonic time source (default: time.monotonic).
+        """
+        self.ttls = {self.ERROR: error_ttl, self.EMPTY: empty_ttl}
+        self.clock = clock
+
+        self._entries: dict[str, tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def add(
+            self,
+            key: str,
+            reason: str
+    ) -> None:
+        """
+        Records a miss.
+
+        :param key: Cache key, e.g. the page URL.
+        :param reason: NegativeCache.ERROR or NegativeCache.EMPTY.
+        :return: None
+        """
+        ttl = self.ttls[reason]
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self.clock() + ttl, reason)
+
+    def get(
+            self,
+            key: str
+    ) -> Optional[str]:
+        """
+        Looks up a recorded miss.
+
+        :param key: Cache key, e.g. the page URL.
+        :return: Reason of the miss or None if there is no live entry.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, reason = entry
+            if self.clock() >= expires:
+                del self._entries[key]
+                return None
+            return reason
+
+    def discard(
+            self,
+            key: str
+    ) -> None:
+        """
+        Forgets a recorded miss.
+
+        :param key: Cache key, e.g. the page URL.
+        :return: None
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Forgets all recorded misses.
+
+        :return: None
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class MenuCache:
+    """
+    Time-limited cache of scraped menus per Mensa.
+
+    Menus are stored with all their categories, so one cached page serves
+     every profile regardless of the categories it is interested in.
+
+    If a state directory is given, every stored menu is also written there,
+     and menus stored by other processes sharing the directory, e.g. the
+     workers of the web UI, are read from it when their file changed.
+    """
+
+    def __init__(
+            self,
+            ttl: Union[int, float] = 900,
+            clock: Callable[[], float] = time.monotonic,
+            state_dir: Optional[str] = None
+    ):
+        """
+        Initializes an empty cache.
+
+        :param ttl: Seconds a menu stays fresh (default: 900).
+        :param clock: Monotonic time source (default: time.monotonic).
+        :param state_dir: Directory menus are shared through
+         (default: menus are kept in memory only).
+        """
+        self.ttl = ttl
+        self.clock = clock
+        self.state_dir = state_dir
+
+        self._entries: dict[str, tuple[float, MenuResult]] = {}
+        # Mensa -> (inode, mtime, size) of its file when last read or written
+        self._versions: dict[str, tuple[int, int, int]] = {}
+        self._lock = threading.Lock()
+
+        self.logger = logging.getLogger(__name__)
+
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+
+    def __path(
+            self,
+            mensa: str
+    ) -> str:
+        """
+        Returns the state file of a Mensa.
+
+        :param mensa: Mensa code.
+        :return: Path of the Mensa's JSON state file.
+        """
+        return os.path.join(self.state_dir, f"{mensa}.json")
+
+    @staticmethod
+    def __version(
+            stat: os.stat_result
+    ) -> tuple[int, int, int]:
+        """
+        Identifies a version of a state file. Writing replaces the file, so
+         the inode changes even when the mtime does not.
+
+        :param stat: Result of `os.stat` of the state file.
+        :return: Tuple of inode, mtime in nanoseconds and size.
+        """
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def __write(
+            self,
+            menu: MenuResult
+    ) -> None:
+        """
+        Shares a stored menu through the state directory.
+
+        :param menu: Stored menu.
+        :return: None
+        """
+        path = self.__path(menu.mensa)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        data = {
+            "stored": time.time(),
+            "mensa": menu.mensa,
+            "mensa_name": menu.mensa_name,
+            "location": menu.location,
+            "url": menu.url,
+            "dishes_by_category": menu.dishes_by_category,
+        }
+        try:
+            with open(temporary, 'w', encoding='utf-8') as file:
+                json.dump(data, file, ensure_ascii=False)
+            os.replace(temporary, path)
+            version = self.__version(os.stat(path))
+        except OSError as e:
+            self.logger.error("Failed to share menu of %s: %s", menu.mensa, e)
+            return
+        with self._lock:
+            self._versions[menu.mensa] = version
+
+    def __read(
+            self,
+            mensa: str
+    ) -> None:
+        """
+        Reads the state file of a Mensa again if it changed since it was
+         last read or written, e.g. by another process. A missing or invalid
+         file leaves the cache unchanged.
+
+        :param mensa: Mensa code.
+        :return: None
+        """
+        # Codes may come from requests; never read outside the directory
+        if not self.state_dir or os.path.basename(mensa) != mensa:
+            return
+        path = self.__path(mensa)
+        try:
+            version = self.__version(os.stat(path))
+        except OSError:
+            return
+        with self._lock:
+            if version == self._versions.get(mensa):
+                return
+
+        try:
+            with open(path, encoding='utf-8') as file:
+                version = self.__version(os.fstat(file.fileno()))
+                data = json.load(file)
+            age = max(0.0, time.time() - data.pop("stored"))
+            menu = MenuResult.from_dict(**data)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.logger.error("Failed to read menu of %s: %s", mensa, e)
+            return
+        with self._lock:
+            self._versions[mensa] = version
+            if age < self.ttl:
+                self._entries[mensa] = (self.clock() + self.ttl - age, menu)
+
+    def put(
+            self,
+            menu: MenuResult
+    ) -> None:
+        """
+        Stores a menu under its Mensa code.
+
+        :param menu: Scraped menu.
+        :return: None
+        """
+        with self._lock:
+            self._entries[menu.mensa] = (self.clock() + self.ttl, menu)
+        if self.state_dir:
+            self.__write(menu)
+
+    def get(
+            self,
+            mensa: str,
+            categories: Optional[list[str]] = None
+    ) -> Optional[MenuResult]:
+        """
+        Returns a fresh cached menu.
+
+        :param mensa: Mensa code.
+        :param categories: Categories to restrict the menu to (default: all).
+        :return: MenuResult or None if the Mensa is not cached or expired.
+        """
+        self.__read(mensa)
+        with self._lock:
+            entry = self._entries.get(mensa)
+            if entry is None:
+                return None
+            expires, menu = entry
+            if self.clock() >= expires:
+                del self._entries[mensa]
+                return None
+        return menu.filter(categories) if categories is not None else menu
+
+    def age(
+            self,
+            mensa: str
+    ) -> Optional[float]:
+        """
+        Returns how long ago a fresh cached menu was stored.
+
+        :param mensa: Mensa code.
+        :return: Age in seconds or None if the Mensa is not cached or expired.
+        """
+        self.__read(mensa)
+        with self._lock:
+            entry = self._entries.get(mensa)
+        if entry is None:
+            return None
+        age = self.clock() - (entry[0] - self.ttl)
+        return age if age < self.ttl else None
+
+    def __contains__(self, mensa: str) -> bool:
+        return self.get(mensa) is not None
+
+    def __shared(self) -> list[str]:
+        """
+        Returns the Mensa codes with a file in the state directory.
+
+        :return: List of Mensa codes.
+        """
+        if not self.state_dir:
+            return []
+        try:
+            names = os.listdir(self.state_dir)
+        except OSError:
+            return []
+        return [
+            name.removesuffix(".json") for name in names
+            if name.endswith(".json")
+        ]
+
+    def mensas(self) -> list[str]:
+        """
+        Returns the Mensa codes with a fresh cached menu.
+
+        :return: List of Mensa codes.
+        """
+        with self._lock:
+            codes = list(self._entries)
+        codes += [mensa for mensa in self.__shared() if mensa not in codes]
+        return [mensa for mensa in codes if mensa in self]
+
+    def clear(self) -> None:
+        """
+        Removes all cached menus, also from the state directory.
+
+        :return: None
+        """
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+        for mensa in self.__shared():
+            try:
+                os.remove(self.__path(mensa))
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,76 @@
+import logging
+from typing import Optional, Union
+
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+# Compact menu as returned by `parse_menu_html`: (category, dishes) pairs
+CompactMenu = tuple[tuple[str, tuple[str, ...]], ...]
+
+
+def parse_menu_html(
+        html: Union[bytes, str]
+) -> Optional[CompactMenu]:
+    """
+    Parses the complete menu from the HTML content of a Mensa page.
+
+    The function is defined at module level and returns only tuples of
+     strings, so it can run in a worker process: the raw page is sent to
+     the worker and the compact menu is the only thing sent back.
+
+    :param html: HTML content of the page, as raw bytes or text.
+    :return: Tuple of (category, dishes) pairs or None if the page has no
+     menu.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    menu_sections, category_names = _get_meal_categories(soup)
+    return _get_menu_by_category(menu_sections, category_names)
+
+
+def _get_meal_categories(
+        soup: BeautifulSoup
+) -> tuple[Optional[list[BeautifulSoup]], Optional[list[str]]]:
+    """
+    Extracts menu sections and corresponding category names.
+
+    :param soup: Parsed BeautifulSoup object of the Mensa page.
+    :return: Tuple of (sections, category names) or (None, None) on failure.
+    """
+    sections = soup.find_all(
+        'div', class_='container-fluid px-xl-0 splGroupWrapper'
+    )
+
+    category_names = [
+        (section.find('div', class_='pl-2').get_text(strip=True)
+         or "Unknown Category") for section in sections
+    ]
+
+    return (sections, category_names) if sections and category_names\
+        else (None, None)
+
+
+def _get_menu_by_category(
+        menu_sections: Optional[list[BeautifulSoup]],
+        menu_category_names: Optional[list[str]]
+) -> Optional[CompactMenu]:
+    """
+    Extracts dishes categorized by meal type.
+
+    :param menu_sections: List of meal sections from the website.
+    :param menu_category_names: List of category names.
+    :return: Tuple of (category, dishes) pairs or None if no data found.
+    """
+    if not menu_sections or not menu_category_names:
+        logger.error("No valid menu sections found.")
+        return None
+
+    dishes_by_category = {
+        category: tuple(
+            f"\u2022 {meal.get_text(strip=True)}"
+            for meal in section.find_all('div', class_='mealText')
+        )
+        for section, category in zip(menu_sections, menu_category_names)
+    }
+
+    return tuple(dishes_by_category.items()) or None
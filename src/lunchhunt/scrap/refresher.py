@@ -0,0 +1,290 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Union
+
+from lunchhunt.scrap.cache import MenuCache
+from lunchhunt.scrap.scraper import MensaScraper
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows; every process then refreshes on its own
+    fcntl = None
+
+
+class MenuRefresher:
+    """
+    Keeps a menu cache warm from a background thread.
+
+    Every `interval` seconds the menus of all wanted Mensas are scraped
+     concurrently and stored in the cache, so readers such as the web UI
+     never scrape inside a request. Mensas can also be requested on demand;
+     a request wakes the thread at once. Without a running thread, a
+     requested Mensa is loaded by a one-off background fetch instead.
+
+    Processes sharing a cache through its state directory, e.g. the workers
+     of the web UI, can share a lock file as well: only the process holding
+     it refreshes, and the others take over when it stops.
+    """
+
+    def __init__(
+            self,
+            cache: Optional[MenuCache] = None,
+            scraper: Optional[MensaScraper] = None,
+            mensen: Optional[Callable[[], dict[str, set[str]]]] = None,
+            interval: Union[int, float] = 300,
+            workers: int = 4,
+            lock_path: Optional[str] = None
+    ):
+        """
+        Initializes the refresher; call `start` to run it.
+
+        :param cache: Cache the menus are stored in (default: new cache
+         whose entries outlive two refresh intervals).
+        :param scraper: Scraper used for all fetches (default: new scraper).
+        :param mensen: Callable returning the wanted Mensas, mapped to the
+         categories needed, e.g. `SubscriptionIndex.subscriptions`
+         (default: requested Mensas only).
+        :param interval: Seconds between two refreshes (default: 300).
+        :param workers: Number of concurrent fetches (default: 4).
+        :param lock_path: Lock file electing the one refreshing process
+         among those sharing it (default: always refresh).
+        """
+        self.cache = cache or MenuCache(ttl=2 * interval)
+        self.scraper = scraper or MensaScraper(pool_size=max(1, workers))
+        self.mensen = mensen or dict
+        self.interval = interval
+        self.workers = max(1, workers)
+        self.lock_path = lock_path
+
+        self._requested: set[str] = set()
+        self._loading: set[str] = set()
+        self._leading = False
+        self._lock_file = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.logger = logging.getLogger(__name__)
+
+    def request(
+            self,
+            mensa: str
+    ) -> None:
+        """
+        Adds a Mensa to the refreshed ones and loads it soon if it is not
+         cached yet: by waking the thread, or by a one-off background fetch
+         if this process does not refresh.
+
+        :param mensa: Mensa code.
+        :return: None
+        """
+        if mensa not in self.scraper.mensa_dict:
+            return
+        with self._lock:
+            new = mensa not in self._requested
+            self._requested.add(mensa)
+        if mensa in self.cache:
+            return
+        if not self.refreshing:
+            self.__load(mensa)
+        elif new:
+            self._wake.set()
+
+    @property
+    def refreshing(self) -> bool:
+        """
+        Whether this process runs the refresh thread and, with a lock file,
+         holds it.
+
+        :return: True if requested Mensas are loaded by the thread.
+        """
+        return self._leading and self._thread is not None \
+            and self._thread.is_alive()
+
+    def __load(
+            self,
+            mensa: str
+    ) -> None:
+        """
+        Loads a Mensa in a one-off background thread, unless it is already
+         being loaded.
+
+        :param mensa: Mensa code.
+        :return: None
+        """
+        with self._lock:
+            if mensa in self._loading:
+                return
+            self._loading.add(mensa)
+
+        def load() -> None:
+            try:
+                self.__scrape(mensa, self.wanted().get(mensa, set()))
+            except Exception as e:
+                self.logger.error("Failed to load %s: %s", mensa, e)
+            finally:
+                with self._lock:
+                    self._loading.discard(mensa)
+
+        threading.Thread(
+            target=load, name=f"menu-load-{mensa}", daemon=True
+        ).start()
+
+    def __scrape(
+            self,
+            mensa: str,
+            categories: set[str]
+    ) -> bool:
+        """
+        Scrapes a Mensa with the scraper's and some further categories and
+         stores its menu.
+
+        :param mensa: Mensa code.
+        :param categories: Categories needed besides the scraper's.
+        :return: True if a menu was stored.
+        """
+        menu = self.scraper.scrape_menu(
+            mensa, sorted(set(self.scraper.menu_categories) | categories)
+        )
+        if menu:
+            self.cache.put(menu)
+        return menu is not None
+
+    def wanted(self) -> dict[str, set[str]]:
+        """
+        Returns the Mensas to refresh with the categories to scrape.
+
+        :return: Dictionary mapping Mensa codes to category sets.
+        """
+        wanted = {
+            mensa: set(categories)
+            for mensa, categories in self.mensen().items()
+        }
+        with self._lock:
+            for mensa in self._requested:
+                wanted.setdefault(mensa, set())
+        return wanted
+
+    def refresh(
+            self,
+            only_missing: bool = False
+    ) -> int:
+        """
+        Scrapes the wanted Mensas concurrently and stores their menus.
+
+        :param only_missing: Scrape only Mensas without a fresh cached menu
+         (default: False).
+        :return: Number of menus stored.
+        """
+        wanted = {
+            mensa: categories for mensa, categories in self.wanted().items()
+            if not (only_missing and mensa in self.cache)
+        }
+        if not wanted:
+            return 0
+
+        stored = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {
+                pool.submit(self.__scrape, mensa, categories): mensa
+                for mensa, categories in wanted.items()
+            }
+            for future, mensa in futures.items():
+                try:
+                    stored += future.result()
+                except Exception as e:
+                    self.logger.error("Failed to refresh %s: %s", mensa, e)
+        self.logger.info("Refreshed %d of %d menu(s).", stored, len(wanted))
+        return stored
+
+    def __lead(self) -> bool:
+        """
+        Takes the lock file, if there is one and no other process holds it.
+
+        :return: True if this process refreshes.
+        """
+        if self._leading:
+            return True
+        if self.lock_path and fcntl is not None:
+            file = open(self.lock_path, 'a')
+            try:
+                fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                file.close()
+                return False
+            self._lock_file = file
+            self.logger.info("Refreshing menus in process %d.", os.getpid())
+        self._leading = True
+        return True
+
+    def __resign(self) -> None:
+        """
+        Releases the lock file, so another process can take over.
+
+        :return: None
+        """
+        self._leading = False
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def __loop(self) -> None:
+        """
+        Refreshes all menus every interval and missing ones when woken. While
+         another process holds the lock file, it checks every interval
+         whether it can take over.
+
+        :return: None
+        """
+        next_full = 0.0
+        try:
+            while not self._stop.is_set():
+                self._wake.clear()
+                if not self.__lead():
+                    self._wake.wait(self.interval)
+                    continue
+                full = time.monotonic() >= next_full
+                if full:
+                    next_full = time.monotonic() + self.interval
+                try:
+                    self.refresh(only_missing=not full)
+                except Exception as e:
+                    self.logger.error("Menu refresh failed: %s", e)
+                self._wake.wait(max(0.0, next_full - time.monotonic()))
+        finally:
+            self.__resign()
+
+    def start(self) -> "MenuRefresher":
+        """
+        Starts the background thread, if it is not running yet.
+
+        :return: The refresher itself.
+        """
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self.__loop, name="menu-refresher", daemon=True
+                )
+                self._thread.start()
+        return self
+
+    def stop(
+            self,
+            timeout: Optional[Union[int, float]] = None
+    ) -> None:
+        """
+        Stops the background thread after its current refresh.
+
+        :param timeout: Maximum number of seconds to wait (default: no limit).
+        :return: None
+        """
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
@@ -0,0 +1,157 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Optional, Union
+
+
+def match_dishes(
+        keywords: Union[list[str], str],
+        dishes: Union[list[str], dict[str, list[str]]]
+) -> Optional[Union[list[str], dict[str, list[str]]]]:
+    """
+    Finds menu items that contain specified keywords.
+
+    :param keywords: Single keyword or list of keywords to search for.
+    :param dishes: List of dishes or dictionary of categories with
+     dish lists.
+    :return: List of matching dishes if input is a list, or dictionary
+     with matching dishes per category if input is a dict. Returns None
+     if no matches are found.
+    :raises TypeError: If dishes is neither a list nor a dict.
+    """
+    keywords = [keywords.lower()] if isinstance(keywords, str) else [
+        kw.lower() for kw in keywords
+    ]
+
+    if isinstance(dishes, list):
+        matches = [
+            dish for dish in dishes
+            if any(kw in dish.lower() for kw in keywords)
+        ]
+        return matches if matches else None
+
+    if isinstance(dishes, dict):
+        matched_dishes = {
+            category: [
+                dish for dish in dish_list
+                if any(kw in dish.lower() for kw in keywords)
+            ]
+            for category, dish_list in dishes.items()
+        }
+
+        return {
+            category: matches for category, matches in
+            matched_dishes.items() if matches
+        } or None
+
+    raise TypeError("Invalid data type for dishes. Expected list or dict.")
+
+
+@dataclass(frozen=True)
+class MenuResult:
+    """
+    Immutable result of scraping the menu of one Mensa.
+
+    Dishes are stored as nested tuples, so results can be shared between
+     threads and sent to worker processes without copying or locking.
+    """
+    mensa: str
+    mensa_name: str
+    location: str
+    url: str
+    dishes: tuple[tuple[str, tuple[str, ...]], ...] = ()
+
+    @classmethod
+    def from_dict(
+            cls,
+            mensa: str,
+            mensa_name: str,
+            location: str,
+            url: str,
+            dishes_by_category: Optional[dict[str, list[str]]]
+    ) -> "MenuResult":
+        """
+        Creates a result from a dictionary of categorized dishes.
+
+        :param mensa: Mensa code.
+        :param mensa_name: Formatted Mensa name.
+        :param location: Location name.
+        :param url: URL the menu was scraped from.
+        :param dishes_by_category: Dictionary of categorized dishes.
+        :return: MenuResult.
+        """
+        return cls(
+            mensa=mensa,
+            mensa_name=mensa_name,
+            location=location,
+            url=url,
+            dishes=tuple(
+                (category, tuple(dishes))
+                for category, dishes in (dishes_by_category or {}).items()
+            )
+        )
+
+    @property
+    def dishes_by_category(self) -> dict[str, list[str]]:
+        """
+        Returns a fresh dictionary of categorized dishes.
+
+        :return: Dictionary mapping categories to lists of dishes.
+        """
+        return {category: list(dishes) for category, dishes in self.dishes}
+
+    @property
+    def digest(self) -> str:
+        """
+        Returns a stable hash of the dishes, to detect menu changes across
+         scrapes and processes.
+
+        :return: Hex digest of the dishes.
+        """
+        return hashlib.sha256(
+            json.dumps(self.dishes, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+
+    @property
+    def categories(self) -> list[str]:
+        """
+        Returns the categories present in the menu.
+
+        :return: List of category names.
+        """
+        return [category for category, _ in self.dishes]
+
+    def filter(
+            self,
+            categories: Union[list[str], str]
+    ) -> "MenuResult":
+        """
+        Returns a result restricted to the given categories.
+
+        :param categories: Category or categories to keep.
+        :return: New MenuResult.
+        """
+        categories = [categories] if isinstance(categories, str) \
+            else categories
+        return MenuResult(
+            mensa=self.mensa,
+            mensa_name=self.mensa_name,
+            location=self.location,
+            url=self.url,
+            dishes=tuple(
+                entry for entry in self.dishes if entry[0] in categories
+            )
+        )
+
+    def find_matches(
+            self,
+            keywords: Union[list[str], str]
+    ) -> Optional[dict[str, list[str]]]:
+        """
+        Finds dishes of this menu that contain specified keywords.
+
+        :param keywords: Single keyword or list of keywords to search for.
+        :return: Dictionary with matching dishes per category or None if
+         no matches are found.
+        """
+        return match_dishes(keywords, self.dishes_by_category)
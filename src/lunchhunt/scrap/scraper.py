@@ -1,9 +1,15 @@
 import logging
+import threading
+from concurrent.futures import Executor, Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from typing import Optional, Union
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 
+from lunchhunt.scrap.cache import NegativeCache
+from lunchhunt.scrap.parser import parse_menu_html
+from lunchhunt.scrap.result import MenuResult, match_dishes
 from lunchhunt.utils import default_mensa_dict
 
 # Configure logging
@@ -16,13 +22,27 @@ logging.basicConfig(
 class MensaScraper:
     """
     A web scraper for extracting the daily menu from university canteens.
+
+    The scraper keeps no per-scrape state: every scrape returns its own
+     immutable MenuResult, so one instance and its connection pool can be
+     shared by concurrent threads. Concurrent scrapes of the same page are
+     coalesced into a single fetch-and-parse.
     """
 
+    # Seconds coalesced scrapes wait beyond `timeout`, for parsing and for
+    # fetches whose phases each stay within the timeout
+    FOLLOWER_MARGIN = 5
+
     def __init__(
         self,
         menu_categories: Optional[Union[list[str], str]] = None,
         base_url: Optional[str] = None,
-        mensa_dict: Optional[dict[str, tuple[str, str]]] = None
+        mensa_dict: Optional[dict[str, tuple[str, str]]] = None,
+        pool_size: int = 10,
+        error_ttl: Union[int, float] = 60,
+        empty_ttl: Union[int, float] = 300,
+        parse_executor: Optional[Executor] = None,
+        timeout: Union[int, float] = 10
     ):
         """
         Initializes the MensaScraper with a base URL and Mensa mappings.
@@ -30,6 +50,19 @@ class MensaScraper:
         :param menu_categories: Categories to filter meals by (default: all).
         :param base_url: Base URL for the Mensa website.
         :param mensa_dict: Custom mapping of Mensa codes to locations and URLs.
+        :param pool_size: Number of pooled connections kept to the Mensa
+         website (default: 10).
+        :param error_ttl: Seconds during which a failed request is not
+         repeated (default: 60, 0 disables).
+        :param empty_ttl: Seconds during which a page without menu sections,
+         e.g. of a closed Mensa, is not fetched again (default: 300,
+         0 disables).
+        :param parse_executor: Executor pages are parsed in, e.g. a
+         ProcessPoolExecutor to parse on all cores (default: parse in the
+         calling thread).
+        :param timeout: Seconds to wait for the Mensa website to connect and
+         to send data (default: 10). Scrapes coalesced into a running fetch
+         wait for it at most `FOLLOWER_MARGIN` seconds longer.
         """
         self.menu_categories = (
             [menu_categories] if isinstance(menu_categories, str)
@@ -39,10 +72,22 @@ class MensaScraper:
         self.base_url = base_url or "https://www.stw-thueringen.de/mensen"
         self.mensa_dict = mensa_dict or default_mensa_dict()
 
-        self.dishes_by_category: Optional[dict[str, list[str]]] = None
-        self.mensa_name: Optional[str] = None
-        self.location: Optional[str] = None
-        self.full_url: Optional[str] = None
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # Single-flight bookkeeping: one pending fetch per URL
+        self._inflight: dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._fetch_stats = {"fetches": 0, "coalesced": 0, "negative_hits": 0}
+
+        self.parse_executor = parse_executor
+        self.timeout = timeout
+
+        self.negative_cache = NegativeCache(
+            error_ttl=error_ttl, empty_ttl=empty_ttl
+        )
 
         self.logger = logging.getLogger(__name__)
 
@@ -65,101 +110,207 @@ class MensaScraper:
         _, mensa_name = self.mensa_dict[mensa]
         return f"{self.base_url}/{location}/{mensa_name}.html"
 
-    def __get_soup(
+    def fetch_page(
             self,
             url: str
-    ) -> Optional[BeautifulSoup]:
+    ) -> Optional[bytes]:
         """
-        Fetches and parses the HTML content of a given URL.
+        Fetches the raw HTML content of a given URL.
 
         :param url: Target URL.
-        :return: BeautifulSoup object or None if request fails.
+        :return: HTML bytes or None if the request fails.
         """
         try:
-            response = requests.get(url)
+            response = self.session.get(url, timeout=self.timeout)
             response.raise_for_status()
-            return BeautifulSoup(response.text, 'html.parser')
+            return response.content
         except requests.RequestException as e:
             self.logger.error(f"Failed to fetch URL {url}: {e}")
             return None
 
-    @staticmethod
-    def __get_meal_categories(
-            soup: BeautifulSoup
-    ) -> tuple[Optional[list[BeautifulSoup]], Optional[list[str]]]:
+    def parse_page(
+            self,
+            html: Union[bytes, str]
+    ) -> Optional[dict[str, list[str]]]:
         """
-        Extracts menu sections and corresponding category names.
+        Parses the complete menu from the HTML content of a Mensa page. With
+         a parse executor, parsing runs in one of its workers.
 
-        :param soup: Parsed BeautifulSoup object of the Mensa page.
-        :return: Tuple of (sections, category names) or (None, None) on failure.
+        :param html: HTML content of the page, as raw bytes or text.
+        :return: Dictionary of all categorized dishes or None if the page
+         has no menu.
         """
-        sections = soup.find_all(
-            'div', class_='container-fluid px-xl-0 splGroupWrapper'
-        )
+        if self.parse_executor:
+            menu = self.parse_executor.submit(parse_menu_html, html).result()
+        else:
+            menu = parse_menu_html(html)
+        return {category: list(dishes) for category, dishes in menu} \
+            if menu else None
+
+    def __load_menu(
+            self,
+            url: str
+    ) -> Optional[dict[str, list[str]]]:
+        """
+        Fetches and parses the complete menu of a page. Callers that request
+         a URL while a fetch of it is in flight wait for and share that
+         fetch's result instead of starting their own.
 
-        category_names = [
-            (section.find('div', class_='pl-2').get_text(strip=True)
-             or "Unknown Category") for section in sections
-        ]
+        :param url: Target URL.
+        :return: Dictionary of all categorized dishes or None on failure.
+         The dictionary is shared between callers and must not be modified.
+        """
+        if self.negative_cache.get(url):
+            with self._inflight_lock:
+                self._fetch_stats["negative_hits"] += 1
+            return None
 
-        return (sections, category_names) if sections and category_names\
-            else (None, None)
+        with self._inflight_lock:
+            future = self._inflight.get(url)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[url] = future
+                self._fetch_stats["fetches"] += 1
+            else:
+                self._fetch_stats["coalesced"] += 1
+
+        if not leader:
+            try:
+                return future.result(
+                    timeout=self.timeout + self.FOLLOWER_MARGIN
+                )
+            except FutureTimeoutError:
+                # The fetch keeps running for its leader; this caller misses
+                self.logger.warning("Timed out waiting for fetch of %s.", url)
+                return None
 
-    def __get_menu_by_category(
-        self,
-        menu_sections: Optional[list[BeautifulSoup]],
-        menu_category_names: Optional[list[str]]
-    ) -> Optional[dict[str, list[str]]]:
+        try:
+            html = self.fetch_page(url)
+            menu = None
+            if html is None:
+                self.negative_cache.add(url, NegativeCache.ERROR)
+            else:
+                menu = self.parse_page(html)
+                if not menu:
+                    self.negative_cache.add(url, NegativeCache.EMPTY)
+            future.set_result(menu)
+            return menu
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[url]
+
+    def fetch_stats(self) -> dict[str, int]:
         """
-        Extracts dishes categorized by meal type.
+        Returns how many page fetches were started, how many scrapes were
+         coalesced into an already running fetch, and how many were answered
+         by the negative cache.
 
-        :param menu_sections: List of meal sections from the website.
-        :param menu_category_names: List of category names.
-        :return: Dictionary of categorized dishes or None if no data found.
+        :return: Dictionary with 'fetches', 'coalesced' and 'negative_hits'
+         counters.
         """
-        if not menu_sections or not menu_category_names:
-            self.logger.error("No valid menu sections found.")
-            return None
+        with self._inflight_lock:
+            return dict(self._fetch_stats)
 
-        dishes_by_category = {
-            category: [
-                f"\u2022 {meal.get_text(strip=True)}"
-                for meal in section.find_all('div', class_='mealText')
-            ]
-            for section, category in zip(menu_sections, menu_category_names)
-            if category in self.menu_categories
-        }
+    def mensa_url(
+            self,
+            mensa: str
+    ) -> str:
+        """
+        Returns the menu page URL of a Mensa.
 
-        return dishes_by_category or None
+        :param mensa: Mensa code.
+        :return: Constructed URL or empty string if invalid.
+        """
+        location, _ = self.mensa_dict.get(mensa, (None, None))
+        return self.__build_mensa_url(mensa, location)
 
-    def scrape_menu_by_category(
+    def miss_reason(
             self,
             mensa: str
-    ) -> Optional[dict[str, list[str]]]:
+    ) -> Optional[str]:
+        """
+        Returns why the last scrape of a Mensa failed, while the miss is
+         held by the negative cache.
+
+        :param mensa: Mensa code.
+        :return: NegativeCache.ERROR, NegativeCache.EMPTY or None.
+        """
+        return self.negative_cache.get(self.mensa_url(mensa))
+
+    def scrape_menu(
+            self,
+            mensa: str,
+            menu_categories: Optional[Union[list[str], str]] = None
+    ) -> Optional[MenuResult]:
         """
         Scrapes the categorized menu for a given Mensa.
 
         :param mensa: Mensa code.
-        :return: Dictionary of categorized dishes or None on failure.
+        :param menu_categories: Categories to filter meals by
+         (default: categories of the scraper).
+        :return: MenuResult or None on failure or if no dishes were found.
         """
         if mensa not in self.mensa_dict:
             raise ValueError(f"Unknown Mensa code: {mensa}")
 
-        location, _ = self.mensa_dict[mensa]
-        self.full_url = self.__build_mensa_url(mensa, location)
-        self.mensa_name = self.__modify_mensa_name(mensa)
-        self.location = location
+        if isinstance(menu_categories, str):
+            menu_categories = [menu_categories]
 
-        soup = self.__get_soup(self.full_url)
-        if not soup:
+        menu = self.__load_menu(self.mensa_url(mensa))
+        return self.menu_result(mensa, menu, menu_categories)
+
+    def menu_result(
+            self,
+            mensa: str,
+            menu: Optional[dict[str, list[str]]],
+            menu_categories: Optional[list[str]] = None
+    ) -> Optional[MenuResult]:
+        """
+        Builds the result of a Mensa from its parsed menu.
+
+        :param mensa: Mensa code.
+        :param menu: Dictionary of all categorized dishes, as returned by
+         `parse_page`.
+        :param menu_categories: Categories to keep
+         (default: categories of the scraper).
+        :return: MenuResult or None if no dishes of the categories were found.
+        """
+        if not menu:
+            return None
+
+        menu_categories = menu_categories or self.menu_categories
+        dishes_by_category = {
+            category: list(dishes) for category, dishes in menu.items()
+            if category in menu_categories
+        }
+        if not dishes_by_category:
             return None
 
-        menu_sections, category_names = self.__get_meal_categories(soup)
-        self.dishes_by_category = self.__get_menu_by_category(
-            menu_sections, category_names
+        location, _ = self.mensa_dict[mensa]
+        return MenuResult.from_dict(
+            mensa=mensa,
+            mensa_name=self.__modify_mensa_name(mensa),
+            location=location,
+            url=self.mensa_url(mensa),
+            dishes_by_category=dishes_by_category
         )
 
-        return self.dishes_by_category
+    def scrape_menu_by_category(
+            self,
+            mensa: str
+    ) -> Optional[dict[str, list[str]]]:
+        """
+        Scrapes the categorized menu for a given Mensa.
+
+        :param mensa: Mensa code.
+        :return: Dictionary of categorized dishes or None on failure.
+        """
+        result = self.scrape_menu(mensa)
+        return result.dishes_by_category if result else None
 
     def __modify_mensa_name(
             self,
@@ -177,49 +328,29 @@ class MensaScraper:
     def find_matches(
             self,
             keywords: Union[list[str], str],
-            dishes: Optional[Union[list[str], dict[str, list[str]]]] = None
+            dishes: Optional[
+                Union[list[str], dict[str, list[str]], MenuResult]
+            ] = None
     ) -> Optional[Union[list[str], dict[str, list[str]]]]:
         """
         Finds menu items that contain specified keywords.
 
         :param keywords: Single keyword or list of keywords to search for.
-        :param dishes: List of dishes or dictionary of categories with
-         dish lists. Defaults to last scraped menu.
+        :param dishes: List of dishes, dictionary of categories with
+         dish lists, or a MenuResult.
         :return: List of matching dishes if input is a list, or dictionary
-         with matching dishes per category if input is a dict. Returns None
-         if no matches are found.
+         with matching dishes per category if input is a dict or MenuResult.
+         Returns None if no matches are found.
         """
+        if isinstance(dishes, MenuResult):
+            return dishes.find_matches(keywords)
+
         if not dishes:
-            dishes = self.dishes_by_category
-            if not dishes:
-                self.logger.error("No dishes available for searching.")
-                return None
+            self.logger.error("No dishes available for searching.")
+            return None
 
-        keywords = [keywords.lower()] if isinstance(keywords, str) else [
-            kw.lower() for kw in keywords
-        ]
-
-        if isinstance(dishes, list):
-            matches = [
-                dish for dish in dishes
-                if any(kw in dish.lower() for kw in keywords)
-            ]
-            return matches if matches else None
-
-        if isinstance(dishes, dict):
-            matched_dishes = {
-                category: [
-                    dish for dish in dish_list
-                    if any(kw in dish.lower() for kw in keywords)
-                ]
-                for category, dish_list in dishes.items()
-            }
-
-            return {
-                category: matches for category, matches in
-                matched_dishes.items() if matches
-            } or None
-
-        self.logger.error(
-            "Invalid data type for dishes. Expected list or dict.")
-        return None
+        try:
+            return match_dishes(keywords, dishes)
+        except TypeError as e:
+            self.logger.error(e)
+            return None
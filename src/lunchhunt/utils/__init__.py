@@ -1,15 +1,45 @@
 from .util_functions import (
+    CRON_BLOCK_BEGIN,
+    CRON_BLOCK_END,
+    apply_cron_block,
     create_cronjob,
+    cron_entry,
+    default_meal_timetable,
+    default_mensa_calendar,
     default_mensa_dict,
     delete_cron_job,
+    has_notification_sink,
+    load_profiles,
     load_settings,
+    load_sink_settings,
+    managed_cron_block,
+    profile_jitter,
+    read_crontab,
+    replace_cron_block,
+    sync_crontab,
     update_menu_categories,
+    write_crontab,
 )
 
 __all__ = [
+    "CRON_BLOCK_BEGIN",
+    "CRON_BLOCK_END",
+    "apply_cron_block",
     "create_cronjob",
+    "cron_entry",
+    "default_meal_timetable",
+    "default_mensa_calendar",
     "default_mensa_dict",
     "delete_cron_job",
+    "has_notification_sink",
+    "load_profiles",
     "load_settings",
-    "update_menu_categories"
+    "load_sink_settings",
+    "managed_cron_block",
+    "profile_jitter",
+    "read_crontab",
+    "replace_cron_block",
+    "sync_crontab",
+    "update_menu_categories",
+    "write_crontab"
 ]
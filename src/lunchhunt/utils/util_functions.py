@@ -1,5 +1,8 @@
+import hashlib
 import json
 import logging
+import os
+import shlex
 import subprocess
 import sys
 from datetime import datetime, time, timedelta
@@ -53,6 +56,41 @@ def default_mensa_dict() -> dict[str, tuple[str, str]]:
     }
 
 
+def default_mensa_calendar(
+        mensa_dict: Optional[dict[str, tuple[str, str]]] = None
+) -> dict[str, dict]:
+    """
+    Provides a default opening calendar for every Mensa: open every day
+     with the standard meal windows and no exception dates. Closed weekdays
+     are learned from empty menu pages by `MensaCalendar`.
+
+    :param mensa_dict: Mapping of Mensa codes as returned by
+     `default_mensa_dict` (default: `default_mensa_dict()`).
+    :return: Dictionary mapping Mensa codes to a dictionary with
+     'opening_days' (weekday names), 'meal_windows' (category to (start, end)
+     times) and 'closed_dates' (ISO dates).
+    """
+    meal_windows = {
+        'Frühstück': (time(8, 0), time(10, 0)),
+        'Mittagessen': (time(11, 0), time(14, 0)),
+        'Zwischenversorgung': (time(15, 0), time(16, 30)),
+        'Abendessen': (time(17, 30), time(19, 30)),
+    }
+    opening_days = [
+        "monday", "tuesday", "wednesday", "thursday", "friday", "saturday",
+        "sunday"
+    ]
+
+    return {
+        mensa: {
+            "opening_days": list(opening_days),
+            "meal_windows": dict(meal_windows),
+            "closed_dates": [],
+        }
+        for mensa in mensa_dict or default_mensa_dict()
+    }
+
+
 def load_settings(
         path: str
 ) -> Optional[tuple[dict, dict, dict]]:
@@ -83,6 +121,100 @@ def load_settings(
         sys.exit(1)
 
 
+def load_profiles(
+        settings_dir: str,
+        file_type: str = ".json",
+        names: Optional[list[str]] = None
+) -> dict[str, dict]:
+    """
+    Loads all profiles from a settings directory. Files that cannot be read
+     or parsed are skipped.
+
+    param: settings_dir: Directory containing the JSON settings files.
+    param: file_type: File extension of settings files (default: '.json').
+    param: names: Settings file names to load instead of scanning the whole
+     directory (optional); files that do not exist are skipped.
+
+    :return: A dictionary mapping profile names (settings file names) to the
+     loaded settings. Returns an empty dictionary if the directory is missing.
+    """
+    if not os.path.isdir(settings_dir):
+        return {}
+
+    if names is None:
+        names = [
+            name for name in sorted(os.listdir(settings_dir))
+            if name.endswith(file_type)
+        ]
+
+    profiles = {}
+    for name in names:
+        try:
+            with open(os.path.join(settings_dir, name),
+                      encoding='utf-8') as file:
+                profiles[name] = json.load(file)
+        except FileNotFoundError:
+            continue
+        except (OSError, json.JSONDecodeError) as e:
+            logging.error("Failed to load profile %s: %s", name, e)
+    return profiles
+
+
+def load_sink_settings(
+        path: str
+) -> list[dict]:
+    """
+    Loads the optional notification sink configurations from a JSON settings
+     file. Profiles without a 'sink_settings' key only notify via Gotify.
+
+    param: path: The file path to the JSON settings file to be loaded.
+
+    :return: A list of sink configurations, each with a 'type' key. Returns
+     an empty list if the file or the key is missing or the JSON is invalid.
+    """
+    try:
+        with open(path, encoding='utf-8') as file:
+            settings = json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        logging.error("Failed to load sink settings: %s", e)
+        return []
+
+    return settings.get('sink_settings', [])
+
+
+def has_notification_sink(
+        settings: dict
+) -> bool:
+    """
+    Checks whether a profile can notify anyone: it needs a Gotify server
+     with a token or at least one entry in 'sink_settings'. Profiles without
+     one, such as the sample settings file, are not scheduled.
+
+    param: settings: Loaded settings of a profile.
+
+    :return: True if the profile has a usable notification sink.
+    """
+    gotify_settings = settings.get('gotify_settings') or {}
+    if gotify_settings.get('server_url') and gotify_settings.get('token'):
+        return True
+    return bool(settings.get('sink_settings'))
+
+
+def default_meal_timetable() -> dict[str, time]:
+    """
+    Provides the default closing time of each menu category.
+
+    :return: Dictionary mapping category names to the time the meal
+     service ends.
+    """
+    return {
+        'Frühstück': time(10, 0),
+        'Mittagessen': time(14, 0),
+        'Zwischenversorgung': time(16, 30),
+        'Abendmensa': time(19, 30),
+    }
+
+
 def update_menu_categories(
         categories: list,
         timetable: dict[str, time] | None = None,
@@ -106,13 +238,7 @@ def update_menu_categories(
     now = datetime.now()
     offset = timedelta(minutes=offset)
 
-    # Default timetable
-    timetable = timetable or {
-        'Frühstück': time(10, 0),
-        'Mittagessen': time(14, 0),
-        'Zwischenversorgung': time(16, 30),
-        'Abendmensa': time(19, 30),
-    }
+    timetable = timetable or default_meal_timetable()
 
     updated = []
     for category in categories:
@@ -130,19 +256,45 @@ def update_menu_categories(
     return updated if updated else None
 
 
-def create_cronjob(
+def profile_jitter(
+        name: str,
+        window: Union[int, float]
+) -> float:
+    """
+    Derives a deterministic delay for a profile, so that profiles scheduled
+     at the same time are spread across a window instead of firing at once.
+     The same name always gets the same delay.
+
+    param: name: Profile name (settings file name).
+    param: window: Length of the window in seconds.
+
+    :return: Delay in seconds within [0, window).
+    """
+    if window <= 0:
+        return 0.0
+    digest = hashlib.sha256(name.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") / 2 ** 64 * window
+
+
+# Marker lines around the crontab entries written by `sync_crontab`
+CRON_BLOCK_BEGIN = "# BEGIN LunchHunt managed block"
+CRON_BLOCK_END = "# END LunchHunt managed block"
+
+
+def cron_entry(
         schedule_settings: dict,
         settings_name: Optional[str] = None,
         env_path: Optional[str] = None,
         log_path: Optional[str] = None,
         script_path: Optional[str] = None,
-        cron_command: Optional[str] = None,
-        user: Optional[str] = None
-) -> None:
+        user: Optional[str] = None,
+        jitter: int = 0,
+        latest: Optional[time] = None,
+        profile_db: Optional[str] = None,
+        categories: Optional[list[str]] = None
+) -> str:
     """
-    Adds a cron job to the specified user's crontab based on the provided
-     schedule settings. The job runs a Python script at specified times and
-     days, optionally within a environment.
+    Builds the crontab line of a profile from its schedule settings.
 
     param: schedule_settings (dict): Dictionary with 'hour', 'minute', and
      'alarm_days' keys to configure schedule.
@@ -152,11 +304,21 @@ def create_cronjob(
     param: log_path (str | None): Optional path for logging stdout and stderr.
     param: script_path (str | None): Optional path to the Python script
      to execute.
-    param: cron_command (str | None): Optional full cron command string to
-     override automatic construction.
-    param: user (str | None): Optional system username whose crontab will be
-     modified. Defaults to current user.
-    :return: None. Modifies the crontab for the specified user.
+    param: user (str | None): Optional system username whose home directory
+     the job runs in.
+    param: jitter (int): Window in minutes across which the job is delayed by
+     `profile_jitter` of the settings name (default: 0, no delay).
+    param: latest (time | None): Optional time the delayed job must not fire
+     after (default: one minute before the earliest cutoff of `categories`
+     still ahead, i.e. the meal's end in `default_meal_timetable` minus the
+     profile's 'offset').
+    param: profile_db (str | None): Optional SQLite profile database the
+     script reads the profile from instead of the 'settings' directory.
+    param: categories (list[str] | None): Optional menu categories of the
+     profile, bounding the jitter when `latest` is not given.
+    :return: The crontab line.
+    :raises ValueError: If the time is missing, no day is enabled or a day
+     is unknown.
     """
     hour = schedule_settings.get("hour")
     minute = schedule_settings.get("minute")
@@ -171,9 +333,34 @@ def create_cronjob(
         "monday": "1", "tuesday": "2", "wednesday": "3",
         "thursday": "4", "friday": "5", "saturday": "6", "sunday": "7"
     }
+    unknown = set(alarm_days) - DAY_TO_CRON.keys()
+    if unknown:
+        raise ValueError(f"Unknown alarm days: {', '.join(sorted(unknown))}.")
     days_of_week = [
         DAY_TO_CRON[day] for day, enabled in alarm_days.items() if enabled
     ]
+
+    if jitter and settings_name:
+        fire_at = int(hour) * 60 + int(minute)
+        # Never move the job past the deadline or into the next day
+        last = latest.hour * 60 + latest.minute if latest else 23 * 60 + 59
+        if latest is None and categories:
+            timetable = default_meal_timetable()
+            offset = int(schedule_settings.get("offset", 30))
+            cutoffs = [
+                end.hour * 60 + end.minute - offset for end in (
+                    timetable.get(category, time.max)
+                    for category in categories
+                )
+            ]
+            ahead = [cutoff for cutoff in cutoffs if cutoff > fire_at]
+            if ahead:
+                # Like the scheduler's JITTER_MARGIN
+                last = min(ahead) - 1
+        delay = int(profile_jitter(settings_name, jitter * 60) // 60)
+        fire_at = max(fire_at, min(fire_at + delay, last))
+        hour, minute = divmod(fire_at, 60)
+
     cron_time = f"{minute} {hour} * * {','.join(days_of_week)}"
 
     script_path = script_path or "run.py"
@@ -181,28 +368,243 @@ def create_cronjob(
     log_path = log_path or "lunchhunt.log"
     user = user or "lunchhunt"
 
-    cron_command = cron_command or (f"{cron_time}"
-                                    f" cd /home/{user}/app && {env_path}"
-                                    f" {script_path} {settings_name or ''}"
-                                    f" >> {log_path} 2>&1")
+    database = f" --profile-db {shlex.quote(profile_db)}" if profile_db else ""
+
+    return (f"{cron_time}"
+            f" cd /home/{user}/app && {env_path}"
+            f" {script_path} {settings_name or ''}{database}"
+            f" >> {log_path} 2>&1")
+
+
+def read_crontab(
+        user: str = "lunchhunt"
+) -> str:
+    """
+    Reads the crontab of a user.
+
+    param: user: System username (default: 'lunchhunt').
+
+    :return: The crontab contents, or an empty string if the user has none.
+    """
+    result = subprocess.run(
+        ["crontab", "-l", "-u", user],
+        capture_output=True, text=True
+    )
+    return result.stdout if result.returncode == 0 else ""
+
+
+def write_crontab(
+        content: str,
+        user: str = "lunchhunt"
+) -> None:
+    """
+    Replaces the crontab of a user.
+
+    param: content: The new crontab contents.
+    param: user: System username (default: 'lunchhunt').
+
+    :return: None
+    :raises subprocess.CalledProcessError: If crontab rejects the contents.
+    """
+    subprocess.run(
+        ["crontab", "-u", user, "-"],
+        input=content, text=True, check=True
+    )
+
+
+def managed_cron_block(
+        profiles: dict[str, dict],
+        **entry_kwargs
+) -> list[str]:
+    """
+    Builds the crontab lines of all profiles in one pass. Profiles without a
+     valid schedule or without a notification sink are skipped.
+
+    param: profiles: Dictionary mapping settings file names to loaded
+     settings, as returned by `load_profiles`.
+    param: entry_kwargs: Further arguments of `cron_entry`, e.g. `env_path`
+     or `jitter`; each profile's menu categories bound its jitter.
+
+    :return: Sorted list of crontab lines.
+    """
+    lines = set()
+    for name, settings in profiles.items():
+        if not has_notification_sink(settings):
+            logging.info("Not scheduling %s: no notification sink.", name)
+            continue
+        try:
+            lines.add(cron_entry(
+                settings.get('schedule_settings', {}),
+                settings_name=name,
+                categories=settings.get(
+                    'scraper_settings', {}).get('menu_categories'),
+                **entry_kwargs
+            ))
+        except (ValueError, TypeError, AttributeError) as e:
+            logging.info("Not scheduling %s: %s", name, e)
+    return sorted(lines)
+
+
+def replace_cron_block(
+        crontab: str,
+        lines: list[str],
+        profile_names: Optional[list[str]] = None,
+        script_path: Optional[str] = None
+) -> str:
+    """
+    Replaces the managed block of a crontab. Entries outside the block that
+     duplicate a managed line or run a managed profile, e.g. ones appended
+     by `create_cronjob`, are removed as well.
+
+    param: crontab: Current crontab contents.
+    param: lines: Lines of the new managed block.
+    param: profile_names: Settings file names of the managed profiles.
+    param: script_path: Script the managed profiles run with (default: run.py).
+
+    :return: The new crontab contents.
+    """
+    script_path = script_path or "run.py"
+    legacy = [f" {script_path} {name} " for name in profile_names or []]
+    managed = set(lines)
+
+    kept = []
+    in_block = False
+    for line in crontab.splitlines():
+        stripped = line.strip()
+        if stripped == CRON_BLOCK_BEGIN:
+            in_block = True
+        elif stripped == CRON_BLOCK_END:
+            in_block = False
+        elif not in_block and stripped not in managed \
+                and not any(marker in line for marker in legacy):
+            kept.append(line)
+
+    while kept and not kept[-1].strip():
+        kept.pop()
+    if lines:
+        kept += [CRON_BLOCK_BEGIN, *lines, CRON_BLOCK_END]
+    return "\n".join(kept) + "\n" if kept else ""
+
+
+def sync_crontab(
+        profiles: dict[str, dict],
+        user: Optional[str] = None,
+        retired: Optional[list[str]] = None,
+        **entry_kwargs
+) -> bool:
+    """
+    Synchronizes the crontab with the complete set of profiles. The managed
+     block is rebuilt from all profiles, compared with the current crontab,
+     and written only if it changed. Running it repeatedly is safe.
+
+    param: profiles: Dictionary mapping settings file names to loaded
+     settings, as returned by `load_profiles`.
+    param: user: System username whose crontab is synchronized
+     (default: 'lunchhunt').
+    param: retired: Settings file names of deleted profiles whose entries
+     outside the managed block are removed as well (optional).
+    param: entry_kwargs: Further arguments of `cron_entry`, e.g. `env_path`
+     or `jitter`; each profile's menu categories bound its jitter.
+
+    :return: True if the crontab was written, False if it was up to date.
+    """
+    return apply_cron_block(
+        managed_cron_block(profiles, user=user, **entry_kwargs),
+        profile_names=[*profiles, *(retired or [])],
+        user=user,
+        script_path=entry_kwargs.get("script_path")
+    )
+
+
+def apply_cron_block(
+        lines: list[str],
+        profile_names: Optional[list[str]] = None,
+        user: Optional[str] = None,
+        script_path: Optional[str] = None
+) -> bool:
+    """
+    Writes a managed block into a user's crontab, unless the crontab already
+     contains exactly that block.
+
+    param: lines: Lines of the managed block.
+    param: profile_names: Settings file names whose entries outside the
+     block are removed (optional).
+    param: user: System username (default: 'lunchhunt').
+    param: script_path: Script the profiles run with (default: run.py).
+
+    :return: True if the crontab was written, False if it was up to date.
+    """
+    user = user or "lunchhunt"
+    current = read_crontab(user)
+    updated = replace_cron_block(current, lines, profile_names, script_path)
+    if updated == current:
+        logging.info("Crontab is up to date.")
+        return False
+
+    write_crontab(updated, user)
+    logging.info("Crontab synchronized with %d job(s).", len(lines))
+    return True
+
+
+def create_cronjob(
+        schedule_settings: dict,
+        settings_name: Optional[str] = None,
+        env_path: Optional[str] = None,
+        log_path: Optional[str] = None,
+        script_path: Optional[str] = None,
+        cron_command: Optional[str] = None,
+        user: Optional[str] = None,
+        jitter: int = 0,
+        latest: Optional[time] = None,
+        profile_db: Optional[str] = None
+) -> None:
+    """
+    Adds a cron job to the specified user's crontab based on the provided
+     schedule settings. The job runs a Python script at specified times and
+     days, optionally within a environment. A job that already exists is not
+     added again; use `sync_crontab` to manage the jobs of all profiles.
+
+    param: schedule_settings (dict): Dictionary with 'hour', 'minute', and
+     'alarm_days' keys to configure schedule.
+    param: settings_name (str | None): Optional setting name passed to the
+     script as an argument.
+    param: env_path (str | None): Optional path to the Python interpreter to use.
+    param: log_path (str | None): Optional path for logging stdout and stderr.
+    param: script_path (str | None): Optional path to the Python script
+     to execute.
+    param: cron_command (str | None): Optional full cron command string to
+     override automatic construction.
+    param: user (str | None): Optional system username whose crontab will be
+     modified. Defaults to current user.
+    param: jitter (int): Window in minutes across which the job is delayed by
+     `profile_jitter` of the settings name (default: 0, no delay).
+    param: latest (time | None): Optional time the delayed job must not fire
+     after, e.g. the profile's meal deadline.
+    param: profile_db (str | None): Optional SQLite profile database the
+     script reads the profile from instead of the 'settings' directory.
+    :return: None. Modifies the crontab for the specified user.
+    """
+    user = user or "lunchhunt"
+    cron_command = cron_command or cron_entry(
+        schedule_settings,
+        settings_name=settings_name,
+        env_path=env_path,
+        log_path=log_path,
+        script_path=script_path,
+        user=user,
+        jitter=jitter,
+        latest=latest,
+        profile_db=profile_db
+    )
 
     try:
-        result = subprocess.run(
-            ["crontab", "-l", "-u", user],
-            capture_output=True, text=True
-        )
-        existing_crontab = result.stdout if result.returncode == 0 else ""
-        """
-        if cron_command in existing_crontab:
+        existing_crontab = read_crontab(user)
+        if cron_command in existing_crontab.splitlines():
             logging.info("Cron job already exists.")
             return
-        """
 
         new_crontab = existing_crontab.strip() + "\n" + cron_command + "\n"
-        subprocess.run(
-            ["crontab", "-u", user, "-"],
-            input=new_crontab, text=True, check=True
-        )
+        write_crontab(new_crontab, user)
         logging.info("Cron job added successfully.")
     except subprocess.CalledProcessError as e:
         logging.error(f"Failed to update crontab: {e}")
@@ -218,11 +620,7 @@ def delete_cron_job(
      job strings to be deleted (list[str])
     :return: None.
     """
-    result = subprocess.run(
-        ["crontab", "-l", "-u", "lunchhunt"],
-        capture_output=True, text=True
-    )
-    existing_crontab = result.stdout if result.returncode == 0 else ""
+    existing_crontab = read_crontab()
 
     # Filter out the jobs based on the full cron job string
     new_lines = [
@@ -231,7 +629,5 @@ def delete_cron_job(
     ]
 
     new_crontab = "\n".join(new_lines) + "\n"
-    subprocess.run(
-        ["crontab", "-u", "lunchhunt", "-"],
-        input=new_crontab, text=True, check=True
-    )
+    if new_crontab.strip() != existing_crontab.strip():
+        write_crontab(new_crontab)
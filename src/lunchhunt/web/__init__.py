@@ -1,5 +1,14 @@
-from .webUI import LunchHuntApp
+from .api import MenuApi, ResponseCache
+from .layout import StaticLayoutDash
+from .tasks import Task, TaskQueue
+from .webUI import LunchHuntApp, create_app
 
 __all__ = [
-    "LunchHuntApp"
+    "LunchHuntApp",
+    "MenuApi",
+    "ResponseCache",
+    "StaticLayoutDash",
+    "Task",
+    "TaskQueue",
+    "create_app",
 ]
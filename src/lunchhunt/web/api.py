@@ -0,0 +1,302 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, ClassVar, Optional, Union
+
+from flask import Blueprint, Response, request
+
+from lunchhunt.schedule.runner import profile_dishes
+from lunchhunt.scrap import MenuRefresher, MenuResult
+
+
+class ResponseCache:
+    """
+    Bounded cache of serialized responses with a time-to-live per entry.
+     The least recently used entry is evicted when the cache is full.
+    """
+
+    def __init__(
+            self,
+            max_entries: int = 1024,
+            clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initializes an empty cache.
+
+        :param max_entries: Maximum number of cached responses
+         (default: 1024).
+        :param clock: Monotonic time source (default: time.monotonic).
+        """
+        self.max_entries = max_entries
+        self.clock = clock
+
+        # key -> (expires, status, body, etag)
+        self._entries: OrderedDict[str, tuple[float, int, bytes, str]] = \
+            OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+            self,
+            key: str
+    ) -> Optional[tuple[int, bytes, str]]:
+        """
+        Returns a fresh cached response.
+
+        :param key: Cache key, e.g. the request path with its query.
+        :return: Tuple of status, body and ETag or None if not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self.clock() >= entry[0]:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1:]
+
+    def put(
+            self,
+            key: str,
+            status: int,
+            body: bytes,
+            ttl: Union[int, float]
+    ) -> str:
+        """
+        Stores a response.
+
+        :param key: Cache key.
+        :param status: HTTP status code.
+        :param body: Serialized body.
+        :param ttl: Seconds the response stays fresh.
+        :return: ETag of the body.
+        """
+        etag = hashlib.sha256(body).hexdigest()[:32]
+        with self._lock:
+            self._entries[key] = (self.clock() + ttl, status, body, etag)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return etag
+
+    def clear(
+            self,
+            prefix: str = ""
+    ) -> None:
+        """
+        Removes the cached responses whose key starts with a prefix.
+
+        :param prefix: Key prefix (default: all responses).
+        :return: None
+        """
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class MenuApi:
+    """
+    Read-only JSON API for menus and profile matches, mounted on the Flask
+     server of the web UI.
+
+    All data is served from the refresher's menu cache; no request scrapes.
+     Serialized responses are cached per endpoint and carry an ETag, so
+     repeated requests cost a dictionary lookup and clients revalidating
+     with If-None-Match receive an empty 304 response.
+    """
+
+    # Seconds responses stay cached, per endpoint
+    TTL: ClassVar[dict[str, int]] = {"menus": 30, "search": 30, "matches": 10}
+
+    def __init__(
+            self,
+            menus: MenuRefresher,
+            profiles,
+            url_prefix: str = "/api",
+            cache: Optional[ResponseCache] = None
+    ):
+        """
+        Initializes the API and its blueprint.
+
+        :param menus: Refresher whose cache the menus are served from.
+        :param profiles: Profile store (ProfileStore or SqliteProfileStore).
+        :param url_prefix: URL prefix of all endpoints (default: '/api').
+        :param cache: Response cache (default: new cache).
+        """
+        self.menus = menus
+        self.profiles = profiles
+        self.cache = cache or ResponseCache()
+
+        # Changed profiles invalidate the cached matches
+        self.profiles.subscribe(
+            lambda name, settings: self.cache.clear("matches:")
+        )
+
+        self.blueprint = Blueprint("api", __name__, url_prefix=url_prefix)
+        self.blueprint.add_url_rule(
+            "/menus/<mensa>", "menus", self.menu
+        )
+        self.blueprint.add_url_rule(
+            "/search", "search", self.search
+        )
+        self.blueprint.add_url_rule(
+            "/profiles/<name>/matches", "matches", self.matches
+        )
+
+    def __respond(
+            self,
+            endpoint: str,
+            build: Callable[[], tuple[int, dict, bool]]
+    ) -> Response:
+        """
+        Serves a request from the response cache, building and caching the
+         response on a miss.
+
+        :param endpoint: Endpoint name, a key of `TTL`.
+        :param build: Callable returning the status code, the JSON data and
+         whether the response may be cached.
+        :return: JSON response, or 304 if the client's ETag matches.
+        """
+        key = f"{endpoint}:{request.full_path}"
+        cached = self.cache.get(key)
+        if cached is None:
+            status, data, cacheable = build()
+            body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+            if cacheable:
+                etag = self.cache.put(key, status, body, self.TTL[endpoint])
+            else:
+                etag = hashlib.sha256(body).hexdigest()[:32]
+        else:
+            status, body, etag = cached
+
+        response = Response(body, status=status, mimetype="application/json")
+        if status == 503:
+            response.headers["Retry-After"] = "2"
+            return response
+        response.set_etag(etag)
+        response.cache_control.max_age = self.TTL[endpoint]
+        return response.make_conditional(request)
+
+    @staticmethod
+    def __menu_data(
+            menu: MenuResult
+    ) -> dict:
+        """
+        Converts a menu to its JSON representation.
+
+        :param menu: Cached menu.
+        :return: Dictionary with the Mensa details and dishes per category.
+        """
+        return {
+            "mensa": menu.mensa,
+            "mensa_name": menu.mensa_name,
+            "location": menu.location,
+            "url": menu.url,
+            "dishes": menu.dishes_by_category,
+        }
+
+    def menu(
+            self,
+            mensa: str
+    ) -> Response:
+        """
+        GET /api/menus/<mensa>: Today's menu of a Mensa.
+
+        :param mensa: Mensa code.
+        :return: JSON response; 404 for unknown Mensas and 503 while the
+         menu is loading.
+        """
+        def build() -> tuple[int, dict, bool]:
+            if mensa not in self.menus.scraper.mensa_dict:
+                return 404, {"error": f"Unknown Mensa: {mensa}"}, True
+            menu = self.menus.cache.get(mensa)
+            if menu is None:
+                self.menus.request(mensa)
+                return 503, {"error": "Menu is loading", "mensa": mensa}, \
+                    False
+            return 200, self.__menu_data(menu), True
+
+        return self.__respond("menus", build)
+
+    def search(self) -> Response:
+        """
+        GET /api/search?q=<keywords>[&mensa=<code>...]: Dishes of the cached
+         menus containing any of the keywords, separated by ';'.
+
+        :return: JSON response; 400 without keywords.
+        """
+        def build() -> tuple[int, dict, bool]:
+            keywords = [
+                keyword.strip()
+                for keyword in request.args.get("q", "").split(";")
+                if keyword.strip()
+            ]
+            if not keywords:
+                return 400, {"error": "Missing query parameter 'q'"}, True
+
+            results = []
+            for mensa in sorted(request.args.getlist("mensa")
+                                or self.menus.cache.mensas()):
+                menu = self.menus.cache.get(mensa)
+                matches = menu.find_matches(keywords) if menu else None
+                for category, dishes in (matches or {}).items():
+                    results += [
+                        {
+                            "mensa": mensa,
+                            "mensa_name": menu.mensa_name,
+                            "category": category,
+                            "dish": dish,
+                        }
+                        for dish in dishes
+                    ]
+            return 200, {"query": keywords, "results": results}, True
+
+        return self.__respond("search", build)
+
+    def matches(
+            self,
+            name: str
+    ) -> Response:
+        """
+        GET /api/profiles/<name>/matches: The dishes of the cached menus a
+         profile would be notified about, with all its categories. Mensas
+         whose menu is still loading are listed as pending.
+
+        :param name: Profile name, with or without '.json'.
+        :return: JSON response; 404 for unknown profiles.
+        """
+        def build() -> tuple[int, dict, bool]:
+            profile = name if name.endswith(".json") else f"{name}.json"
+            settings = self.profiles.get(profile)
+            if settings is None:
+                return 404, {"error": f"Unknown profile: {name}"}, True
+
+            scraper_settings = settings.get("scraper_settings") or {}
+            mensen = scraper_settings.get("mensen") or []
+            mensen = [mensen] if isinstance(mensen, str) else mensen
+            categories = scraper_settings.get("menu_categories") or []
+
+            matches, pending = {}, []
+            for mensa in mensen:
+                menu = self.menus.cache.get(mensa)
+                if menu is None:
+                    self.menus.request(mensa)
+                    pending.append(mensa)
+                    continue
+                dishes = profile_dishes(settings, menu, categories)
+                if dishes:
+                    matches[mensa] = {
+                        "mensa_name": menu.mensa_name,
+                        "url": menu.url,
+                        "dishes": dishes,
+                    }
+            data = {"profile": profile, "matches": matches, "pending": pending}
+            return 200, data, not pending
+
+        return self.__respond("matches", build)
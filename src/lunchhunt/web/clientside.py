@@ -0,0 +1,58 @@
+# JavaScript functions of the clientside callbacks of the web UI. They only
+# reshape form values, so they run in the browser without a server request.
+
+# favorite-foods value -> favorite-foods-list data
+SPLIT_FAVORITE_FOODS = """
+function(value) {
+    if (!value) {
+        return [];
+    }
+    return value.split(";")
+        .map(function(food) { return food.trim(); })
+        .filter(function(food) { return food.length > 0; });
+}
+"""
+
+# day-checkbox value -> alarm-days-map data
+MAP_ALARM_DAYS = """
+function(days) {
+    var alarmDays = {};
+    (days || []).forEach(function(day) { alarmDays[day] = true; });
+    return alarmDays;
+}
+"""
+
+# loaded-profile data and form-defaults data -> the form fields, in the
+# order of LunchHuntApp.FORM_FIELDS; the defaults hold one value per field
+FILL_FORM = """
+function(settings, defaults) {
+    var noUpdate = window.dash_clientside.no_update;
+    if (!settings) {
+        return Array(Object.keys(defaults).length).fill(noUpdate);
+    }
+    var scraper = settings.scraper_settings || {};
+    var schedule = settings.schedule_settings || {};
+    var gotify = settings.gotify_settings || {};
+    function pick(section, key, field) {
+        return key in section ? section[key] : defaults[field];
+    }
+    var foods = scraper.favorite_foods;
+    var days = schedule.alarm_days;
+    var file = settings.settings_file || defaults.settings_file;
+    return [
+        foods && foods.length ? foods.join("; ") : defaults.favorite_food,
+        pick(scraper, "menu_categories", "menu_category"),
+        pick(schedule, "offset", "offset"),
+        pick(scraper, "mensen", "mensa"),
+        pick(schedule, "hour", "hour"),
+        pick(schedule, "minute", "minute"),
+        days ? Object.keys(days).filter(function(day) { return days[day]; })
+            : defaults.alarm_days,
+        pick(gotify, "server_url", "server_url"),
+        pick(gotify, "token", "token"),
+        pick(gotify, "priority", "priority"),
+        pick(gotify, "secure", "secure"),
+        file.replace(/\\.[^.]*$/, "")
+    ];
+}
+"""
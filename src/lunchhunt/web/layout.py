@@ -0,0 +1,168 @@
+import functools
+import hashlib
+
+from dash import Dash
+from flask import Response, request
+from plotly.io.json import to_json_plotly
+
+from lunchhunt.utils import default_mensa_dict
+
+# Styles of the static layout, built once and shared by all components
+H2_STYLE = {"margin": "10px 0", "color": "#fff"}
+
+LABEL_STYLE = {
+    "marginRight": "10px",
+    "marginTop": "5px",
+    "marginBottom": "5px",
+    "display": "block",
+    "color": "#fff"
+}
+
+DROPDOWN_STYLE = {
+    "width": "100%",
+    "padding": "10px",
+    "borderRadius": "5px",
+    "border": "1px solid #555",
+    "backgroundColor": "#444",
+    "color": "#fff"
+}
+
+INPUT_STYLE = {
+    "width": "100%",
+    "padding": "5px",
+    "borderRadius": "5px",
+    "border": "1px solid #555",
+    "backgroundColor": "#444",
+    "color": "#fff"
+}
+
+OUTPUT_STYLE = {
+    "margin": "10px auto",
+    "text-align": "center",
+    "color": "#fff"
+}
+
+TAB_STYLE = {
+    "padding": "10px",
+    "border": "1px solid #555",
+    "backgroundColor": "#333",
+    "color": "#fff"
+}
+
+SELECTED_TAB_STYLE = {**TAB_STYLE, "backgroundColor": "#007BFF"}
+
+CARD_STYLE = {
+    "border": "1px solid #555",
+    "padding": "10px 20px",
+    "borderRadius": "5px",
+    "margin": "20px 0",
+    "backgroundColor": "#444",
+    "color": "#fff"
+}
+
+SECTION_STYLE = {
+    "border": "1px solid #555",
+    "padding": "20px",
+    "borderRadius": "5px",
+    "margin": "20px auto",
+    "width": "80%",
+    "maxWidth": "600px",
+    "backgroundColor": "#333"
+}
+
+
+@functools.cache
+def button_style(color: str) -> dict[str, str]:
+    """
+    Returns the style of buttons with a background color, built once per
+     color.
+
+    :param color: The background color of the button.
+    :return: Dictionary of style properties; shared, do not modify.
+    """
+    return {
+        "margin": "10px auto",
+        "display": "block",
+        "padding": "10px 20px",
+        "borderRadius": "5px",
+        "border": "none",
+        "backgroundColor": color,
+        "color": "white",
+        "cursor": "pointer"
+    }
+
+
+def mensa_options(
+        mensa_dict: dict[str, tuple[str, str]]
+) -> list[dict[str, str]]:
+    """
+    Builds the options of a Mensa dropdown, labelled with the city and the
+     Mensa name in title case.
+
+    :param mensa_dict: Dictionary mapping Mensa codes to (location, URL slug).
+    :return: List of dropdown options.
+    """
+    return [
+        {
+            "label": f"{city.title()} - {name.replace('-', ' ').title()}",
+            "value": code
+        }
+        for code, (city, name) in mensa_dict.items()
+    ]
+
+
+@functools.cache
+def default_mensa_options() -> list[dict[str, str]]:
+    """
+    Returns the Mensa dropdown options of `default_mensa_dict`, built once.
+
+    :return: List of dropdown options; shared, do not modify.
+    """
+    return mensa_options(default_mensa_dict())
+
+
+class StaticLayoutDash(Dash):
+    """
+    Dash app serving a static layout from a serialized copy.
+
+    Dash serializes the layout for every page load. As long as `layout` is
+     a component tree rather than a function, this app serializes it once
+     and sends the same bytes with an ETag, so browsers revalidating the
+     layout receive an empty 304 response. Assigning a new layout replaces
+     the copy on the next request.
+    """
+
+    # (layout, body, etag) of the last serialized layout
+    _serialized_layout = None
+
+    def serve_layout(self):
+        """
+        Serves the layout, serialized once per assigned layout, the way
+         Dash does: with plotly's JSON encoder and, from Dash 4 on, a
+         response made by the app's server backend.
+
+        :return: JSON response, or 304 if the client's ETag matches.
+        """
+        layout = self.layout
+        if callable(layout):
+            return super().serve_layout()
+
+        serialized = self._serialized_layout
+        if serialized is None or serialized[0] is not layout:
+            body = to_json_plotly(self.get_layout()).encode("utf-8")
+            serialized = (layout, body, hashlib.sha256(body).hexdigest()[:32])
+            self._serialized_layout = serialized
+
+        backend = getattr(self, "backend", None)
+        if backend is None:
+            response = Response(serialized[1], mimetype="application/json")
+        else:
+            response = backend.make_response(
+                serialized[1], mimetype="application/json"
+            )
+        if not isinstance(response, Response):
+            # ETags are only set on the responses of the Flask backend
+            return response
+        response.set_etag(serialized[2])
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
@@ -0,0 +1,254 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from typing import Callable, Optional, Union
+
+# Called by a running task with the number of finished steps and a message
+Progress = Callable[[int, str], None]
+
+# Task IDs as created by `TaskQueue.submit` (uuid4 hex)
+TASK_ID = re.compile(r"[0-9a-f]{32}")
+
+
+@dataclass(frozen=True)
+class Task:
+    """
+    Immutable snapshot of the state of a background task.
+    """
+    id: str
+    label: str
+    status: str
+    done: int = 0
+    total: int = 1
+    message: str = ""
+    submitted: float = 0.0
+    finished: Optional[float] = None
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    @property
+    def active(self) -> bool:
+        """
+        Whether the task is still queued or running.
+
+        :return: True until the task succeeded or failed.
+        """
+        return self.status in (self.QUEUED, self.RUNNING)
+
+
+class TaskQueue:
+    """
+    Local queue running slow operations of the web UI in background threads.
+
+    Callbacks submit a task and return at once; the page then polls the
+     task's state. If a state directory is given, every state change is also
+     written there, so any worker process of a multi-process server can
+     report the progress of a task submitted to another one.
+    """
+
+    def __init__(
+            self,
+            workers: int = 2,
+            state_dir: Optional[str] = None,
+            keep: Union[int, float] = 3600
+    ):
+        """
+        Initializes the queue.
+
+        :param workers: Number of tasks run at the same time (default: 2).
+        :param state_dir: Directory task states are shared through
+         (default: states are kept in memory only).
+        :param keep: Seconds finished tasks are kept before they are
+         pruned (default: 3600).
+        """
+        self.state_dir = state_dir
+        self.keep = keep
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="web-task"
+        )
+        self._tasks: dict[str, Task] = {}
+        self._lock = threading.Lock()
+
+        self.logger = logging.getLogger(__name__)
+
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+
+    def __path(
+            self,
+            task_id: str
+    ) -> str:
+        """
+        Returns the state file of a task.
+
+        :param task_id: Task ID.
+        :return: Path of the task's JSON state file.
+        """
+        return os.path.join(self.state_dir, f"{task_id}.json")
+
+    def __set(
+            self,
+            task: Task
+    ) -> None:
+        """
+        Stores a new state of a task and shares it through the state
+         directory.
+
+        :param task: New task state.
+        :return: None
+        """
+        with self._lock:
+            self._tasks[task.id] = task
+        if not self.state_dir:
+            return
+        temporary = f"{self.__path(task.id)}.tmp"
+        try:
+            with open(temporary, 'w', encoding='utf-8') as file:
+                json.dump(asdict(task), file)
+            os.replace(temporary, self.__path(task.id))
+        except OSError as e:
+            self.logger.error("Failed to write state of task %s: %s",
+                              task.id, e)
+
+    def submit(
+            self,
+            label: str,
+            function: Callable[..., str],
+            *args,
+            total: int = 1
+    ) -> str:
+        """
+        Queues a function to run in the background.
+
+        :param label: Short description shown while the task is queued.
+        :param function: Function called with a `Progress` callback followed
+         by `args`; its return value is the final message of the task.
+        :param args: Further arguments of the function.
+        :param total: Number of steps the function reports progress for
+         (default: 1).
+        :return: Task ID.
+        """
+        self.prune()
+        task = Task(
+            id=uuid.uuid4().hex,
+            label=label,
+            status=Task.QUEUED,
+            total=max(1, total),
+            message=f"{label} (queued)",
+            submitted=time.time()
+        )
+        self.__set(task)
+        self._executor.submit(self.__run, task.id, function, args)
+        return task.id
+
+    def __run(
+            self,
+            task_id: str,
+            function: Callable[..., str],
+            args: tuple
+    ) -> None:
+        """
+        Runs a task and records its progress and outcome.
+
+        :param task_id: Task ID.
+        :param function: Function of the task.
+        :param args: Further arguments of the function.
+        :return: None
+        """
+        def progress(done: int, message: str) -> None:
+            with self._lock:
+                task = self._tasks[task_id]
+            self.__set(replace(
+                task, status=Task.RUNNING, done=done, message=message
+            ))
+
+        progress(0, self._tasks[task_id].label)
+        try:
+            message = function(progress, *args)
+            status = Task.SUCCEEDED
+        except Exception as e:
+            self.logger.error("Task %s failed: %s", task_id, e)
+            message = f"{self._tasks[task_id].label} failed: {e!s}"
+            status = Task.FAILED
+        with self._lock:
+            task = self._tasks[task_id]
+        self.__set(replace(
+            task,
+            status=status,
+            done=task.total if status == Task.SUCCEEDED else task.done,
+            message=message,
+            finished=time.time()
+        ))
+
+    def get(
+            self,
+            task_id: Optional[str]
+    ) -> Optional[Task]:
+        """
+        Returns the current state of a task, also of tasks submitted by
+         other processes sharing the state directory.
+
+        :param task_id: Task ID, as sent back by the browser.
+        :return: Task or None if the task is unknown or the ID is malformed.
+        """
+        # IDs come from the client; only ones `submit` could have created
+        # may name a file in the state directory
+        if not isinstance(task_id, str) or not TASK_ID.fullmatch(task_id):
+            return None
+        with self._lock:
+            task = self._tasks.get(task_id)
+        if task is not None or not self.state_dir:
+            return task
+        try:
+            with open(self.__path(task_id), encoding='utf-8') as file:
+                return Task(**json.load(file))
+        except (OSError, json.JSONDecodeError, TypeError):
+            return None
+
+    def prune(self) -> None:
+        """
+        Forgets tasks that finished more than `keep` seconds ago.
+
+        :return: None
+        """
+        cutoff = time.time() - self.keep
+        with self._lock:
+            expired = [
+                task_id for task_id, task in self._tasks.items()
+                if task.finished is not None and task.finished < cutoff
+            ]
+            for task_id in expired:
+                del self._tasks[task_id]
+        if not self.state_dir:
+            return
+        for task_id in expired:
+            try:
+                os.remove(self.__path(task_id))
+            except FileNotFoundError:
+                pass
+
+    def shutdown(
+            self,
+            wait: bool = True
+    ) -> None:
+        """
+        Stops the worker threads.
+
+        :param wait: Whether to wait for queued tasks (default: True).
+        :return: None
+        """
+        self._executor.shutdown(wait=wait)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(task.active for task in self._tasks.values())
@@ -1,21 +1,81 @@
-import json
-import logging
 import os
-import re
-import subprocess
 from typing import Any
 
-from dash import Dash, Input, Output, State, dcc, html, no_update
-
-from lunchhunt.utils import create_cronjob, default_mensa_dict, delete_cron_job
+from dash import Input, Output, State, dcc, html, no_update
+
+from lunchhunt.profiles import (
+    ProfileStore,
+    SqliteProfileStore,
+    SubscriptionIndex,
+)
+from lunchhunt.schedule.mensa_calendar import WEEKDAYS
+from lunchhunt.schedule.registry import ScheduleRegistry
+from lunchhunt.schedule.runner import profile_dishes
+from lunchhunt.scrap import MensaScraper, MenuCache, MenuRefresher
+from lunchhunt.utils import default_mensa_dict, has_notification_sink
+from lunchhunt.web import clientside
+from lunchhunt.web.api import MenuApi
+from lunchhunt.web.layout import (
+    CARD_STYLE,
+    DROPDOWN_STYLE,
+    H2_STYLE,
+    INPUT_STYLE,
+    LABEL_STYLE,
+    OUTPUT_STYLE,
+    SECTION_STYLE,
+    SELECTED_TAB_STYLE,
+    TAB_STYLE,
+    StaticLayoutDash,
+    button_style,
+    default_mensa_options,
+    mensa_options,
+)
+from lunchhunt.web.tasks import Progress, Task, TaskQueue
 
 
 class LunchHuntApp:
+    """
+    Dash application for editing, scheduling and deleting profiles, with a
+     dashboard of today's menus.
+
+    The instance holds only state shared by all users: the profile store, the
+     subscription index, the schedule registry, the background task queue
+     and the menu refresher, which are all safe to use from several threads.
+     Everything specific to a user lives in the browser and reaches the
+     server as callback arguments, so the app can be served by a
+     multi-threaded or multi-process WSGI server through `server`.
+    """
+
+    # Number of profiles listed in a profile dropdown at once
+    PROFILE_PAGE_SIZE = 50
+
+    # Milliseconds between two polls of a running background task
+    TASK_POLL_INTERVAL = 500
+
+    # Seconds a background task waits for the crontab to be synchronized
+    SYNC_TIMEOUT = 30
+
+    # Milliseconds between two updates of the menu dashboard, and while
+    # menus are still loading
+    DASHBOARD_INTERVAL = 60000
+    DASHBOARD_LOADING_INTERVAL = 2000
+
+    # Form fields filled when loading a profile, in callback output order;
+    # their defaults are sent to the browser once with the layout
+    FORM_FIELDS = (
+        "favorite_food", "menu_category", "offset", "mensa", "hour", "minute",
+        "alarm_days", "server_url", "token", "priority", "secure",
+        "settings_file",
+    )
+
     def __init__(
             self,
             settings_dir: str | None = None,
             mensa_dict: dict | None = None,
             default_settings: dict | None = None,
+            profile_db: str | None = None,
+            refresh_interval: int | float | None = 300,
+            cron_jitter: int = 5,
     ):
         """
         Initialize the LunchHunt application with specified settings and
@@ -27,6 +87,14 @@ class LunchHuntApp:
          predefined dictionary if not provided.
         :param default_settings: Dictionary containing default application
          settings; defaults to a predefined dictionary if not provided.
+        :param profile_db: Path of a SQLite profile database to use instead
+         of the JSON files in `settings_dir` (optional).
+        :param refresh_interval: Seconds between two background refreshes of
+         the menus shown on the dashboard; None disables the refresh, and
+         menus are then loaded when they are requested (default: 300).
+        :param cron_jitter: Minutes across which the crontab entries of
+         profiles saved with the same time are spread, ending before their
+         meal cutoffs; 0 disables the spreading (default: 5).
         :return: None
         """
         self.settings_dir = settings_dir or "settings"
@@ -34,11 +102,48 @@ class LunchHuntApp:
 
         self.default_settings = default_settings or self._default_settings_dict()
         self.mensa_dict = mensa_dict or default_mensa_dict()
+        # Built once; the default options are shared by all instances
+        self.mensa_options = mensa_options(mensa_dict) if mensa_dict \
+            else default_mensa_options()
+        self.profiles = SqliteProfileStore(profile_db) if profile_db \
+            else ProfileStore(self.settings_dir, self.file_type)
+        self.subscriptions = SubscriptionIndex(self.profiles.all())
+        # Scheduled runs of database profiles must read the same database;
+        # cron starts them in the app directory, so the path is absolute
+        self.schedules = ScheduleRegistry.load(
+            os.path.join(self.settings_dir, ".schedules"),
+            profile_db=os.path.abspath(profile_db) if profile_db else None,
+            jitter=cron_jitter
+        )
+        self.schedules.reconcile(self.profiles.all())
+        self.profiles.subscribe(self.__on_profile_change)
+        self.tasks = TaskQueue(
+            state_dir=os.path.join(self.settings_dir, ".tasks")
+        )
+        # Worker processes share the menus through the settings directory,
+        # and only the holder of the lock file refreshes them
+        interval = refresh_interval or 300
+        self.menus = MenuRefresher(
+            cache=MenuCache(
+                ttl=2 * interval,
+                state_dir=os.path.join(self.settings_dir, ".menus")
+            ),
+            scraper=MensaScraper(mensa_dict=self.mensa_dict),
+            mensen=self.subscriptions.subscriptions,
+            interval=interval,
+            lock_path=os.path.join(self.settings_dir, ".menus.lock")
+        )
+        if refresh_interval:
+            self.menus.start()
+        self.api = MenuApi(self.menus, self.profiles)
 
-        self.app = Dash(
+        self.app = StaticLayoutDash(
             __name__,
             assets_folder='/home/lunchhunt/app/assets/'
         )
+        # WSGI application, e.g. for gunicorn
+        self.server = self.app.server
+        self.server.register_blueprint(self.api.blueprint)
         self.__setup_layout()
         self.__setup_callbacks()
 
@@ -72,6 +177,56 @@ class LunchHuntApp:
             "settings_file": "settings.json"
         }
 
+    def form_values(
+            self,
+            settings: dict
+    ) -> dict[str, Any]:
+        """
+        Maps the settings of a profile to the values of the form fields,
+         falling back to the default settings for missing values. A new
+         dictionary is returned; the default settings are never changed.
+
+        param: settings; The loaded settings of a profile (dict)
+        :return: A dictionary mapping the names in `FORM_FIELDS` to form
+         values (dict[str, Any])
+        """
+        defaults = self.default_settings
+        scraper_settings = settings.get("scraper_settings") or {}
+        schedule_settings = settings.get("schedule_settings") or {}
+        gotify_settings = settings.get("gotify_settings") or {}
+
+        favorite_foods = scraper_settings.get("favorite_foods")
+        alarm_days = schedule_settings.get("alarm_days")
+        return {
+            # scraper_settings
+            "favorite_food": "; ".join(favorite_foods)
+            if favorite_foods else defaults.get("favorite_food"),
+            "menu_category": scraper_settings.get(
+                "menu_categories", defaults.get("menu_category")
+            ),
+            "offset": schedule_settings.get("offset", defaults.get("offset")),
+            "mensa": scraper_settings.get("mensen", defaults.get("mensa")),
+            # schedule_settings
+            "hour": schedule_settings.get("hour", defaults.get("hour")),
+            "minute": schedule_settings.get("minute", defaults.get("minute")),
+            "alarm_days": [
+                day for day, active in alarm_days.items() if active
+            ] if alarm_days is not None else list(defaults.get("alarm_days")),
+            # gotify_settings
+            "server_url": gotify_settings.get(
+                "server_url", defaults.get("server_url")
+            ),
+            "token": gotify_settings.get("token", defaults.get("token")),
+            "priority": gotify_settings.get(
+                "priority", defaults.get("priority")
+            ),
+            "secure": gotify_settings.get("secure", defaults.get("secure")),
+            # settings_file
+            "settings_file": os.path.splitext(settings.get(
+                "settings_file", defaults.get("settings_file")
+            ))[0],
+        }
+
     def __setup_layout(self) -> None:
         """
         Set up the layout of the Dash application.
@@ -87,22 +242,50 @@ class LunchHuntApp:
                         "color": "#fff",
                         "text-align": "center"
                     }),
-                self.__load_profiles_section(),
-                self.__favorite_foods_section(),
-                self.__menu_categories_section(),
-                self.__mensen_dropdown_section(),
-                self.__timer_settings_section(),
-                self.__gotify_settings_section(),
-                self.__save_settings_section(),
-                self.__delete_profiles_section(),
-                self.__delete_cronjobs_section(),
-                html.Div(
-                    id="save-output",
-                    style={
-                        "margin": "10px auto",
-                        "text-align": "center",
-                        "color": "#fff"
-                    })],
+                dcc.Tabs(
+                    id="page-tabs",
+                    value="settings",
+                    children=[
+                        dcc.Tab(
+                            label="Settings",
+                            value="settings",
+                            style=TAB_STYLE,
+                            selected_style=SELECTED_TAB_STYLE,
+                            children=[
+                                self.__load_profiles_section(),
+                                self.__favorite_foods_section(),
+                                self.__menu_categories_section(),
+                                self.__mensen_dropdown_section(),
+                                self.__timer_settings_section(),
+                                self.__gotify_settings_section(),
+                                self.__save_settings_section(),
+                                self.__delete_profiles_section(),
+                                self.__delete_cronjobs_section(),
+                                html.Div(
+                                    id="save-output",
+                                    style=OUTPUT_STYLE)]),
+                        dcc.Tab(
+                            label="Menus",
+                            value="menus",
+                            style=TAB_STYLE,
+                            selected_style=SELECTED_TAB_STYLE,
+                            children=[self.__menus_section()])]),
+                # Form values reshaped in the browser by clientside callbacks
+                dcc.Store(id="favorite-foods-list"),
+                dcc.Store(id="alarm-days-map"),
+                dcc.Store(id="loaded-profile"),
+                dcc.Store(
+                    id="form-defaults",
+                    data=self.form_values({})),
+                # IDs of the running background tasks of this page
+                dcc.Store(id="save-task"),
+                dcc.Store(id="delete-task"),
+                # Bumped whenever a task changed the profiles
+                dcc.Store(id="profiles-changed", data=0),
+                dcc.Interval(
+                    id="task-interval",
+                    interval=self.TASK_POLL_INTERVAL,
+                    disabled=True)],
                 style={
                     "maxWidth": "1200px",
                     "margin": "0 auto",
@@ -121,24 +304,21 @@ class LunchHuntApp:
         return html.Div([
             html.H2(
                 "Load Profiles",
-                style=self.__headline_H2_style()),
+                style=H2_STYLE),
             dcc.Dropdown(
                 id="load-profiles-dropdown",
+                # Filled by its options callback when the page loads
                 options=[],
                 placeholder="Select a profile to load",
-                style=self.__dropdown_style()),
+                style=DROPDOWN_STYLE),
             html.Button(
                 "Load Profile",
                 id="load-profiles-button",
                 n_clicks=0,
-                style=self.__button_style("#007BFF")),
+                style=button_style("#007BFF")),
             html.Div(
                 id="load-output",
-                style={
-                    "margin": "10px auto",
-                    "text-align": "center",
-                    "color": "#fff"
-                })], style=self.__section_style())
+                style=OUTPUT_STYLE)], style=SECTION_STYLE)
 
     def __favorite_foods_section(self) -> html.Div:
         """
@@ -150,14 +330,14 @@ class LunchHuntApp:
         return html.Div([
             html.H2(
                 "Favorite Foods",
-                style=self.__headline_H2_style()),
+                style=H2_STYLE),
             dcc.Input(
                 id="favorite-foods",
                 type="text",
                 value=self.default_settings.get("favorite_food", None),
                 placeholder="Enter favorite foods and separate by ';'",
-                style=self.__input_style())],
-            style=self.__section_style())
+                style=INPUT_STYLE)],
+            style=SECTION_STYLE)
 
     def __menu_categories_section(self) -> html.Div:
         """
@@ -170,7 +350,7 @@ class LunchHuntApp:
         return html.Div([
             html.H2(
                 "Menu Categories",
-                style=self.__headline_H2_style()),
+                style=H2_STYLE),
             dcc.Dropdown(
                 id="menu-categories-dropdown",
                 options=[
@@ -181,7 +361,7 @@ class LunchHuntApp:
                 ],
                 value=self.default_settings.get("menu_category", "Mittagessen"),
                 multi=True,
-                style=self.__dropdown_style()),
+                style=DROPDOWN_STYLE),
             html.Label(
                 "Pick-up Offset: ",
                 title="This is the minimum amount of time before closing time"
@@ -190,14 +370,14 @@ class LunchHuntApp:
                       "\nLunch service: 11:00-14:00"
                       "\nSnack in between: 15:00-16:30"
                       "\nDinner canteen 17:30-19:30",
-                style=self.__label_style()),
+                style=LABEL_STYLE),
             dcc.Input(
                 id="offset-input",
                 type="number",
                 min=10, max=240, step=10,
                 value=self.default_settings.get("offset", 30),
-                style=self.__input_style())],
-            style=self.__section_style())
+                style=INPUT_STYLE)],
+            style=SECTION_STYLE)
 
     def __mensen_dropdown_section(self) -> html.Div:
         """
@@ -208,17 +388,107 @@ class LunchHuntApp:
         return html.Div([
             html.H2(
                 "Mensen",
-                style=self.__headline_H2_style()),
+                style=H2_STYLE),
             dcc.Dropdown(
                 id="mensen-dropdown",
-                options=[
-                    {'label': f"{city} - {name}", 'value': code}
-                    for code, city, name in self.__modify_mensa_name()
-                ],
+                options=self.mensa_options,
                 value=self.default_settings.get("mensa", "EAP"),
                 multi=True,
-                style=self.__dropdown_style())],
-            style=self.__section_style())
+                style=DROPDOWN_STYLE)],
+            style=SECTION_STYLE)
+
+    def __menus_section(self) -> html.Div:
+        """
+        Create the HTML section of the menu dashboard, showing today's menus
+         of the selected mensas and the dishes each profile would be
+         notified about.
+
+        :return: A Dash `html.Div` containing the layout of the dashboard.
+        """
+        subscribed = sorted(self.subscriptions.subscriptions())
+        return html.Div([
+            html.H2(
+                "Today's Menus",
+                style=H2_STYLE),
+            dcc.Dropdown(
+                id="dashboard-mensen",
+                options=self.mensa_options,
+                value=subscribed or [self.default_settings.get("mensa", "EAP")],
+                multi=True,
+                style=DROPDOWN_STYLE),
+            html.Div(id="dashboard-menus"),
+            dcc.Interval(
+                id="dashboard-interval",
+                interval=self.DASHBOARD_INTERVAL)],
+            style=SECTION_STYLE)
+
+    def __menu_card(
+            self,
+            mensa: str
+    ) -> tuple[html.Div, bool]:
+        """
+        Renders the cached menu of a mensa with the live matches of its
+         subscribed profiles. Menus are read from the refresher's cache only;
+         a mensa that is not cached yet is requested from the refresher.
+
+        param: mensa; The mensa code (str)
+        :return: A tuple of the rendered card and whether the menu was
+         cached (tuple[html.Div, bool])
+        """
+        if mensa not in self.mensa_dict:
+            return html.Div(f"Unknown mensa: {mensa}",
+                            style=CARD_STYLE), True
+
+        menu = self.menus.cache.get(mensa)
+        if menu is None:
+            self.menus.request(mensa)
+            city, name = self.mensa_dict[mensa]
+            return html.Div(
+                f"Loading the menu of {city.title()} "
+                f"{name.replace('-', ' ').title()}...",
+                style=CARD_STYLE), False
+
+        age = self.menus.cache.age(mensa) or 0
+        children = [
+            html.H3(f"{menu.location.title()} - {menu.mensa_name}"),
+            html.Small(f"Updated {int(age // 60)} min ago"),
+        ]
+        for category, dishes in menu.dishes:
+            children += [
+                html.H4(category),
+                html.Ul([html.Li(dish) for dish in dishes])
+            ]
+
+        subscribers = sorted(self.subscriptions.subscribers(mensa))
+        matches = []
+        for name in subscribers[:self.PROFILE_PAGE_SIZE]:
+            settings = self.profiles.get(name)
+            try:
+                dishes = profile_dishes(
+                    settings, menu,
+                    settings['scraper_settings']['menu_categories']
+                ) if settings else None
+            except (KeyError, TypeError):
+                continue
+            if dishes:
+                matches.append(html.Li([
+                    name.split('.')[0],
+                    html.Ul([
+                        html.Li(f"{category}: {dish}")
+                        for category, items in dishes.items()
+                        for dish in items
+                    ])
+                ]))
+        if len(subscribers) > self.PROFILE_PAGE_SIZE:
+            matches.append(html.Li(
+                f"... {len(subscribers) - self.PROFILE_PAGE_SIZE} more "
+                f"profile(s)"
+            ))
+        children += [
+            html.H4("Profile Matches"),
+            html.Ul(matches) if matches else html.Div("No matches.")
+        ]
+        return html.Div(children, style=CARD_STYLE), True
 
     def __timer_settings_section(self) -> html.Div:
         """
@@ -230,31 +500,31 @@ class LunchHuntApp:
         return html.Div([
             html.H2(
                 "Timer",
-                style=self.__headline_H2_style()),
+                style=H2_STYLE),
         html.Div([
             html.Label(
                 "Hour (24h): ",
-                style=self.__label_style()),
+                style=LABEL_STYLE),
             dcc.Input(
                 id="hour-input",
                 type="number",
                 min=0, max=24, step=1,
                 value=self.default_settings.get("hour", 9),
-                style=self.__input_style())]),
+                style=INPUT_STYLE)]),
         html.Div([
             html.Label(
                 "Minute: ",
-                style=self.__label_style()),
+                style=LABEL_STYLE),
             dcc.Input(
                 id="minute-input",
                 type="number",
                 min=0, max=59, step=1,
                 value=self.default_settings.get("minute", 0),
-                style=self.__input_style())]),
+                style=INPUT_STYLE)]),
         html.Div([
             html.Label(
                 "Alarm Days: ",
-                style=self.__label_style()),
+                style=LABEL_STYLE),
             dcc.Checklist(
                 id="day-checkbox",
                 options=[
@@ -270,7 +540,7 @@ class LunchHuntApp:
                     ]),
                 inline=True,
                 inputStyle={"marginRight": "5px", "marginTop": "10px"})])],
-            style=self.__section_style())
+            style=SECTION_STYLE)
 
     def __gotify_settings_section(self) -> html.Div:
         """
@@ -282,37 +552,37 @@ class LunchHuntApp:
         return html.Div([
             html.H2(
                 "Gotify",
-                style=self.__headline_H2_style()),
+                style=H2_STYLE),
             html.Div([
                 html.Label(
                     "Server: ",
-                    style=self.__label_style()),
+                    style=LABEL_STYLE),
             dcc.Input(
                 id="server-url",
                 type="text",
                 value=self.default_settings.get("server_url", None),
                 placeholder="Enter server URL",
-                style=self.__input_style())]),
+                style=INPUT_STYLE)]),
             html.Div([
                 html.Label(
                     "Token: ",
-                    style=self.__label_style()),
+                    style=LABEL_STYLE),
             dcc.Input(
                 id="token",
                 type="text",
                 value=self.default_settings.get("token", None),
                 placeholder="Enter token",
-                style=self.__input_style())]),
+                style=INPUT_STYLE)]),
             html.Div([
                 html.Label(
                     "Priority (0-10): ",
-                    style=self.__label_style()),
+                    style=LABEL_STYLE),
             dcc.Input(
                 id="priority-input",
                 type="number",
                 min=0, max=10, step=1,
                 value=self.default_settings.get("priority", 5),
-                style=self.__input_style())]),
+                style=INPUT_STYLE)]),
         dcc.RadioItems(
             id="secure-switch",
             options=[
@@ -326,12 +596,8 @@ class LunchHuntApp:
                 "alignItems": "center",
                 "color": "#fff"
             }),
-        html.Div(id="switch-output",
-                 style={
-                     "margin": "10px auto",
-                     "text-align": "center", "color": "#fff"
-                 })],
-            style=self.__section_style())
+        html.Div(id="switch-output", style=OUTPUT_STYLE)],
+            style=SECTION_STYLE)
 
     def __save_settings_section(self) -> html.Div:
         """
@@ -343,20 +609,20 @@ class LunchHuntApp:
         return html.Div([
             html.H2(
                 "Save",
-                style=self.__headline_H2_style()),
+                style=H2_STYLE),
             dcc.Input(
                 id="settings-file",
                 type="text",
                 value=os.path.splitext(self.default_settings.get(
                     "settings_file", "settings.json"))[0],
                 placeholder="Enter settings file name",
-                style=self.__input_style()),
+                style=INPUT_STYLE),
             html.Button(
                 "Save Settings",
                 id="save-settings",
                 n_clicks=0,
-                style=self.__button_style("#007BFF"))],
-            style=self.__section_style())
+                style=button_style("#007BFF"))],
+            style=SECTION_STYLE)
 
     def __delete_profiles_section(self) -> html.Div:
         """
@@ -368,28 +634,23 @@ class LunchHuntApp:
         return html.Div([
             html.H2(
                 "Delete Profiles",
-                style=self.__headline_H2_style()),
+                style=H2_STYLE),
             dcc.Dropdown(
                 id="delete-profiles-dropdown",
-                options=[
-                    {"label": profile, "value": profile}
-                    for profile in self.get_existing_profiles()],
+                # Filled by its options callback when the page loads
+                options=[],
                 multi=True,
                 placeholder="Select profiles to delete",
-                style=self.__dropdown_style()),
+                style=DROPDOWN_STYLE),
             html.Button(
                 "Delete Selected Profiles",
                 id="delete-profiles-button",
                 n_clicks=0,
-                style=self.__button_style("#FF4136")),
+                style=button_style("#FF4136")),
             html.Div(
                 id="delete-output",
-                style={
-                    "margin": "10px auto",
-                    "text-align": "center",
-                    "color": "#fff"
-                })],
-            style=self.__section_style())
+                style=OUTPUT_STYLE)],
+            style=SECTION_STYLE)
 
     def __delete_cronjobs_section(self) -> html.Div:
         """
@@ -399,120 +660,23 @@ class LunchHuntApp:
          including a dropdown to select cron jobs and a delete button.
         """
         return html.Div([
-            html.H2("Delete Cron Jobs", style=self.__headline_H2_style()),
+            html.H2("Delete Cron Jobs", style=H2_STYLE),
             dcc.Dropdown(
                 id="delete-cronjobs-dropdown",
-                options=[
-                    {"label": job_name, "value": full_cronjob}
-                    for job_name, full_cronjob in self.__get_existing_cronjobs()],
+                # Filled by its options callback when the page loads
+                options=[],
                 multi=True,
                 placeholder="Select cron jobs to delete",
-                style=self.__dropdown_style()),
+                style=DROPDOWN_STYLE),
             html.Button(
                 "Delete Selected Cron Jobs",
                 id="delete-cronjobs-button",
                 n_clicks=0,
-                style=self.__button_style("#FF4136")),
+                style=button_style("#FF4136")),
             html.Div(
                 id="delete-cron-output",
-                style={
-                    "margin": "10px auto",
-                    "text-align": "center",
-                    "color": "#fff"
-                })],
-            style=self.__section_style())
-
-    @staticmethod
-    def __headline_H2_style() -> dict[str, str]:
-        """
-        Return the style dictionary for H2 headlines.
-
-        :return: A dictionary containing the style properties for H2 headlines.
-        """
-        return {"margin": "10px 0", "color": "#fff"}
-
-    @staticmethod
-    def __label_style() -> dict[str, str]:
-        """
-        Return the style dictionary for labels.
-
-        :return: A dictionary containing the style properties for labels.
-        """
-        return {
-            "marginRight": "10px",
-            "marginTop": "5px",
-            "marginBottom": "5px",
-            "display": "block",
-            "color": "#fff"
-        }
-
-    @staticmethod
-    def __dropdown_style() -> dict[str, str]:
-        """
-        Return the style dictionary for dropdowns.
-
-        :return: A dictionary containing the style properties for dropdowns.
-        """
-        return {
-            "width": "100%",
-            "padding": "10px",
-            "borderRadius": "5px",
-            "border": "1px solid #555",
-            "backgroundColor": "#444",
-            "color": "#fff"
-        }
-
-    @staticmethod
-    def __input_style() -> dict[str, str]:
-        """
-        Return the style dictionary for input fields.
-
-        :return: A dictionary containing the style properties for input fields.
-        """
-        return {
-            "width": "100%",
-            "padding": "5px",
-            "borderRadius": "5px",
-            "border": "1px solid #555",
-            "backgroundColor": "#444",
-            "color": "#fff"
-        }
-
-    @staticmethod
-    def __button_style(color: str) -> dict[str, str]:
-        """
-        Return the style dictionary for buttons.
-
-        :param color: The background color of the button.
-        :return: A dictionary containing the style properties for buttons.
-        """
-        return {
-            "margin": "10px auto",
-            "display": "block",
-            "padding": "10px 20px",
-            "borderRadius": "5px",
-            "border": "none",
-            "backgroundColor": color,
-            "color": "white",
-            "cursor": "pointer"
-        }
-
-    @staticmethod
-    def __section_style() -> dict[str, str]:
-        """
-        Return the style dictionary for sections.
-
-        :return: A dictionary containing the style properties for sections.
-        """
-        return {
-            "border": "1px solid #555",
-            "padding": "20px",
-            "borderRadius": "5px",
-            "margin": "20px auto",
-            "width": "80%",
-            "maxWidth": "600px",
-            "backgroundColor": "#333"
-        }
+                style=OUTPUT_STYLE)],
+            style=SECTION_STYLE)
 
     def __setup_callbacks(self):
         """
@@ -525,16 +689,19 @@ class LunchHuntApp:
         :return: None
         """
         @self.app.callback(
-            Output("save-output", "children"),
+            [
+                Output("save-output", "children"),
+                Output("save-task", "data")
+            ],
             [Input("save-settings", "n_clicks")],
             [
-                State("favorite-foods", "value"),
+                State("favorite-foods-list", "data"),
                 State("menu-categories-dropdown", "value"),
                 State("offset-input", "value"),
                 State("mensen-dropdown", "value"),
                 State("hour-input", "value"),
                 State("minute-input", "value"),
-                State("day-checkbox", "value"),
+                State("alarm-days-map", "data"),
                 State("server-url", "value"),
                 State("token", "value"),
                 State("priority-input", "value"),
@@ -550,7 +717,7 @@ class LunchHuntApp:
                 mensen: list[str],
                 hour: int,
                 minute: int,
-                alarm_days: list[str],
+                alarm_days: dict[str, bool],
                 server_url: str,
                 token: str,
                 priority: int,
@@ -558,13 +725,13 @@ class LunchHuntApp:
                 settings_file: str
         ):
             """
-            Saves the provided settings to a JSON file and creates a cron job
-             based on the schedule settings.
+            Queues saving the provided settings and synchronizing the crontab
+             as a background task and returns at once.
 
             param: n_clicks; An integer representing the number of times the
              save button has been clicked (int)
             param: favorite_foods; A list of strings representing the user's
-             favorite foods (list[str])
+             favorite foods, split in the browser (list[str])
             param: menu_categories; A list of strings representing the menu
              categories to scrape (list[str])
             param: offset; An integer representing the offset for the
@@ -574,8 +741,8 @@ class LunchHuntApp:
             param: hour; An integer representing the hour for the schedule (int)
             param: minute; An integer representing the minute for
              the schedule (int)
-            param: alarm_days; A list of strings representing the days
-             for the alarm (list[str])
+            param: alarm_days; A dictionary mapping the days for the alarm
+             to True, mapped in the browser (dict[str, bool])
             param: server_url; A string representing the server URL
              for Gotify (str)
             param: token; A string representing the token for Gotify (str)
@@ -585,20 +752,23 @@ class LunchHuntApp:
              Gotify should be secure (bool)
             param: settings_file; A string representing the name of the file
              to save the settings to (str)
-            :return: A string message indicating the file path where the
-             settings were saved, or an empty string if no save was performed (str)
+            :return: A tuple of the task's progress display and its ID, of an
+             error message and None if the favorite foods or alarm days are
+             invalid, or of an empty string and None if no save was
+             performed (tuple)
             """
             if n_clicks > 0:
-                favorite_foods = [
-                    food.strip() for food in favorite_foods.split(";")
-                ] if favorite_foods else []
-
+                # The stores are filled in the browser, so their data is
+                # checked like any other request body
+                error = self.__invalid_form_lists(favorite_foods, alarm_days)
+                if error:
+                    return error, None
                 settings_file = settings_file + self.file_type \
                     if not settings_file.endswith('.json') else settings_file
 
                 settings_data = {
                     "scraper_settings": {
-                        "favorite_foods": favorite_foods,
+                        "favorite_foods": favorite_foods or [],
                         "menu_categories": menu_categories
                         if isinstance(menu_categories, list)
                         else [menu_categories],
@@ -609,7 +779,7 @@ class LunchHuntApp:
                         "offset": offset,
                         "hour": hour,
                         "minute": minute,
-                        "alarm_days": self.__update_alarm_days(alarm_days),
+                        "alarm_days": alarm_days or {},
                     },
                     "gotify_settings": {
                         "server_url": server_url,
@@ -620,70 +790,118 @@ class LunchHuntApp:
                     "settings_file": settings_file
                 }
 
-                # Save to a JSON file
-                os.makedirs(self.settings_dir, exist_ok=True)
-                filepath = os.path.join(
-                    self.settings_dir, f"{settings_file}"
+                task_id = self.tasks.submit(
+                    f"Saving {settings_file}", self.__save_profile,
+                    settings_file, settings_data, total=2
                 )
-                with open(filepath, 'w') as file:
-                    json.dump(settings_data, file, indent=4)
-
-                create_cronjob(
-                    schedule_settings=settings_data['schedule_settings'],
-                    settings_name=f"{settings_file}"
-                )
-
-                return f"Settings saved to {filepath}. Please reload the Page!"
-            return ""
+                return self.__task_progress(self.tasks.get(task_id)), task_id
+            return "", None
 
         @self.app.callback(
-            Output("delete-output", "children"),
+            [
+                Output("delete-output", "children"),
+                Output("delete-task", "data")
+            ],
             [Input("delete-profiles-button", "n_clicks")],
             [State("delete-profiles-dropdown", "value")]
         )
         def __delete_profiles(
                 n_clicks: int,
                 selected_profiles: list[str]
-        ) -> str:
+        ):
             """
-            Deletes the specified profiles from the settings directory.
+            Queues deleting the specified profiles as a background task and
+             returns at once.
 
             param: n_clicks; An integer representing the number of times the
              delete button has been clicked (int)
             param: selected_profiles; A list of strings representing the names
              of the profiles to be deleted (list[str])
 
-            :return: A string message indicating the result of the deletion
-             operation, or an empty string if no deletion was performed (str)
+            :return: A tuple of the task's progress display and its ID, or of
+             an empty string and None if no deletion was performed (tuple)
             """
             if n_clicks > 0 and selected_profiles:
-                deleted_profiles = []
-
-                for profile in selected_profiles:
-                    profile_path = os.path.join(self.settings_dir, profile)
-                    try:
-                        if os.path.exists(profile_path):
-                            os.remove(profile_path)
-                            deleted_profiles.append(profile)
-                        else:
-                            return f"Profile '{profile}' does not exist."
-                    except Exception as e:
-                        return f"Error deleting '{profile}': {e!s}"
-
-                deleted_profiles = [
-                    s.removesuffix('.json') for s in deleted_profiles
-                ]
+                task_id = self.tasks.submit(
+                    f"Deleting {len(selected_profiles)} profile(s)",
+                    self.__delete_profiles_task, list(selected_profiles),
+                    total=len(selected_profiles) + 1
+                )
+                return self.__task_progress(self.tasks.get(task_id)), task_id
+            return "", None
 
-                cronjobs = self.__get_existing_cronjobs()
-                selected_cronjobs = [
-                    job[1] for job in cronjobs
-                    if (match := re.search(r"-\s*(\w+)$", job[0]))
-                    and match.group(1) in deleted_profiles
-                ]
-                delete_cron_job(selected_cronjobs)
+        @self.app.callback(
+            Output("task-interval", "disabled"),
+            [
+                Input("save-task", "data"),
+                Input("delete-task", "data")
+            ]
+        )
+        def __toggle_task_interval(
+                save_task: str | None,
+                delete_task: str | None
+        ) -> bool:
+            """
+            Polls for task progress only while a task of the page is running.
 
-                return f"Successfully deleted {len(selected_profiles)} profile(s)."
-            return ""
+            param: save_task; The ID of the running save task (str | None)
+            param: delete_task; The ID of the running delete task (str | None)
+            :return: True if the poll interval should be disabled (bool)
+            """
+            return not (save_task or delete_task)
+
+        @self.app.callback(
+            [
+                Output("save-output", "children", allow_duplicate=True),
+                Output("save-task", "data", allow_duplicate=True),
+                Output("delete-output", "children", allow_duplicate=True),
+                Output("delete-task", "data", allow_duplicate=True),
+                Output("profiles-changed", "data")
+            ],
+            [Input("task-interval", "n_intervals")],
+            [
+                State("save-task", "data"),
+                State("delete-task", "data"),
+                State("profiles-changed", "data")
+            ],
+            prevent_initial_call=True
+        )
+        def __poll_tasks(
+                n_intervals: int,
+                save_task: str | None,
+                delete_task: str | None,
+                profiles_changed: int
+        ):
+            """
+            Shows the progress of the page's background tasks and forgets
+             tasks that have finished.
+
+            param: n_intervals; The number of elapsed poll intervals (int)
+            param: save_task; The ID of the running save task (str | None)
+            param: delete_task; The ID of the running delete task (str | None)
+            param: profiles_changed; Counter of finished tasks (int)
+            :return: A tuple of the progress display and task ID of the save
+             and the delete task, followed by the updated counter (tuple)
+            """
+            outputs = []
+            finished = 0
+            for task_id in (save_task, delete_task):
+                if not task_id:
+                    outputs += [no_update, no_update]
+                    continue
+                task = self.tasks.get(task_id)
+                if task is not None and task.active:
+                    outputs += [self.__task_progress(task), task_id]
+                    continue
+                finished += 1
+                outputs += [
+                    self.__task_progress(task) if task is not None
+                    else "The task was lost, please try again.",
+                    None
+                ]
+            return (*outputs,
+                    (profiles_changed or 0) + finished if finished
+                    else no_update)
 
         @self.app.callback(
             Output("delete-cron-output", "children"),
@@ -705,14 +923,24 @@ class LunchHuntApp:
              operation, or an empty string if no deletion was performed (str)
             """
             if n_clicks > 0 and selected_jobs:
-                try:
-                    delete_cron_job(selected_jobs)
-                    return f"Successfully deleted {len(selected_jobs)} cron job(s)."
-                except subprocess.CalledProcessError as e:
-                    return f"Error modifying crontab: {e!s}"
+                deleted = self.schedules.disable(selected_jobs)
+                return f"Successfully deleted {deleted} cron job(s)."
             return ""
 
-        @self.app.callback(
+        self.app.clientside_callback(
+            clientside.SPLIT_FAVORITE_FOODS,
+            Output("favorite-foods-list", "data"),
+            Input("favorite-foods", "value")
+        )
+
+        self.app.clientside_callback(
+            clientside.MAP_ALARM_DAYS,
+            Output("alarm-days-map", "data"),
+            Input("day-checkbox", "value")
+        )
+
+        self.app.clientside_callback(
+            clientside.FILL_FORM,
             [
                 Output("favorite-foods", "value"),
                 Output("menu-categories-dropdown", "value"),
@@ -726,6 +954,14 @@ class LunchHuntApp:
                 Output("priority-input", "value"),
                 Output("secure-switch", "value"),
                 Output("settings-file", "value"),
+            ],
+            Input("loaded-profile", "data"),
+            State("form-defaults", "data")
+        )
+
+        @self.app.callback(
+            [
+                Output("loaded-profile", "data"),
                 Output("load-output", "children"),
             ],
             [Input("load-profiles-button", "n_clicks")],
@@ -736,158 +972,139 @@ class LunchHuntApp:
                 profile: str
         ):
             """
-            Loads settings from a specified profile file and updates the
-
-             default settings.
+            Loads the settings of a specified profile file. The settings are
+             sent to the browser unchanged and filled into the form by a
+             clientside callback. The callback only reads shared state, so
+             concurrent users never see each other's profiles.
 
             param: n_clicks; An integer representing the number of times the
              load button has been clicked (int)
             param: profile; A string representing the name of the profile file
              to load (str)
-            :return: A tuple containing the updated settings values followed
-             by a success message, or a tuple with default values and an error
-             message if loading fails (tuple)
+            :return: A tuple containing the loaded settings followed by a
+             success message, or no update and an error message if loading
+             fails (tuple)
             """
             if n_clicks > 0 and profile:
-                filepath = os.path.join(self.settings_dir, profile)
-                try:
-                    with open(filepath) as file:
-                        loaded_settings = json.load(file)
-
-                    # Load sub-dictionaries
-                    scraper_settings = loaded_settings.get(
-                        "scraper_settings",
-                        self.default_settings.get("scraper_settings")
-                    )
-                    schedule_settings = loaded_settings.get(
-                        "schedule_settings",
-                        self.default_settings.get("schedule_settings")
-                    )
-                    gotify_settings = loaded_settings.get(
-                        "gotify_settings",
-                        self.default_settings.get("gotify_settings")
-                    )
-
-                    # Update the default settings directly
-                    self.default_settings.update({
-                        # scraper_settings
-                        "favorite_food":
-                            "; ".join(scraper_settings.get(
-                                "favorite_foods" or "",
-                                self.default_settings.get("favorite_foods"))
-                            ),
-                        "menu_category":
-                            scraper_settings.get(
-                                "menu_categories",
-                                self.default_settings.get("menu_categories")
-                            ),
-                        "mensa":
-                            scraper_settings.get(
-                                "mensen",
-                                self.default_settings.get("mensen")
-                            ),
-                        # schedule_settings
-                        "offset":
-                            schedule_settings.get(
-                                "offset",
-                                self.default_settings.get("offset")
-                            ),
-                        "hour":
-                            schedule_settings.get(
-                                "hour",
-                                self.default_settings.get("hour")
-                            ),
-                        "minute":
-                            schedule_settings.get(
-                                "minute",
-                                self.default_settings.get("minute")
-                            ),
-                        "alarm_days": [
-                            day for day, active in schedule_settings.get(
-                                "alarm_days",
-                                self.__update_alarm_days(
-                                    self.default_settings.get("alarm_days"))
-                            ).items() if active
-                        ],
-                        # gotify_settings
-                        "server_url":
-                            gotify_settings.get(
-                                "server_url",
-                                self.default_settings.get("server_url")
-                            ),
-                        "token":
-                            gotify_settings.get(
-                                "token",
-                                self.default_settings.get("token")
-                            ),
-                        "priority":
-                            gotify_settings.get(
-                                "priority",
-                                self.default_settings.get("priority")
-                            ),
-                        "secure":
-                            gotify_settings.get(
-                                "secure",
-                                self.default_settings.get("secure")
-                            ),
-                        # settings_file
-                        "settings_file":
-                            os.path.splitext(loaded_settings.get(
-                                "settings_file",
-                                self.default_settings.get("settings_file")
-                            ))[0]
-                    })
-
-                    return (*tuple(self.default_settings.values()),
-                            f"Settings loaded from {profile}")
-                except Exception as e:
-                    return [no_update] * 12 + [f"Error loading settings: {e}"]
-            return [no_update] * 12 + [no_update]
+                loaded_settings = self.profiles.get(profile)
+                if loaded_settings is None:
+                    return no_update, (f"Error loading settings: {profile} "
+                                       f"does not exist")
+                return loaded_settings, f"Settings loaded from {profile}"
+            return no_update, no_update
 
         @self.app.callback(
+            Output("load-profiles-dropdown", "options"),
             [
-                Output("load-profiles-dropdown", "options"),
-                Output("delete-profiles-dropdown", "options")
+                Input("profiles-changed", "data"),
+                Input("load-profiles-dropdown", "search_value")
             ],
-            [Input("save-settings", "n_clicks")]
+            [State("load-profiles-dropdown", "value")]
         )
-        def __update_profiles_dropdown_options(
-                n_clicks: int
-        ) -> tuple[list[dict[str, str]], list[dict[str, str]]]:
+        def __update_load_profiles_options(
+                profiles_changed: int,
+                search_value: str | None,
+                selected: str | None
+        ) -> list[dict[str, Any]]:
             """
-            Updates the dropdown options for profiles based on existing
-             profile files.
+            Updates the load dropdown with one page of the profiles matching
+             the typed search text.
 
-            param: n_clicks; An integer representing the number of times the
-             update button has been clicked (int)
-            :return: A tuple containing two lists of dictionaries, each
-             representing the dropdown options for profiles
-             (tuple[list[dict[str, str]], list[dict[str, str]]])
+            param: profiles_changed; Counter of finished save and delete
+             tasks (int)
+            param: search_value; The text typed into the dropdown (str | None)
+            param: selected; The currently selected profile (str | None)
+            :return: A list of dictionaries, each representing a dropdown
+             option for profiles (list[dict[str, Any]])
+            """
+            return self.__profile_options(search_value, selected)
+
+        @self.app.callback(
+            Output("delete-profiles-dropdown", "options"),
+            [
+                Input("profiles-changed", "data"),
+                Input("delete-profiles-dropdown", "search_value")
+            ],
+            [State("delete-profiles-dropdown", "value")]
+        )
+        def __update_delete_profiles_options(
+                profiles_changed: int,
+                search_value: str | None,
+                selected: list[str] | None
+        ) -> list[dict[str, Any]]:
             """
-            profiles = self.get_existing_profiles()
-            options = [
-                {"label": item.split('.')[0], "value": item}
-                for item in profiles
+            Updates the delete dropdown with one page of the profiles matching
+             the typed search text.
+
+            param: profiles_changed; Counter of finished save and delete
+             tasks (int)
+            param: search_value; The text typed into the dropdown (str | None)
+            param: selected; The currently selected profiles
+             (list[str] | None)
+            :return: A list of dictionaries, each representing a dropdown
+             option for profiles (list[dict[str, Any]])
+            """
+            return self.__profile_options(search_value, selected)
+
+        @self.app.callback(
+            [
+                Output("dashboard-menus", "children"),
+                Output("dashboard-interval", "interval")
+            ],
+            [
+                Input("dashboard-mensen", "value"),
+                Input("dashboard-interval", "n_intervals"),
+                Input("page-tabs", "value")
             ]
-            return options, options
+        )
+        def __update_dashboard(
+                mensen: list[str] | str | None,
+                n_intervals: int,
+                tab: str
+        ):
+            """
+            Renders the menu dashboard from the menu cache, without scraping
+             inside the request. While menus are loading, the dashboard is
+             updated more often.
+
+            param: mensen; The selected mensa codes (list[str] | str | None)
+            param: n_intervals; The number of elapsed update intervals (int)
+            param: tab; The value of the selected page tab (str)
+            :return: A tuple of the rendered menu cards and the next update
+             interval in milliseconds (tuple)
+            """
+            if tab != "menus":
+                return no_update, no_update
+            if isinstance(mensen, str):
+                mensen = [mensen]
+            if not mensen:
+                return html.Div("Select a mensa."), self.DASHBOARD_INTERVAL
+
+            cards, loaded = [], True
+            for mensa in mensen:
+                card, cached = self.__menu_card(mensa)
+                cards.append(card)
+                loaded = loaded and cached
+            return cards, self.DASHBOARD_INTERVAL if loaded \
+                else self.DASHBOARD_LOADING_INTERVAL
 
         @self.app.callback(
             Output("delete-cronjobs-dropdown", "options"),
-            [Input("save-settings", "n_clicks")]
+            [Input("profiles-changed", "data")]
         )
         def __update_cronjobs_dropdown_options(
-                n_clicks: int
+                profiles_changed: int
         ) -> list[dict[str, str]]:
             """
             Updates the dropdown options for cron jobs based on existing
              cron jobs.
 
-            param: n_clicks; An integer representing the number of times the
-             update button has been clicked (int)
+            param: profiles_changed; Counter of finished save and delete
+             tasks (int)
             :return: A list of dictionaries, each representing a dropdown
              option for cron jobs (list[dict[str, str]])
             """
-            cronjobs = self.__get_existing_cronjobs()
+            cronjobs = self.schedules.jobs()
 
             if not cronjobs:
                 return []
@@ -898,87 +1115,185 @@ class LunchHuntApp:
             ]
 
     @staticmethod
-    def __update_alarm_days(
-            alarm_days: list
-    ) -> dict[str, str]:
+    def __invalid_form_lists(
+            favorite_foods: Any,
+            alarm_days: Any
+    ) -> str | None:
         """
-        Updates the alarm days dictionary based on the provided list of days.
+        Checks the favorite foods and alarm days reshaped in the browser.
+
+        param: favorite_foods; The favorite foods, expected as a list of
+         strings (Any)
+        param: alarm_days; The alarm days, expected as a dictionary mapping
+         weekdays to booleans (Any)
+        :return: A message describing the first invalid value, or None if
+         both are valid (str | None)
+        """
+        if favorite_foods is not None and (
+                not isinstance(favorite_foods, list)
+                or not all(isinstance(food, str) for food in favorite_foods)):
+            return "Favorite foods must be a list of strings."
+        if alarm_days is not None and (
+                not isinstance(alarm_days, dict)
+                or not set(alarm_days) <= set(WEEKDAYS)
+                or not all(isinstance(on, bool) for on in alarm_days.values())):
+            return "Alarm days must map weekdays to true or false."
+        return None
+
+    def __save_profile(
+            self,
+            progress: Progress,
+            name: str,
+            settings: dict
+    ) -> str:
+        """
+        Background task writing a profile and waiting for the crontab to be
+         synchronized.
+
+        param: progress; Callback reporting the finished steps (Progress)
+        param: name; The name of the settings file (str)
+        param: settings; The settings to save (dict)
+        :return: A message telling where the settings were saved (str)
+        """
+        progress(0, f"Writing {name}...")
+        filepath = self.profiles.save(name, settings)
+        scheduled = has_notification_sink(settings)
+        if scheduled:
+            # Saving a profile in the UI schedules it again, also after its
+            # cron job was deleted
+            self.schedules.update(
+                name, settings.get('schedule_settings', {}), enable=True,
+                menu_categories=settings.get(
+                    'scraper_settings', {}).get('menu_categories')
+            )
+        else:
+            # Nobody would be notified, so the profile is not scheduled
+            self.schedules.remove(name)
+        progress(1, "Synchronizing crontab...")
+        if not self.schedules.flush(timeout=self.SYNC_TIMEOUT):
+            return (f"Settings saved to {filepath}. The crontab is still "
+                    f"being synchronized.")
+        if not scheduled:
+            return (f"Settings saved to {filepath}. It is not scheduled "
+                    f"without a Gotify server and token.")
+        return f"Settings saved to {filepath}."
+
+    def __delete_profiles_task(
+            self,
+            progress: Progress,
+            profiles: list[str]
+    ) -> str:
+        """
+        Background task deleting profiles and waiting for the crontab to be
+         synchronized.
 
-        param: alarm_days; A list of strings representing the days for which
-         the alarm should be set (list)
-        :return: A dictionary where each key is a day from the list and the
-         value is True (dict[str, str])
+        param: progress; Callback reporting the finished steps (Progress)
+        param: profiles; The names of the profiles to delete (list[str])
+        :return: A message telling how many profiles were deleted (str)
         """
-        return {day: True for day in alarm_days} if alarm_days else {}
+        deleted, missing = 0, []
+        for done, profile in enumerate(profiles):
+            progress(done, f"Deleting {profile}...")
+            if self.profiles.delete(profile):
+                self.schedules.remove(profile)
+                deleted += 1
+            else:
+                missing.append(profile)
+        progress(len(profiles), "Synchronizing crontab...")
+        self.schedules.flush(timeout=self.SYNC_TIMEOUT)
+
+        message = f"Successfully deleted {deleted} profile(s)."
+        if missing:
+            message += f" Not found: {', '.join(missing)}."
+        return message
 
-    def get_existing_profiles(self) -> list[str]:
+    @staticmethod
+    def __task_progress(
+            task: Task | None
+    ) -> list:
         """
-        Retrieves a list of existing profile files in the settings directory.
+        Renders the state of a background task.
 
-        :return: A list of strings representing the names of the existing
-         profile files (list[str])
+        param: task; The task to render (Task | None)
+        :return: A list of Dash components showing a progress bar while the
+         task is running, followed by its message (list)
         """
-        if not os.path.exists(self.settings_dir):
+        if task is None:
             return []
+        children = [html.Div(task.message)]
+        if task.active:
+            children.insert(0, html.Progress(value=task.done, max=task.total))
+        return children
 
-        return [
-            file for file in os.listdir(self.settings_dir)
-            if file.endswith(self.file_type)
+    def __profile_options(
+            self,
+            search_value: str | None = None,
+            selected: str | list[str] | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Builds the options of a profile dropdown from one page of the profiles
+         matching a search text. Selected profiles are always included, and a
+         disabled last option tells how many matches were left out.
+
+        param: search_value; Text the profile names must contain
+         (str | None, default=None)
+        param: selected; The currently selected profile or profiles
+         (str | list[str] | None, default=None)
+        :return: A list of dictionaries, each representing a dropdown option
+         for profiles (list[dict[str, Any]])
+        """
+        names = self.profiles.search(search_value, limit=self.PROFILE_PAGE_SIZE)
+        if isinstance(selected, str):
+            selected = [selected]
+        names += [
+            name for name in selected or []
+            if name not in names and name in self.profiles
+        ]
+        options = [
+            {"label": name.split('.')[0], "value": name} for name in names
         ]
 
-    @staticmethod
-    def __get_existing_cronjobs() -> list[tuple]:
-        """
-        Retrieves a list of existing cron jobs for the user 'lunchhunt'.
+        hidden = self.profiles.count(search_value) - self.PROFILE_PAGE_SIZE
+        if hidden > 0:
+            options.append({
+                "label": f"... {hidden} more, refine the search",
+                "value": "",
+                "disabled": True
+            })
+        return options
 
-        :return: A list of tuples, each containing the name and full cron
-         job string of an existing cron job (list[tuple])
+    def get_existing_profiles(self) -> list[str]:
         """
-        try:
-            result = subprocess.run(
-                ["crontab", "-l", "-u", "lunchhunt"],
-                capture_output=True, text=True
-            )
-            if result.returncode != 0:
-                return []
+        Retrieves a list of existing profile files in the settings directory,
+         served from the profile store's cache.
 
-            lines = result.stdout.splitlines()
-            cronjobs = []
-
-            for line in lines:
-                line = line.strip()
-                if line and not line.startswith("#"):
-                    match = re.search(
-                        r'^(\d{1,2})\s+(\d{1,2}).*?run\.py\s+([^\s]+)\.json',
-                        line
-                    )
-                    if match:
-                        minute = match.group(1)
-                        hour = match.group(2)
-                        settings_name = match.group(3)
-
-                        time_str = f"{hour.zfill(2)}:{minute.zfill(2)}"
-                        cronjob_name = f"{time_str} - {settings_name}"
-
-                        cronjobs.append((cronjob_name, line))
-
-            return cronjobs
-        except Exception as e:
-            logging.error("Error fetching cron jobs:", e)
-            return []
-
-    def __modify_mensa_name(self) -> list[tuple[str, str, str]]:
+        :return: A list of strings representing the names of the existing
+         profile files (list[str])
         """
-        Generates a list of tuples containing formatted mensa information.
+        return self.profiles.names()
 
-        :return: A list of tuples, each containing the mensa code, city name
-         in title case, and mensa name in title case with hyphens replaced
-         by spaces (list[tuple])
+    def __on_profile_change(
+            self,
+            name: str,
+            settings: dict | None
+    ) -> None:
         """
-        return [
-            (code, city.title(), name.replace("-", " ").title())
-            for code, (city, name) in self.mensa_dict.items()
-        ]
+        Keeps the subscription index in line with the profile store, for
+         changes made in the UI as well as on disk or by another worker
+         process. The schedules are only changed by the process saving or
+         deleting a profile, so one save never triggers a crontab
+         synchronization in every worker; profiles edited on disk are
+         rescheduled when the app starts.
+
+        param: name; The name of the changed profile file (str)
+        param: settings; The new settings, or None if the profile was
+         deleted (dict | None)
+        :return: None
+        """
+        if settings is None:
+            self.subscriptions.remove(name)
+        else:
+            self.subscriptions.add(name, settings)
 
     def run(
             self,
@@ -1000,13 +1315,30 @@ class LunchHuntApp:
         self.app.run(debug=debug, host=host, port=port)
 
 
+def create_app() -> LunchHuntApp:
+    """
+    Creates the LunchHuntApp configured by environment variables:
+     LUNCHHUNT_SETTINGS_DIR names the settings directory,
+     LUNCHHUNT_PROFILE_DB a SQLite profile database to read the profiles from
+     and LUNCHHUNT_CRON_JITTER the minutes crontab entries are spread across.
+
+    :return: The configured application (LunchHuntApp)
+    """
+    return LunchHuntApp(
+        settings_dir=os.environ.get("LUNCHHUNT_SETTINGS_DIR"),
+        profile_db=os.environ.get("LUNCHHUNT_PROFILE_DB"),
+        cron_jitter=int(os.environ.get("LUNCHHUNT_CRON_JITTER", 5))
+    )
+
+
 def main():
     """
-    Main function to initialize and run the LunchHuntApp.
+    Main function to initialize and run the LunchHuntApp with Flask's
+     development server. Use `lunchhunt.web.wsgi:server` in production.
 
     :return: None
     """
-    app = LunchHuntApp()
+    app = create_app()
     app.run(debug=False, host='0.0.0.0', port=8050)
 
 
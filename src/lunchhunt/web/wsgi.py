@@ -0,0 +1,7 @@
+from lunchhunt.web.webUI import create_app
+
+# WSGI entry point, configured by the environment variables of `create_app`:
+#   gunicorn --workers 4 --threads 4 --bind 0.0.0.0:8050 \
+#       lunchhunt.web.wsgi:server
+app = create_app()
+server = app.server
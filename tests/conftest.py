@@ -0,0 +1,111 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class RecordingServer(ThreadingHTTPServer):
+    """
+    Local HTTP server recording the requests it receives.
+
+    GET requests are answered with `body`, POST requests with an empty
+     JSON object; `status` applies to both.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), RecordingHandler)
+        self.requests: list[dict] = []
+        self.status = 200
+        self.body = b""
+        self.delay = 0.0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class RecordingHandler(BaseHTTPRequestHandler):
+
+    def __record(self, body: bytes) -> None:
+        with self.server.lock:
+            self.server.requests.append({
+                "method": self.command,
+                "path": self.path,
+                "headers": dict(self.headers),
+                "body": body,
+            })
+        if self.server.delay:
+            threading.Event().wait(self.server.delay)
+
+    def __reply(self, body: bytes, content_type: str) -> None:
+        self.send_response(self.server.status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.__record(b"")
+        self.__reply(self.server.body, "text/html; charset=utf-8")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.__record(self.rfile.read(length))
+        self.__reply(json.dumps({}).encode(), "application/json")
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    server = RecordingServer()
+    thread = threading.Thread(
+        target=server.serve_forever, args=(0.05,), daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class FakeClock:
+    """
+    Monotonic clock advanced by hand.
+    """
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def menu_html() -> bytes:
+    return """
+<html><body>
+<div class="container-fluid px-xl-0 splGroupWrapper">
+  <div class="pl-2">Mittagessen</div>
+  <div class="mealText">Pizza Margherita</div>
+  <div class="mealText">Linsensuppe</div>
+</div>
+<div class="container-fluid px-xl-0 splGroupWrapper">
+  <div class="pl-2">Abendessen</div>
+  <div class="mealText">Käsespätzle</div>
+</div>
+</body></html>
+""".encode()
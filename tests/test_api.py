@@ -0,0 +1,130 @@
+import pytest
+from flask import Flask
+
+from lunchhunt.profiles import ProfileStore
+from lunchhunt.scrap import MensaScraper, MenuCache, MenuRefresher, MenuResult
+from lunchhunt.web.api import MenuApi, ResponseCache
+
+MENU = MenuResult.from_dict(
+    mensa="EAP",
+    mensa_name="Mensa Ernst Abbe Platz",
+    location="jena",
+    url="http://mensa.local/eap.html",
+    dishes_by_category={"Mittagessen": ["• Pizza Margherita", "• Linsensuppe"]}
+)
+
+
+def settings(*foods: str) -> dict:
+    return {
+        "scraper_settings": {
+            "favorite_foods": list(foods),
+            "menu_categories": ["Mittagessen"],
+            "mensen": ["EAP"],
+        },
+    }
+
+
+@pytest.fixture
+def profiles(tmp_path):
+    return ProfileStore(str(tmp_path))
+
+
+@pytest.fixture
+def menus():
+    # Requested menus are loaded in the background; nothing listens there
+    scraper = MensaScraper(base_url="http://127.0.0.1:9", mensa_dict={
+        "EAP": ("jena", "ernst-abbe-platz"),
+        "CZ": ("jena", "carl-zeiss-promenade"),
+    })
+    return MenuRefresher(cache=MenuCache(), scraper=scraper)
+
+
+@pytest.fixture
+def client(menus, profiles):
+    app = Flask(__name__)
+    app.register_blueprint(MenuApi(menus, profiles).blueprint)
+    return app.test_client()
+
+
+def test_response_cache_expires_and_evicts_least_recently_used(clock):
+    cache = ResponseCache(max_entries=2, clock=clock)
+    etag = cache.put("a", 200, b"{}", ttl=10)
+    cache.put("b", 200, b"[]", ttl=10)
+
+    assert cache.get("a") == (200, b"{}", etag)
+    cache.put("c", 200, b"1", ttl=10)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+
+    clock.advance(10)
+    assert cache.get("a") is None
+
+
+def test_response_cache_clears_by_prefix(clock):
+    cache = ResponseCache(clock=clock)
+    cache.put("matches:/a", 200, b"{}", ttl=10)
+    cache.put("menus:/a", 200, b"{}", ttl=10)
+
+    cache.clear("matches:")
+
+    assert len(cache) == 1
+
+
+def test_menu_is_served_with_etag_and_revalidated(client, menus):
+    menus.cache.put(MENU)
+
+    response = client.get("/api/menus/EAP")
+    assert response.status_code == 200
+    assert response.json["dishes"] == MENU.dishes_by_category
+    etag = response.headers["ETag"]
+
+    revalidated = client.get(
+        "/api/menus/EAP", headers={"If-None-Match": etag}
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.data == b""
+
+
+def test_missing_menu_is_requested_and_not_cached(client, menus):
+    response = client.get("/api/menus/CZ")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "2"
+    assert "CZ" in menus.wanted()
+
+    menus.cache.put(MenuResult.from_dict(
+        mensa="CZ", mensa_name="Carl Zeiss", location="jena",
+        url="http://mensa.local/cz.html",
+        dishes_by_category={"Mittagessen": ["• Suppe"]}
+    ))
+    assert client.get("/api/menus/CZ").status_code == 200
+
+
+def test_unknown_mensa_is_not_found(client):
+    assert client.get("/api/menus/XYZ").status_code == 404
+
+
+def test_search_finds_dishes_of_cached_menus(client, menus):
+    menus.cache.put(MENU)
+
+    response = client.get("/api/search?q=pizza; ")
+
+    assert response.json["query"] == ["pizza"]
+    assert [result["dish"] for result in response.json["results"]] == \
+        ["• Pizza Margherita"]
+    assert client.get("/api/search").status_code == 400
+
+
+def test_saved_profile_invalidates_cached_matches(client, menus, profiles):
+    menus.cache.put(MENU)
+    profiles.save("me.json", settings("Pizza"))
+
+    first = client.get("/api/profiles/me/matches")
+    assert first.json["matches"]["EAP"]["dishes"]
+
+    profiles.save("me.json", settings("Schnitzel"))
+    second = client.get("/api/profiles/me/matches")
+    assert second.json["matches"] == {}
+    assert second.headers["ETag"] != first.headers["ETag"]
+
+    assert client.get("/api/profiles/you/matches").status_code == 404
@@ -0,0 +1,93 @@
+from lunchhunt.scrap import MenuCache, MenuResult, NegativeCache
+
+
+def menu(mensa: str = "EAP") -> MenuResult:
+    return MenuResult.from_dict(
+        mensa=mensa,
+        mensa_name="Mensa Ernst Abbe Platz",
+        location="jena",
+        url=f"http://mensa.local/{mensa}.html",
+        dishes_by_category={"Mittagessen": ["• Pizza"]}
+    )
+
+
+def test_negative_cache_keeps_reasons_for_their_own_ttl(clock):
+    misses = NegativeCache(error_ttl=60, empty_ttl=300, clock=clock)
+    misses.add("http://a", NegativeCache.ERROR)
+    misses.add("http://b", NegativeCache.EMPTY)
+
+    clock.advance(59)
+    assert misses.get("http://a") == NegativeCache.ERROR
+    assert misses.get("http://b") == NegativeCache.EMPTY
+
+    clock.advance(1)
+    assert misses.get("http://a") is None
+    assert misses.get("http://b") == NegativeCache.EMPTY
+
+    clock.advance(240)
+    assert misses.get("http://b") is None
+    assert len(misses) == 0
+
+
+def test_negative_cache_zero_ttl_disables_reason(clock):
+    misses = NegativeCache(error_ttl=0, clock=clock)
+
+    misses.add("http://a", NegativeCache.ERROR)
+
+    assert misses.get("http://a") is None
+
+
+def test_negative_cache_discard_and_clear(clock):
+    misses = NegativeCache(clock=clock)
+    misses.add("http://a", NegativeCache.ERROR)
+    misses.add("http://b", NegativeCache.ERROR)
+
+    misses.discard("http://a")
+    assert misses.get("http://a") is None
+    assert misses.get("http://b") == NegativeCache.ERROR
+
+    misses.clear()
+    assert len(misses) == 0
+
+
+def test_menu_cache_expires_and_reports_age(clock):
+    menus = MenuCache(ttl=900, clock=clock)
+    menus.put(menu())
+
+    clock.advance(100)
+    assert "EAP" in menus
+    assert menus.age("EAP") == 100
+    assert menus.mensas() == ["EAP"]
+
+    clock.advance(800)
+    assert menus.get("EAP") is None
+    assert menus.age("EAP") is None
+
+
+def test_menu_cache_shares_menus_through_state_dir(tmp_path, clock):
+    writer = MenuCache(ttl=900, state_dir=str(tmp_path), clock=clock)
+    reader = MenuCache(ttl=900, state_dir=str(tmp_path), clock=clock)
+
+    writer.put(menu())
+    assert reader.get("EAP") == menu()
+    assert reader.mensas() == ["EAP"]
+
+    writer.put(menu("MNS"))
+    writer.put(MenuResult.from_dict(
+        mensa="EAP", mensa_name="Mensa Ernst Abbe Platz", location="jena",
+        url="http://mensa.local/EAP.html",
+        dishes_by_category={"Mittagessen": ["• Suppe"]}
+    ))
+    assert reader.get("EAP").dishes_by_category == {"Mittagessen": ["• Suppe"]}
+    assert reader.mensas() == ["EAP", "MNS"]
+
+    reader.clear()
+    assert writer.mensas() == ["EAP", "MNS"]
+    assert MenuCache(state_dir=str(tmp_path)).mensas() == []
+
+
+def test_menu_cache_never_reads_outside_state_dir(tmp_path):
+    (tmp_path / "secret.json").write_text("{}")
+    menus = MenuCache(state_dir=str(tmp_path / "menus"))
+
+    assert menus.get("../secret") is None
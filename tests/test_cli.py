@@ -0,0 +1,96 @@
+import json
+import logging
+
+import pytest
+
+from lunchhunt.profiles import SqliteProfileStore
+from lunchhunt.schedule import cli
+from lunchhunt.schedule.runner import ProfileReport
+
+
+def settings(mensa: str = "EAP") -> dict:
+    return {
+        "scraper_settings": {
+            "favorite_foods": ["Pizza"],
+            "menu_categories": ["Mittagessen"],
+            "mensen": [mensa],
+        },
+        "schedule_settings": {
+            "hour": 11, "minute": 0, "alarm_days": {"monday": True}
+        },
+        "gotify_settings": {"server_url": "gotify.local", "token": "t"},
+    }
+
+
+@pytest.fixture
+def runs(monkeypatch):
+    runs = []
+
+    def run_profiles(profiles, **kwargs):
+        runs.append(profiles)
+        return [
+            ProfileReport(name=name, exit_code=0, duration=0.0)
+            for name in profiles
+        ]
+
+    monkeypatch.setattr(cli, "run_profiles", run_profiles)
+    return runs
+
+
+@pytest.fixture
+def settings_dir(tmp_path):
+    (tmp_path / "a.json").write_text(json.dumps(settings("EAP")))
+    (tmp_path / "b.json").write_text(json.dumps(settings("MNS")))
+    (tmp_path / "broken.json").write_text("{")
+    return tmp_path
+
+
+def test_only_reads_the_named_profiles(settings_dir, runs, caplog):
+    with caplog.at_level(logging.ERROR):
+        code = cli.main(["--profiles", str(settings_dir), "--only", "a.json"])
+
+    assert code == 0
+    assert list(runs[0]) == ["a.json"]
+    # The other files of the directory are never parsed
+    assert "broken.json" not in caplog.text
+
+
+def test_only_reports_missing_profiles(settings_dir, runs, caplog):
+    with caplog.at_level(logging.ERROR):
+        code = cli.main([
+            "--profiles", str(settings_dir), "--only", "a.json", "gone.json"
+        ])
+
+    assert code == 0
+    assert list(runs[0]) == ["a.json"]
+    assert "Profile gone.json not found" in caplog.text
+
+
+def test_only_fails_if_no_profile_exists(settings_dir, runs):
+    code = cli.main(["--profiles", str(settings_dir), "--only", "gone.json"])
+
+    assert code == 1
+    assert runs == []
+
+
+def test_without_only_runs_every_readable_profile(settings_dir, runs):
+    assert cli.main(["--profiles", str(settings_dir)]) == 0
+
+    assert list(runs[0]) == ["a.json", "b.json"]
+
+
+def test_only_looks_up_database_profiles_by_name(tmp_path, runs, monkeypatch):
+    database = str(tmp_path / "profiles.db")
+    store = SqliteProfileStore(database)
+    store.save("a.json", settings("EAP"))
+    store.save("b.json", settings("MNS"))
+    store.close()
+
+    def no_full_read(self):
+        raise AssertionError("all profiles were read")
+
+    monkeypatch.setattr(SqliteProfileStore, "all", no_full_read)
+    code = cli.main(["--profile-db", database, "--only", "b.json", "c.json"])
+
+    assert code == 0
+    assert runs[0] == {"b.json": settings("MNS")}
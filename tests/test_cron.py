@@ -0,0 +1,140 @@
+from datetime import time
+
+import pytest
+
+from lunchhunt.utils import (
+    CRON_BLOCK_BEGIN,
+    CRON_BLOCK_END,
+    cron_entry,
+    profile_jitter,
+    replace_cron_block,
+    sync_crontab,
+    util_functions,
+)
+
+DAYS = {"monday": True}
+
+
+def schedule(hour: int, minute: int, offset: int = 30) -> dict:
+    return {
+        "hour": hour, "minute": minute, "alarm_days": DAYS, "offset": offset
+    }
+
+
+def fire_time(entry: str) -> tuple[int, int]:
+    minute, hour = entry.split()[:2]
+    return int(hour), int(minute)
+
+
+@pytest.fixture
+def delay() -> int:
+    # c.json is delayed by 57 of 60 minutes
+    delay = int(profile_jitter("c.json", 60 * 60) // 60)
+    assert delay == 57
+    return delay
+
+
+def test_jitter_delays_within_the_day(delay):
+    entry = cron_entry(schedule(9, 0), settings_name="c.json", jitter=60)
+
+    assert fire_time(entry) == (9, delay)
+    assert fire_time(cron_entry(
+        schedule(23, 30), settings_name="c.json", jitter=60
+    )) == (23, 59)
+
+
+def test_jitter_ends_before_the_earliest_meal_cutoff(delay):
+    # Mittagessen ends at 14:00, so with a 30 minute offset the run must
+    # start before 13:30
+    entry = cron_entry(
+        schedule(13, 0), settings_name="c.json", jitter=60,
+        categories=["Abendmensa", "Mittagessen"]
+    )
+
+    assert fire_time(entry) == (13, 29)
+    assert fire_time(cron_entry(
+        schedule(13, 0, offset=0), settings_name="c.json", jitter=60,
+        categories=["Mittagessen"]
+    )) == (13, 57)
+
+
+def test_jitter_ignores_cutoffs_already_passed():
+    entry = cron_entry(
+        schedule(13, 45), settings_name="c.json", jitter=10,
+        categories=["Mittagessen"]
+    )
+
+    delay = int(profile_jitter("c.json", 10 * 60) // 60)
+    assert fire_time(entry) == (13, 45 + delay)
+
+
+def test_explicit_latest_wins_over_categories():
+    entry = cron_entry(
+        schedule(9, 0), settings_name="c.json", jitter=60,
+        latest=time(9, 10), categories=["Mittagessen"]
+    )
+
+    assert fire_time(entry) == (9, 10)
+
+
+@pytest.fixture
+def crontab(monkeypatch):
+    state = {"content": "MAILTO=admin\n0 3 * * * backup.sh\n", "writes": 0}
+
+    def write(content, user="lunchhunt"):
+        state["content"] = content
+        state["writes"] += 1
+
+    monkeypatch.setattr(
+        util_functions, "read_crontab", lambda user="lunchhunt": state["content"]
+    )
+    monkeypatch.setattr(util_functions, "write_crontab", write)
+    return state
+
+
+def profile(hour: int, token: str = "t") -> dict:
+    return {
+        "schedule_settings": schedule(hour, 0),
+        "gotify_settings": {"server_url": "gotify.local", "token": token},
+    }
+
+
+def test_sync_writes_only_when_the_block_changes(crontab):
+    profiles = {"a.json": profile(9), "sample.json": profile(9, token="")}
+
+    assert sync_crontab(profiles)
+    assert not sync_crontab(profiles)
+    assert crontab["writes"] == 1
+
+    lines = crontab["content"].splitlines()
+    assert lines[:2] == ["MAILTO=admin", "0 3 * * * backup.sh"]
+    assert lines[2] == CRON_BLOCK_BEGIN and lines[-1] == CRON_BLOCK_END
+    # Profiles without a notification sink are not scheduled
+    assert len(lines) == 5 and " run.py a.json " in lines[3]
+
+    assert sync_crontab({"a.json": profile(10)})
+    assert crontab["writes"] == 2
+
+
+def test_sync_removes_entries_of_retired_profiles(crontab):
+    sync_crontab({"a.json": profile(9), "b.json": profile(10)})
+
+    sync_crontab({"a.json": profile(9)}, retired=["b.json"])
+
+    assert "b.json" not in crontab["content"]
+    assert "a.json" in crontab["content"]
+
+
+def test_replace_cron_block_drops_legacy_entries_of_managed_profiles():
+    entry = cron_entry(schedule(9, 0), settings_name="a.json")
+    legacy = "0 8 * * 1 cd /home/lunchhunt/app && python run.py a.json >> x 2>&1"
+
+    updated = replace_cron_block(
+        f"0 3 * * * backup.sh\n{legacy}\n{entry}\n", [entry], ["a.json"]
+    )
+
+    assert updated.splitlines() == [
+        "0 3 * * * backup.sh", CRON_BLOCK_BEGIN, entry, CRON_BLOCK_END
+    ]
+    assert replace_cron_block(updated, [], ["a.json"]) == \
+        "0 3 * * * backup.sh\n"
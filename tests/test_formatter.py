@@ -0,0 +1,22 @@
+from lunchhunt.notify.formatter import format_message, render_cache_info, render_message
+
+DISHES = {"Mittagessen": ["• Pizza", "• Suppe"]}
+
+
+def test_rendering_matches_format_message():
+    for content in (DISHES, ["• Pizza"], "• Pizza"):
+        assert render_message("EAP", "http://mensa.local", content) == \
+            format_message("EAP", "http://mensa.local", content)
+
+
+def test_identical_content_is_rendered_once():
+    before = render_cache_info()
+
+    first = render_message("Cache Mensa", None, {"Abendessen": ["• Reis"]})
+    second = render_message("Cache Mensa", None, {"Abendessen": ["• Reis"]})
+
+    after = render_cache_info()
+    assert first == second
+    assert after.misses - before.misses == 1
+    assert after.hits - before.hits == 1
+
@@ -0,0 +1,60 @@
+import json
+
+from lunchhunt.profiles import SubscriptionIndex
+
+
+def settings(mensen, categories) -> dict:
+    return {
+        "scraper_settings": {"mensen": mensen, "menu_categories": categories}
+    }
+
+
+def test_subscribers_by_mensa_and_category():
+    index = SubscriptionIndex({
+        "a.json": settings(["EAP", "MNS"], ["Mittagessen"]),
+        "b.json": settings(["EAP"], ["Abendessen", "Mittagessen"]),
+        # Single values are accepted as well
+        "c.json": settings("MNS", "Abendessen"),
+    })
+
+    assert index.subscribers("EAP") == {"a.json", "b.json"}
+    assert index.subscribers("EAP", "Abendessen") == {"b.json"}
+    assert index.subscribers("MNS", ["Mittagessen", "Abendessen"]) == \
+        {"a.json", "c.json"}
+    assert index.subscribers("CZ") == set()
+    assert index.subscriptions() == {
+        "EAP": {"Abendessen", "Mittagessen"},
+        "MNS": {"Abendessen", "Mittagessen"},
+    }
+
+
+def test_saving_replaces_and_deleting_removes_subscriptions():
+    index = SubscriptionIndex({"a.json": settings(["EAP"], ["Mittagessen"])})
+
+    index.add("a.json", settings(["MNS"], ["Mittagessen"]))
+    assert index.subscribers("EAP") == set()
+    assert index.subscribers("MNS") == {"a.json"}
+    assert index.subscriptions() == {"MNS": {"Mittagessen"}}
+
+    index.remove("a.json")
+    assert index.subscriptions() == {}
+    assert "a.json" not in index and len(index) == 0
+
+
+def test_profiles_without_scraper_settings_subscribe_to_nothing():
+    index = SubscriptionIndex({"empty.json": {}})
+
+    assert "empty.json" in index
+    assert index.subscriptions() == {}
+
+
+def test_from_directory_reads_all_profiles(tmp_path):
+    (tmp_path / "a.json").write_text(
+        json.dumps(settings(["EAP"], ["Mittagessen"]))
+    )
+    (tmp_path / "notes.txt").write_text("not a profile")
+
+    index = SubscriptionIndex.from_directory(str(tmp_path))
+
+    assert len(index) == 1
+    assert index.subscribers("EAP", "Mittagessen") == {"a.json"}
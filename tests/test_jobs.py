@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from lunchhunt.schedule.jobs import Job, JobQueue
+
+DAY = datetime(2026, 10, 19)
+
+
+def at(clock: str) -> datetime:
+    return datetime.combine(DAY, datetime.strptime(clock, "%H:%M").time())
+
+
+def job(name: str, categories: list[str], fire_at: str = "10:00") -> Job:
+    settings = {
+        "scraper_settings": {"menu_categories": categories, "mensen": []},
+        "schedule_settings": {"offset": 30},
+    }
+    return Job.create(name, settings, at(fire_at))
+
+
+def test_pop_ready_orders_by_deadline_then_fire_time():
+    queue = JobQueue()
+    queue.push(job("dinner", ["Abendessen"]))
+    queue.push(job("lunch-late", ["Mittagessen"], "10:30"))
+    queue.push(job("lunch-early", ["Mittagessen"], "10:00"))
+    queue.push(job("breakfast", ["Frühstück"]))
+
+    names = [ready.name for ready in queue.pop_ready(at("07:00"))]
+
+    assert names == ["breakfast", "lunch-early", "lunch-late", "dinner"]
+    assert len(queue) == 0
+
+
+def test_equal_jobs_keep_arrival_order():
+    queue = JobQueue()
+    for name in ("first", "second", "third"):
+        queue.push(job(name, ["Mittagessen"]))
+
+    assert [ready.name for ready in queue.pop_ready(at("10:00"))] == \
+        ["first", "second", "third"]
+
+
+def test_pop_ready_downgrades_and_drops_late_jobs():
+    queue = JobQueue()
+    queue.push(job("both", ["Frühstück", "Mittagessen"]))
+    queue.push(job("breakfast", ["Frühstück"]))
+
+    [ready] = queue.pop_ready(at("12:00"))
+
+    assert ready.name == "both"
+    assert ready.settings["scraper_settings"]["menu_categories"] == \
+        ["Mittagessen"]
+    assert (queue.downgraded, queue.dropped) == (1, 1)
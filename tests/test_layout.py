@@ -0,0 +1,48 @@
+import json
+
+from dash import html
+
+from lunchhunt.web.layout import H2_STYLE, StaticLayoutDash
+
+
+def test_static_layout_is_served_with_etag_and_revalidated():
+    app = StaticLayoutDash(__name__)
+    app.layout = html.H2("LunchHunt", id="title", style=H2_STYLE)
+    client = app.server.test_client()
+
+    response = client.get("/_dash-layout")
+    assert response.status_code == 200
+    assert response.mimetype == "application/json"
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert json.loads(response.data)["props"]["children"] == "LunchHunt"
+
+    revalidated = client.get(
+        "/_dash-layout", headers={"If-None-Match": response.headers["ETag"]}
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.data == b""
+
+
+def test_assigning_a_layout_replaces_the_serialized_copy():
+    app = StaticLayoutDash(__name__)
+    app.layout = html.H2("Before")
+    client = app.server.test_client()
+    before = client.get("/_dash-layout")
+
+    app.layout = html.H2("After")
+    after = client.get(
+        "/_dash-layout", headers={"If-None-Match": before.headers["ETag"]}
+    )
+
+    assert after.status_code == 200
+    assert json.loads(after.data)["props"]["children"] == "After"
+
+
+def test_layout_functions_are_served_by_dash():
+    app = StaticLayoutDash(__name__)
+    app.layout = lambda: html.H2("Dynamic")
+
+    response = app.server.test_client().get("/_dash-layout")
+
+    assert json.loads(response.data)["props"]["children"] == "Dynamic"
+    assert "ETag" not in response.headers
@@ -0,0 +1,111 @@
+import threading
+from datetime import date, timedelta
+
+from lunchhunt.schedule import MensaCalendar
+
+# A Monday in ISO week 2, so it is no probe week for probe_interval=4
+MONDAY = date(2026, 1, 5)
+
+
+def calendar(**kwargs) -> MensaCalendar:
+    return MensaCalendar(calendar={}, **kwargs)
+
+
+def weeks(first: int, last: int) -> list[date]:
+    return [MONDAY + timedelta(weeks=week) for week in range(first, last)]
+
+
+def test_empty_weekdays_are_learned_as_closed():
+    mensa_calendar = calendar(min_observations=3)
+
+    for day in weeks(0, 2):
+        mensa_calendar.record("EAP", day, empty=True)
+    assert mensa_calendar.is_open("EAP", MONDAY + timedelta(weeks=2))
+
+    mensa_calendar.record("EAP", MONDAY + timedelta(weeks=2), empty=True)
+    assert not mensa_calendar.is_open("EAP", MONDAY + timedelta(weeks=3))
+    assert mensa_calendar.is_open("EAP", MONDAY + timedelta(days=1))
+
+
+def test_repeated_scrapes_of_a_date_count_once():
+    mensa_calendar = calendar(min_observations=3)
+
+    for _ in range(5):
+        mensa_calendar.record("EAP", MONDAY, empty=True)
+
+    assert mensa_calendar.is_open("EAP", MONDAY + timedelta(weeks=1))
+
+
+def test_menu_on_any_scrape_of_a_date_wins():
+    mensa_calendar = calendar(min_observations=1)
+
+    mensa_calendar.record("EAP", MONDAY, empty=False)
+    mensa_calendar.record("EAP", MONDAY, empty=True)
+
+    assert mensa_calendar.is_open("EAP", MONDAY + timedelta(weeks=1))
+
+
+def test_old_menus_leave_the_window():
+    mensa_calendar = calendar(min_observations=3, window=4)
+
+    # Open on Mondays for months, then closed for good
+    for day in weeks(0, 10):
+        mensa_calendar.record("EAP", day, empty=False)
+    for day in weeks(10, 13):
+        mensa_calendar.record("EAP", day, empty=True)
+    assert mensa_calendar.is_open("EAP", MONDAY + timedelta(weeks=13))
+
+    mensa_calendar.record("EAP", MONDAY + timedelta(weeks=13), empty=True)
+    assert not mensa_calendar.is_open("EAP", MONDAY + timedelta(weeks=13))
+
+
+def test_probe_with_menu_reopens_closed_weekday():
+    mensa_calendar = calendar(min_observations=3, probe_interval=4)
+    for day in weeks(0, 3):
+        mensa_calendar.record("EAP", day, empty=True)
+
+    # Week 6 is no probe week, week 8 is
+    assert not mensa_calendar.is_open("EAP", MONDAY + timedelta(weeks=4))
+    assert mensa_calendar.is_open("EAP", MONDAY + timedelta(weeks=6))
+
+    mensa_calendar.record("EAP", MONDAY + timedelta(weeks=6), empty=False)
+    assert mensa_calendar.is_open("EAP", MONDAY + timedelta(weeks=4))
+
+
+def test_save_and_load_keep_dated_observations(tmp_path):
+    path = str(tmp_path / "calendar.json")
+    mensa_calendar = calendar(min_observations=3)
+    for day in weeks(0, 3):
+        mensa_calendar.record("EAP", day, empty=True)
+    mensa_calendar.save(path)
+
+    loaded = MensaCalendar.load(path)
+
+    assert not loaded.is_open("EAP", MONDAY + timedelta(weeks=4))
+    assert loaded.to_dict()["observations"] == \
+        mensa_calendar.to_dict()["observations"]
+
+
+def test_concurrent_records_and_configures():
+    mensa_calendar = calendar(min_observations=1)
+    start = threading.Barrier(4)
+
+    def record(mensa):
+        start.wait()
+        for day in weeks(0, 50):
+            mensa_calendar.record(mensa, day, empty=True)
+            mensa_calendar.configure(mensa, meal_windows={})
+
+    threads = [
+        threading.Thread(target=record, args=(mensa,))
+        for mensa in ["EAP", "MNS", "CZ", "ZAP"]
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(
+        not mensa_calendar.is_open(mensa, MONDAY)
+        for mensa in ["EAP", "MNS", "CZ", "ZAP"]
+    )
@@ -0,0 +1,32 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+from lunchhunt.scrap import MensaScraper, parse_menu_html
+
+
+def test_parse_menu_html_returns_compact_menu(menu_html):
+    menu = parse_menu_html(menu_html)
+
+    assert menu == (
+        ("Mittagessen", ("• Pizza Margherita", "• Linsensuppe")),
+        ("Abendessen", ("• Käsespätzle",)),
+    )
+    # Only plain tuples of strings travel back from a worker process
+    assert pickle.loads(pickle.dumps(menu)) == menu
+    assert parse_menu_html(menu_html.decode()) == menu
+
+
+def test_page_without_menu_sections_parses_to_none():
+    assert parse_menu_html(b"<html><body>Closed</body></html>") is None
+
+
+def test_parse_executor_gives_the_same_menu(menu_html):
+    inline = MensaScraper().parse_page(menu_html)
+
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        pooled = MensaScraper(parse_executor=pool).parse_page(menu_html)
+
+    assert pooled == inline == {
+        "Mittagessen": ["• Pizza Margherita", "• Linsensuppe"],
+        "Abendessen": ["• Käsespätzle"],
+    }
@@ -0,0 +1,84 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from lunchhunt.schedule import MenuPipeline
+from lunchhunt.scrap import MensaScraper, MenuCache
+from lunchhunt.utils import util_functions
+
+
+class Noon(datetime):
+    """
+    Clock fixed at a time when lunch is still worth notifying about.
+    """
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2026, 3, 2, 11, 0)
+
+
+@pytest.fixture(autouse=True)
+def noon(monkeypatch):
+    monkeypatch.setattr(util_functions, "datetime", Noon)
+
+
+def profile(server_url: str, token: str, *foods: str) -> dict:
+    return {
+        "scraper_settings": {
+            "favorite_foods": list(foods),
+            "menu_categories": ["Mittagessen"],
+            "mensen": ["TST"],
+        },
+        "schedule_settings": {"hour": 11, "minute": 0},
+        "gotify_settings": {"server_url": server_url, "token": token},
+    }
+
+
+def test_every_mensa_is_fetched_once_for_all_profiles(http_server, menu_html):
+    http_server.body = menu_html
+    cache = MenuCache()
+    pipeline = MenuPipeline(
+        scraper=MensaScraper(
+            base_url=http_server.url,
+            mensa_dict={"TST": ("jena", "test-mensa")}
+        ),
+        cache=cache
+    )
+    profiles = {
+        "a.json": profile(http_server.url, "a", "Pizza"),
+        "b.json": profile(http_server.url, "b", "linsen"),
+        "c.json": profile(http_server.url, "c", "Schnitzel"),
+    }
+
+    reports = pipeline.run_sync(profiles)
+
+    fetches = [r for r in http_server.requests if r["method"] == "GET"]
+    sent = {
+        r["headers"]["X-Gotify-Key"]: json.loads(r["body"])["message"]
+        for r in http_server.requests if r["method"] == "POST"
+    }
+    assert len(fetches) == 1
+    assert sorted(sent) == ["a", "b"]
+    assert "• Pizza Margherita" in sent["a"]
+    assert "• Linsensuppe" in sent["b"] and "Pizza" not in sent["b"]
+    assert [(r.name, r.exit_code, r.notifications) for r in reports] == [
+        ("a.json", 0, 1), ("b.json", 0, 1), ("c.json", 0, 0)
+    ]
+    assert "TST" in cache
+
+    # Cached menus skip fetching and parsing
+    pipeline.run_sync(profiles)
+    assert len([r for r in http_server.requests if r["method"] == "GET"]) == 1
+
+
+def test_failed_fetch_notifies_nobody(http_server):
+    http_server.status = 500
+    pipeline = MenuPipeline(scraper=MensaScraper(
+        base_url=http_server.url, mensa_dict={"TST": ("jena", "test-mensa")}
+    ))
+
+    reports = pipeline.run_sync({"a.json": profile(http_server.url, "a")})
+
+    assert [r["method"] for r in http_server.requests] == ["GET"]
+    assert reports[0].notifications == 0
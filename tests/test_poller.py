@@ -0,0 +1,70 @@
+import itertools
+import random
+from datetime import datetime, timedelta
+
+from lunchhunt.schedule import AdaptivePoller
+from lunchhunt.scrap import MenuResult
+
+
+class ChangingScraper:
+    """
+    Scraper stub whose menus change on a seeded share of the fetches, so the
+     learned plan keeps moving during the day.
+    """
+
+    def __init__(self, changes: float = 0.3):
+        self.fetches: list[str] = []
+        self.changes = changes
+        self.random = random.Random(1)
+        self.versions = itertools.count()
+
+    def scrape_menu(self, mensa: str) -> MenuResult:
+        self.fetches.append(mensa)
+        version = next(self.versions) \
+            if self.random.random() < self.changes else 0
+        return MenuResult.from_dict(
+            mensa=mensa, mensa_name=mensa, location="jena",
+            url=f"http://mensa.local/{mensa}.html",
+            dishes_by_category={"Mittagessen": [f"• Gericht {version}"]}
+        )
+
+
+def simulate_day(poller: AdaptivePoller, day: datetime) -> None:
+    for minute in range(24 * 60):
+        poller.poll(day + timedelta(minutes=minute), workers=1)
+
+
+def test_polls_of_a_day_stay_within_budget():
+    scraper = ChangingScraper()
+    poller = AdaptivePoller(["EAP", "MNS", "CZ"], budget=12, scraper=scraper)
+
+    for day in range(3):
+        simulate_day(poller, datetime(2026, 3, 2) + timedelta(days=day))
+        assert 0 < len(scraper.fetches) <= 12
+        scraper.fetches.clear()
+
+
+def test_daily_counts_reset_at_midnight():
+    scraper = ChangingScraper()
+    poller = AdaptivePoller(["EAP", "MNS"], budget=4, scraper=scraper)
+
+    simulate_day(poller, datetime(2026, 3, 2))
+    first_day = len(scraper.fetches)
+    assert poller.polls_today(datetime(2026, 3, 2, 23, 59)) != {
+        "EAP": 0, "MNS": 0
+    }
+    assert poller.polls_today(datetime(2026, 3, 3)) == {"EAP": 0, "MNS": 0}
+
+    simulate_day(poller, datetime(2026, 3, 3))
+    assert 0 < len(scraper.fetches) - first_day <= 4
+
+
+def test_mensa_is_not_due_after_using_its_allocation():
+    poller = AdaptivePoller(["EAP", "MNS"], budget=2, scraper=ChangingScraper())
+    noon = datetime(2026, 3, 2, 12)
+
+    poller.observe("EAP", None, noon)
+
+    assert poller.due(datetime(2026, 3, 2, 19, 59)) == ["MNS"]
+    poller.observe("MNS", None, noon)
+    assert poller.due(datetime(2026, 3, 2, 19, 59)) == []
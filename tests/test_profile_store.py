@@ -0,0 +1,91 @@
+import json
+import os
+
+import pytest
+
+from lunchhunt.profiles import ProfileStore
+
+
+def settings(food: str) -> dict:
+    return {"scraper_settings": {"favorite_foods": [food]}}
+
+
+def write(path, value: dict, mtime_ns: int) -> None:
+    path.write_text(json.dumps(value))
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def changes():
+    return []
+
+
+def store(tmp_path, changes, **kwargs) -> ProfileStore:
+    profiles = ProfileStore(str(tmp_path), **kwargs)
+    profiles.subscribe(lambda name, new: changes.append((name, new)))
+    return profiles
+
+
+def test_files_added_and_removed_on_disk_are_noticed(tmp_path, changes):
+    write(tmp_path / "a.json", settings("Pizza"), 1_000_000_000)
+    profiles = store(tmp_path, changes, check_interval=3600)
+    assert profiles.names() == ["a.json"]
+
+    write(tmp_path / "b.json", settings("Suppe"), 1_000_000_000)
+    (tmp_path / "a.json").unlink()
+    # Force the directory mtime to differ from the one cached
+    os.utime(tmp_path, ns=(2_000_000_000, 2_000_000_000))
+
+    assert profiles.names() == ["b.json"]
+    assert sorted(changes, key=lambda change: change[0]) == [
+        ("a.json", None), ("b.json", settings("Suppe"))
+    ]
+
+
+def test_edits_in_place_are_revalidated_after_the_interval(tmp_path, changes):
+    path = tmp_path / "a.json"
+    write(path, settings("Pizza"), 1_000_000_000)
+    profiles = store(tmp_path, changes, check_interval=3600)
+    directory = os.stat(tmp_path).st_mtime_ns
+
+    write(path, settings("Suppe"), 2_000_000_000)
+    os.utime(tmp_path, ns=(directory, directory))
+    # Within the check interval, the cached settings are served
+    assert profiles.get("a.json") == settings("Pizza")
+
+    profiles.refresh(force=True)
+    assert profiles.get("a.json") == settings("Suppe")
+    assert changes == [("a.json", settings("Suppe"))]
+
+
+def test_unchanged_files_are_not_parsed_again(tmp_path, changes):
+    write(tmp_path / "a.json", settings("Pizza"), 1_000_000_000)
+    profiles = store(tmp_path, changes, check_interval=0)
+
+    profiles.names()
+    profiles.refresh(force=True)
+
+    assert changes == []
+
+
+def test_save_and_delete_notify_and_return_copies(tmp_path, changes):
+    profiles = store(tmp_path, changes)
+
+    profiles.save("a.json", settings("Pizza"))
+    profiles.get("a.json")["scraper_settings"]["favorite_foods"].append("x")
+    assert profiles.get("a.json") == settings("Pizza")
+    assert json.loads((tmp_path / "a.json").read_text()) == settings("Pizza")
+
+    assert profiles.delete("a.json") and not profiles.delete("a.json")
+    assert changes == [("a.json", settings("Pizza")), ("a.json", None)]
+    assert len(profiles) == 0
+
+
+def test_broken_files_are_skipped(tmp_path, changes):
+    (tmp_path / "broken.json").write_text("{")
+    write(tmp_path / "a.json", settings("Pizza"), 1_000_000_000)
+
+    profiles = store(tmp_path, changes)
+
+    assert profiles.names() == ["a.json"]
+    assert profiles.search("A") == ["a.json"] and profiles.count("b") == 0
@@ -0,0 +1,60 @@
+import time
+
+import pytest
+
+from lunchhunt.scrap import MensaScraper, MenuCache, MenuRefresher
+
+
+def wait_for(condition, timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.fixture
+def refreshers(http_server, tmp_path, menu_html):
+    http_server.body = menu_html
+    created = []
+
+    def create(**kwargs) -> MenuRefresher:
+        refresher = MenuRefresher(
+            cache=MenuCache(state_dir=str(tmp_path / ".menus")),
+            scraper=MensaScraper(
+                base_url=http_server.url,
+                mensa_dict={"TST": ("jena", "test-mensa")}
+            ),
+            **kwargs
+        )
+        created.append(refresher)
+        return refresher
+
+    yield create
+    for refresher in created:
+        refresher.stop(timeout=5)
+
+
+def test_request_loads_on_demand_without_thread(refreshers):
+    menus = refreshers()
+
+    menus.request("TST")
+
+    assert not menus.refreshing
+    assert wait_for(lambda: "TST" in menus.cache)
+
+
+def test_only_lock_holder_refreshes(http_server, refreshers, tmp_path):
+    lock_path = str(tmp_path / ".menus.lock")
+    leader = refreshers(lock_path=lock_path).start()
+    assert wait_for(lambda: leader.refreshing)
+    follower = refreshers(lock_path=lock_path, interval=0.1).start()
+
+    leader.request("TST")
+    assert wait_for(lambda: "TST" in follower.cache)
+    assert not follower.refreshing
+    assert len(http_server.requests) == 1
+
+    leader.stop(timeout=5)
+    assert not leader.refreshing
+    # The follower checks every interval whether it can take over
+    assert wait_for(lambda: follower.refreshing)
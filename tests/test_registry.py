@@ -0,0 +1,144 @@
+import threading
+
+from lunchhunt.schedule.registry import ScheduleRegistry
+
+WEEKDAYS = {"monday": True, "wednesday": True}
+
+
+def profile(hour: int = 11, minute: int = 30, **gotify) -> dict:
+    return {
+        "schedule_settings": {
+            "hour": hour, "minute": minute, "alarm_days": WEEKDAYS
+        },
+        "gotify_settings": gotify or {
+            "server_url": "gotify.local", "token": "t"
+        },
+    }
+
+
+def registry(tmp_path) -> ScheduleRegistry:
+    return ScheduleRegistry.load(
+        str(tmp_path / ".schedules"), sync=False, env_path="/app/.venv"
+    )
+
+
+def test_jobs_are_sorted_by_time_and_labelled(tmp_path):
+    schedules = registry(tmp_path)
+    schedules.update("late.json", profile(12, 0)["schedule_settings"])
+    schedules.update("early.json", profile(9, 5)["schedule_settings"])
+
+    labels = [label for label, _ in schedules.jobs()]
+
+    assert labels == ["09:05 - early", "12:00 - late"]
+    assert "late.json" in schedules.jobs()[1][1]
+
+
+def test_reload_picks_up_changes_of_other_instances(tmp_path):
+    first, second = registry(tmp_path), registry(tmp_path)
+
+    first.update("a.json", profile()["schedule_settings"])
+    assert "a.json" in second.jobs()[0][1]
+
+    second.remove("a.json")
+    first.reload()
+    assert "a.json" not in first
+    assert first.jobs() == []
+
+
+def test_concurrent_updates_of_instances_are_not_lost(tmp_path):
+    instances = [registry(tmp_path) for _ in range(4)]
+
+    def add(index: int, schedules: ScheduleRegistry) -> None:
+        for number in range(10):
+            schedules.update(
+                f"p{index}-{number}.json", profile()["schedule_settings"]
+            )
+
+    threads = [
+        threading.Thread(target=add, args=(index, schedules))
+        for index, schedules in enumerate(instances)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(registry(tmp_path)) == 40
+
+
+def test_reconcile_skips_profiles_without_sink(tmp_path):
+    schedules = registry(tmp_path)
+
+    schedules.reconcile({
+        "with-sink.json": profile(),
+        "sample.json": profile(server_url="", token=""),
+    })
+
+    assert "with-sink.json" in schedules
+    assert "sample.json" not in schedules
+
+
+def test_disabled_schedule_stays_disabled_on_update(tmp_path):
+    schedules = registry(tmp_path)
+    schedules.update("a.json", profile()["schedule_settings"])
+
+    assert schedules.disable([entry for _, entry in schedules.jobs()]) == 1
+    schedules.update("a.json", profile(10, 0)["schedule_settings"])
+    assert schedules.jobs() == []
+
+    schedules.update("a.json", profile(10, 0)["schedule_settings"], enable=True)
+    assert len(schedules.jobs()) == 1
+
+
+def test_invalid_schedules_are_left_out_of_jobs(tmp_path):
+    schedules = registry(tmp_path)
+    schedules.update("a.json", profile()["schedule_settings"])
+    schedules.update("bad.json", {
+        "hour": 11, "minute": 0, "alarm_days": {"funday": True}
+    })
+    schedules.update("incomplete.json", {"alarm_days": WEEKDAYS})
+
+    assert [label for label, _ in schedules.jobs()] == ["11:30 - a"]
+
+
+def test_jitter_ends_before_the_profiles_meal_cutoff(tmp_path):
+    schedules = ScheduleRegistry.load(
+        str(tmp_path / ".schedules"), sync=False, jitter=60
+    )
+    settings = profile(13, 20)
+    settings["scraper_settings"] = {"menu_categories": ["Mittagessen"]}
+
+    # c.json is delayed by 57 of 60 minutes, but Mittagessen ends at 14:00
+    # and the profile's default offset is 30 minutes
+    schedules.reconcile({"c.json": settings})
+    assert schedules.jobs()[0][1].startswith("29 13 ")
+
+    schedules.update(
+        "c.json", profile(13, 0)["schedule_settings"],
+        menu_categories=["Abendmensa"]
+    )
+    assert schedules.jobs()[0][1].startswith("57 13 ")
+    # The categories are kept in the state file
+    assert ScheduleRegistry.load(
+        str(tmp_path / ".schedules"), sync=False, jitter=60
+    ).jobs()[0][1].startswith("57 13 ")
+
+
+def test_reconcile_without_changes_neither_saves_nor_syncs(tmp_path):
+    schedules = ScheduleRegistry.load(str(tmp_path / ".schedules"))
+    syncs = []
+    schedules.request_sync = lambda: syncs.append(True)
+    profiles = {"a.json": profile(), "b.json": profile(12, 0)}
+
+    schedules.reconcile(profiles)
+    assert len(syncs) == 1
+    state = tmp_path / ".schedules"
+    saved = (state.stat().st_ino, state.stat().st_mtime_ns)
+
+    schedules.reconcile(profiles)
+    assert len(syncs) == 1
+    assert (state.stat().st_ino, state.stat().st_mtime_ns) == saved
+
+    schedules.reconcile({"a.json": profile(10, 0)})
+    assert len(syncs) == 2
+    assert [label for label, _ in schedules.jobs()] == ["10:00 - a"]
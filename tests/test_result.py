@@ -0,0 +1,55 @@
+import dataclasses
+import pickle
+
+import pytest
+
+from lunchhunt.scrap import MenuResult, match_dishes
+
+MENU = MenuResult.from_dict(
+    mensa="EAP",
+    mensa_name="Mensa Ernst Abbe Platz",
+    location="jena",
+    url="http://mensa.local/eap.html",
+    dishes_by_category={
+        "Mittagessen": ["• Pizza Margherita", "• Linsensuppe"],
+        "Abendessen": ["• Käsespätzle"],
+    }
+)
+
+
+def test_results_are_immutable_and_hand_out_copies():
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        MENU.mensa = "MNS"
+
+    MENU.dishes_by_category["Mittagessen"].append("• Schnitzel")
+
+    assert MENU.dishes_by_category["Mittagessen"] == \
+        ["• Pizza Margherita", "• Linsensuppe"]
+
+
+def test_filter_returns_a_new_result():
+    lunch = MENU.filter("Mittagessen")
+
+    assert lunch.categories == ["Mittagessen"]
+    assert MENU.categories == ["Mittagessen", "Abendessen"]
+    assert MENU.filter(["Frühstück"]).dishes == ()
+
+
+def test_find_matches_is_case_insensitive():
+    assert MENU.find_matches(["PIZZA", "spätzle"]) == {
+        "Mittagessen": ["• Pizza Margherita"],
+        "Abendessen": ["• Käsespätzle"],
+    }
+    assert MENU.find_matches("Schnitzel") is None
+    assert match_dishes("suppe", ["• Linsensuppe", "• Salat"]) == \
+        ["• Linsensuppe"]
+    with pytest.raises(TypeError):
+        match_dishes("suppe", "• Linsensuppe")
+
+
+def test_digest_and_equality_survive_pickling():
+    copy = pickle.loads(pickle.dumps(MENU))
+
+    assert copy == MENU and hash(copy) == hash(MENU)
+    assert copy.digest == MENU.digest
+    assert MENU.filter("Mittagessen").digest != MENU.digest
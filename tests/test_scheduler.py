@@ -0,0 +1,84 @@
+from datetime import date, datetime
+
+from lunchhunt.schedule import MensaCalendar, Scheduler
+from lunchhunt.schedule.scheduler import fire_times
+from lunchhunt.scrap import MenuCache, MenuResult
+
+# A Monday
+MONDAY = date(2026, 3, 2)
+
+
+class RecordingScraper:
+    """
+    Scraper stub recording the Mensas it was asked for.
+    """
+
+    def __init__(self):
+        self.fetches: list[str] = []
+
+    def scrape_menu(self, mensa: str) -> MenuResult:
+        self.fetches.append(mensa)
+        return MenuResult.from_dict(
+            mensa=mensa, mensa_name=mensa, location="jena",
+            url=f"http://mensa.local/{mensa}.html",
+            dishes_by_category={"Mittagessen": ["• Pizza"]}
+        )
+
+
+def profile(*mensen: str, hour: int = 11) -> dict:
+    return {
+        "scraper_settings": {
+            "mensen": list(mensen), "menu_categories": ["Mittagessen"]
+        },
+        "schedule_settings": {
+            "hour": hour, "minute": 0, "alarm_days": {"monday": True}
+        },
+    }
+
+
+def at(hour: int, minute: int, second: int = 0) -> datetime:
+    return datetime(MONDAY.year, MONDAY.month, MONDAY.day, hour, minute,
+                    second)
+
+
+def test_fire_times_follow_alarm_days():
+    settings = profile("EAP")["schedule_settings"]
+
+    assert fire_times(settings, at(0, 0), datetime(2026, 3, 15)) == [
+        at(11, 0), datetime(2026, 3, 9, 11)
+    ]
+    assert fire_times({"alarm_days": {"monday": True}}, at(0, 0), at(23, 0)) \
+        == []
+
+
+def test_prefetch_warms_the_cache_once_shortly_before_fire_time():
+    scraper = RecordingScraper()
+    cache = MenuCache()
+    scheduler = Scheduler(
+        {"a.json": profile("EAP", "MNS"), "b.json": profile("MNS")},
+        cache=cache, scraper=scraper, prefetch_window=10, prefetch_lead=2
+    )
+
+    assert scheduler.prefetch(at(10, 50)) == []
+    assert scheduler.prefetch(at(10, 58, 30)) == ["EAP", "MNS"]
+    assert sorted(scraper.fetches) == ["EAP", "MNS"]
+    assert "EAP" in cache and "MNS" in cache
+
+    # The same fire time is not prefetched twice
+    assert scheduler.prefetch(at(10, 59)) == []
+    assert len(scraper.fetches) == 2
+
+
+def test_prefetch_skips_cached_and_closed_mensas():
+    scraper = RecordingScraper()
+    cache = MenuCache()
+    cache.put(RecordingScraper().scrape_menu("EAP"))
+    calendar = MensaCalendar(calendar={})
+    calendar.add_closed_date("CZ", MONDAY)
+    scheduler = Scheduler(
+        {"a.json": profile("EAP", "MNS", "CZ")},
+        cache=cache, scraper=scraper, calendar=calendar
+    )
+
+    assert scheduler.prefetch(at(10, 59)) == ["MNS"]
+    assert scraper.fetches == ["MNS"]
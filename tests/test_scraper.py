@@ -0,0 +1,115 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from lunchhunt.scrap import MensaScraper, NegativeCache
+
+
+@pytest.fixture
+def scraper(http_server):
+    return MensaScraper(
+        base_url=http_server.url,
+        mensa_dict={"TST": ("jena", "test-mensa")}
+    )
+
+
+def test_scrape_menu_filters_categories(http_server, scraper, menu_html):
+    http_server.body = menu_html
+
+    menu = scraper.scrape_menu("TST", "Mittagessen")
+
+    assert http_server.requests[0]["path"] == "/jena/test-mensa.html"
+    assert menu.mensa_name == "Test Mensa"
+    assert menu.dishes_by_category == {
+        "Mittagessen": ["• Pizza Margherita", "• Linsensuppe"]
+    }
+
+
+def test_scrape_menu_rejects_unknown_mensa(scraper):
+    with pytest.raises(ValueError):
+        scraper.scrape_menu("XYZ")
+
+
+def test_concurrent_scrapes_share_one_fetch(http_server, scraper, menu_html):
+    http_server.body = menu_html
+    http_server.delay = 0.3
+    workers = 8
+    start = threading.Barrier(workers)
+
+    def scrape(_):
+        start.wait()
+        return scraper.scrape_menu("TST")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        menus = list(pool.map(scrape, range(workers)))
+
+    assert len(http_server.requests) == 1
+    assert all(menu == menus[0] for menu in menus)
+    assert scraper.fetch_stats() == {
+        "fetches": 1, "coalesced": workers - 1, "negative_hits": 0
+    }
+
+
+def test_failed_fetch_is_negatively_cached(http_server, scraper):
+    http_server.status = 500
+
+    assert scraper.scrape_menu("TST") is None
+    assert scraper.scrape_menu("TST") is None
+
+    assert len(http_server.requests) == 1
+    assert scraper.miss_reason("TST") == NegativeCache.ERROR
+    assert scraper.fetch_stats()["negative_hits"] == 1
+
+
+def test_page_without_menu_is_negatively_cached(http_server, scraper):
+    http_server.body = b"<html><body>Closed</body></html>"
+
+    assert scraper.scrape_menu("TST") is None
+
+    assert scraper.miss_reason("TST") == NegativeCache.EMPTY
+
+
+def test_slow_fetch_times_out_for_all_waiters(http_server, scraper, menu_html):
+    http_server.body = menu_html
+    http_server.delay = 2
+    scraper.timeout = 0.2
+    workers = 4
+    start = threading.Barrier(workers)
+
+    def scrape(_):
+        start.wait()
+        return scraper.scrape_menu("TST")
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        menus = list(pool.map(scrape, range(workers)))
+
+    assert time.monotonic() - started < 1.5
+    assert menus == [None] * workers
+    assert scraper.miss_reason("TST") == NegativeCache.ERROR
+
+
+def test_waiters_give_up_on_a_stuck_fetch(scraper, monkeypatch):
+    scraper.timeout = 0.1
+    scraper.FOLLOWER_MARGIN = 0.1
+    fetching, release = threading.Event(), threading.Event()
+
+    def stuck_fetch(url):
+        fetching.set()
+        release.wait(5)
+        return None
+
+    monkeypatch.setattr(scraper, "fetch_page", stuck_fetch)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        leader = pool.submit(scraper.scrape_menu, "TST")
+        assert fetching.wait(5)
+
+        started = time.monotonic()
+        assert scraper.scrape_menu("TST") is None
+        assert time.monotonic() - started < 1
+        assert scraper.fetch_stats()["coalesced"] == 1
+
+        release.set()
+        assert leader.result() is None
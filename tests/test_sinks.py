@@ -0,0 +1,150 @@
+import json
+import socket
+import time
+
+import pytest
+import requests
+
+from lunchhunt.notify.sinks import (
+    GotifySink,
+    NtfySink,
+    SmtpSink,
+    WebhookSink,
+    build_url,
+    create_sinks,
+)
+from lunchhunt.notify.throttle import SendThrottle
+
+
+def test_build_url_applies_secure_flag():
+    assert build_url("example.org", "/message") == "http://example.org/message"
+    assert build_url("http://example.org:8080", "/", secure=True) == \
+        "https://example.org:8080/"
+
+
+def test_gotify_sink_posts_message_with_token(http_server):
+    sink = GotifySink(http_server.url, "app-token", throttle=SendThrottle())
+
+    sink.send("Lunch", "Pizza at EAP", 7)
+
+    [sent] = http_server.requests
+    assert sent["method"] == "POST"
+    assert sent["path"] == "/message"
+    assert sent["headers"]["X-Gotify-Key"] == "app-token"
+    assert json.loads(sent["body"]) == {
+        "title": "Lunch", "message": "Pizza at EAP", "priority": 7
+    }
+
+
+def test_gotify_sink_raises_on_http_error(http_server):
+    http_server.status = 401
+    sink = GotifySink(http_server.url, "bad-token", throttle=SendThrottle())
+
+    with pytest.raises(requests.HTTPError):
+        sink.send("Lunch", "Pizza", 5)
+
+
+def test_gotify_sink_waits_for_reserved_slot(http_server):
+    sink = GotifySink(
+        http_server.url, "app-token", token_rate=10, throttle=SendThrottle()
+    )
+
+    assert sink.reserve() == 0.0
+    wait = sink.reserve()
+    assert wait == pytest.approx(0.1, abs=0.02)
+
+    started = time.monotonic()
+    sink.send("First", "1", 5)
+    sink.send("Second", "2", 5)
+    assert time.monotonic() - started >= wait - 0.02
+    assert len(http_server.requests) == 2
+
+
+def test_webhook_sink_posts_json_with_headers(http_server):
+    sink = WebhookSink(
+        f"{http_server.url}/hooks/lunch",
+        headers={"Authorization": "Bearer secret"}
+    )
+
+    sink.send("Lunch", "Soup", 3)
+
+    [sent] = http_server.requests
+    assert sent["path"] == "/hooks/lunch"
+    assert sent["headers"]["Authorization"] == "Bearer secret"
+    assert json.loads(sent["body"]) == {
+        "title": "Lunch", "message": "Soup", "priority": 3
+    }
+
+
+def test_ntfy_sink_publishes_to_topic_with_mapped_priority(http_server):
+    sink = NtfySink(http_server.url, "mensa", token="tk")
+
+    sink.send("Mittagessen", "Käsespätzle", 10)
+
+    [sent] = http_server.requests
+    assert sent["path"] == "/"
+    assert sent["headers"]["Authorization"] == "Bearer tk"
+    assert json.loads(sent["body"]) == {
+        "topic": "mensa",
+        "title": "Mittagessen",
+        "message": "Käsespätzle",
+        "priority": 5,
+    }
+
+
+def test_ntfy_sink_sends_no_authorization_without_token(http_server):
+    NtfySink(http_server.url, "mensa").send("Lunch", "Soup", 0)
+
+    [sent] = http_server.requests
+    assert "Authorization" not in sent["headers"]
+    assert json.loads(sent["body"])["priority"] == 1
+
+
+def test_smtp_sink_sends_mail():
+    controller_module = pytest.importorskip("aiosmtpd.controller")
+    handlers = pytest.importorskip("aiosmtpd.handlers")
+
+    class Recorder(handlers.Message):
+        def __init__(self):
+            super().__init__()
+            self.messages = []
+
+        def handle_message(self, message):
+            self.messages.append(message)
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    recorder = Recorder()
+    controller = controller_module.Controller(
+        recorder, hostname="127.0.0.1", port=port
+    )
+    controller.start()
+    try:
+        sink = SmtpSink(
+            "lunch@example.org", "me@example.org", host="127.0.0.1", port=port
+        )
+        sink.send("Lunch", "Pizza at EAP", 5)
+    finally:
+        controller.stop()
+
+    [message] = recorder.messages
+    assert message["Subject"] == "Lunch"
+    assert message["From"] == "lunch@example.org"
+    assert message["To"] == "me@example.org"
+    assert message.get_payload().strip() == "Pizza at EAP"
+
+
+def test_create_sinks_builds_gotify_and_configured_sinks():
+    sinks = create_sinks(
+        {"server_url": "gotify.local", "token": "t", "secure": True},
+        [{"type": "ntfy", "server_url": "ntfy.local", "topic": "mensa"}]
+    )
+
+    assert [sink.name for sink in sinks] == ["gotify", "ntfy-0"]
+    assert sinks[0].server_url == "https://gotify.local/message"
+
+
+def test_create_sinks_rejects_unknown_type():
+    with pytest.raises(ValueError):
+        create_sinks(None, [{"type": "pager"}])
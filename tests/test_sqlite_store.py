@@ -0,0 +1,93 @@
+import json
+import sqlite3
+
+import pytest
+
+from lunchhunt.profiles import SqliteProfileStore
+
+
+def settings(*mensen: str, hour: int = 11) -> dict:
+    return {
+        "scraper_settings": {
+            "favorite_foods": ["Pizza"],
+            "menu_categories": ["Mittagessen"],
+            "mensen": list(mensen),
+        },
+        "schedule_settings": {"hour": hour, "minute": 30},
+    }
+
+
+@pytest.fixture
+def database(tmp_path):
+    return str(tmp_path / "profiles.db")
+
+
+def test_import_directory_indexes_subscriptions_and_schedules(tmp_path):
+    (tmp_path / "a.json").write_text(json.dumps(settings("EAP", "MNS")))
+    (tmp_path / "b.json").write_text(json.dumps(settings("EAP", hour=12)))
+    (tmp_path / "notes.txt").write_text("not a profile")
+    store = SqliteProfileStore(":memory:")
+
+    assert store.import_directory(str(tmp_path)) == 2
+
+    assert store.names() == ["a.json", "b.json"]
+    assert store.get("b.json") == settings("EAP", hour=12)
+    assert store.subscribers("EAP") == ["a.json", "b.json"]
+    assert store.subscribers("MNS", "Mittagessen") == ["a.json"]
+    assert store.scheduled_at(11, 30) == ["a.json"]
+    assert store.search("B") == ["b.json"] and store.count("json") == 2
+
+
+def test_changes_of_other_connections_notify_listeners(database):
+    writer = SqliteProfileStore(database)
+    reader = SqliteProfileStore(database)
+    changes = []
+    reader.subscribe(lambda name, new: changes.append((name, new)))
+
+    writer.save("a.json", settings("EAP"))
+    assert reader.get("a.json") == settings("EAP")
+    assert changes == [("a.json", settings("EAP"))]
+
+    # Reads without changes of other connections notify nothing
+    reader.names()
+    assert len(changes) == 1
+
+    writer.save("a.json", settings("MNS"))
+    writer.delete("a.json")
+    writer.save("b.json", settings("CZ"))
+    reader.all()
+    assert sorted(changes[1:], key=lambda change: change[0]) == [
+        ("a.json", None), ("b.json", settings("CZ"))
+    ]
+
+
+def test_own_writes_are_notified_once(database):
+    store = SqliteProfileStore(database)
+    other = SqliteProfileStore(database)
+    changes = []
+    store.subscribe(lambda name, new: changes.append(name))
+
+    store.save("a.json", settings("EAP"))
+    other.save("b.json", settings("EAP"))
+    store.names()
+
+    assert changes == ["a.json", "b.json"]
+
+
+def test_databases_without_revisions_are_migrated(database):
+    connection = sqlite3.connect(database)
+    connection.executescript(
+        "CREATE TABLE profiles (name TEXT PRIMARY KEY, settings TEXT NOT NULL,"
+        " hour INTEGER, minute INTEGER);"
+    )
+    connection.execute(
+        "INSERT INTO profiles VALUES (?, ?, 11, 30)",
+        ("a.json", json.dumps(settings("EAP")))
+    )
+    connection.commit()
+    connection.close()
+
+    store = SqliteProfileStore(database)
+    store.save("b.json", settings("MNS"))
+
+    assert store.names() == ["a.json", "b.json"]
@@ -0,0 +1,94 @@
+import threading
+import time
+
+import pytest
+
+from lunchhunt.web.tasks import Task, TaskQueue
+
+
+@pytest.fixture
+def tasks(tmp_path):
+    queue = TaskQueue(workers=1, state_dir=str(tmp_path / ".tasks"))
+    yield queue
+    queue.shutdown()
+
+
+def wait_until_finished(tasks: TaskQueue, task_id: str) -> Task:
+    deadline = time.monotonic() + 5
+    while tasks.get(task_id).active and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return tasks.get(task_id)
+
+
+def test_task_reports_progress_and_result(tasks):
+    release = threading.Event()
+    reported = threading.Event()
+
+    def work(progress, name):
+        progress(1, f"Writing {name}...")
+        reported.set()
+        release.wait(5)
+        return f"Saved {name}."
+
+    task_id = tasks.submit("Saving a.json", work, "a.json", total=2)
+    assert reported.wait(5)
+
+    running = tasks.get(task_id)
+    assert (running.status, running.done, running.message) == \
+        (Task.RUNNING, 1, "Writing a.json...")
+    assert running.active and len(tasks) == 1
+
+    release.set()
+    finished = wait_until_finished(tasks, task_id)
+    assert (finished.status, finished.done, finished.message) == \
+        (Task.SUCCEEDED, 2, "Saved a.json.")
+    assert len(tasks) == 0
+
+
+def test_failed_task_keeps_its_progress(tasks):
+    def work(progress):
+        progress(1, "Halfway")
+        raise OSError("disk full")
+
+    task_id = tasks.submit("Saving", work, total=3)
+    failed = wait_until_finished(tasks, task_id)
+
+    assert failed.status == Task.FAILED
+    assert failed.done == 1
+    assert failed.message == "Saving failed: disk full"
+
+
+def test_tasks_are_visible_to_other_queues(tmp_path, tasks):
+    task_id = tasks.submit("Saving", lambda progress: "Done.")
+    wait_until_finished(tasks, task_id)
+
+    other = TaskQueue(state_dir=str(tmp_path / ".tasks"))
+    try:
+        assert other.get(task_id) == tasks.get(task_id)
+        assert other.get("unknown") is None
+    finally:
+        other.shutdown()
+
+
+def test_prune_removes_finished_tasks(tmp_path, tasks):
+    tasks.keep = 0
+    task_id = tasks.submit("Saving", lambda progress: "Done.")
+    wait_until_finished(tasks, task_id)
+
+    tasks.prune()
+
+    assert tasks.get(task_id) is None
+    assert not list((tmp_path / ".tasks").iterdir())
+
+
+@pytest.mark.parametrize("task_id", [
+    "../secret", "../" + "0" * 29, "A" * 32, "0" * 31, "0" * 32 + "\n", 42,
+])
+def test_malformed_task_ids_never_touch_the_state_dir(tmp_path, task_id):
+    (tmp_path / "secret.json").write_text(
+        '{"id": "x", "label": "secret", "status": "succeeded"}'
+    )
+    queue = TaskQueue(state_dir=str(tmp_path / ".tasks"))
+
+    assert queue.get(task_id) is None
+    queue.shutdown()
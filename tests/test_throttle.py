@@ -0,0 +1,101 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from lunchhunt.notify import throttle
+from lunchhunt.notify.throttle import SendThrottle, TokenBucket
+
+
+@pytest.fixture
+def fake_time(monkeypatch, clock):
+    # Sleeping advances the fake clock instead of blocking
+    monkeypatch.setattr(
+        throttle, "time", SimpleNamespace(monotonic=clock, sleep=clock.advance)
+    )
+    return clock
+
+
+def test_token_bucket_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+
+
+def test_token_bucket_allows_burst_then_queues_in_order(fake_time):
+    bucket = TokenBucket(rate=2, burst=2)
+
+    waits = [bucket.reserve() for _ in range(4)]
+
+    assert waits == [0.0, 0.0, 0.5, 1.0]
+
+
+def test_token_bucket_refills_over_time(fake_time):
+    bucket = TokenBucket(rate=1)
+    bucket.reserve()
+
+    fake_time.advance(0.25)
+    assert bucket.reserve() == pytest.approx(0.75)
+
+    fake_time.advance(10)
+    # The refill is capped at the burst
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_token_bucket_update_keeps_reserved_slots(fake_time):
+    bucket = TokenBucket(rate=10, burst=5)
+    for _ in range(5):
+        bucket.reserve()
+
+    bucket.update(rate=1, burst=1)
+
+    assert bucket.reserve() == pytest.approx(1.0)
+    assert bucket.burst == 1
+
+
+def test_send_throttle_limits_server_across_tokens(fake_time):
+    sends = SendThrottle()
+
+    first = sends.acquire("http://gotify", "a", server_rate=1)
+    second = sends.acquire("http://gotify", "b", server_rate=1)
+
+    assert (first, second) == (0.0, 1.0)
+    assert fake_time.now == pytest.approx(1001.0)
+
+
+def test_send_throttle_limits_tokens_separately(fake_time):
+    sends = SendThrottle()
+
+    assert sends.reserve("http://gotify", "a", token_rate=1) == 0.0
+    assert sends.reserve("http://gotify", "b", token_rate=1) == 0.0
+    assert sends.reserve("http://gotify", "a", token_rate=1) == 1.0
+
+
+def test_send_throttle_without_limits_never_waits(fake_time):
+    sends = SendThrottle()
+
+    assert [sends.reserve("http://gotify", "a") for _ in range(3)] == \
+        [0.0, 0.0, 0.0]
+
+
+def test_send_throttle_applies_stricter_conflicting_limit(fake_time, caplog):
+    sends = SendThrottle()
+    sends.reserve("http://gotify", "a", token_rate=10)
+
+    with caplog.at_level(logging.WARNING, logger=throttle.__name__):
+        wait = sends.reserve("http://gotify", "a", token_rate=1)
+        sends.reserve("http://gotify", "a", token_rate=1)
+
+    assert wait == pytest.approx(1.0)
+    # Logged once per conflicting limit
+    assert len(caplog.records) == 1
+
+
+def test_send_throttle_records_wait_stats(fake_time):
+    sends = SendThrottle()
+    for _ in range(3):
+        sends.acquire("http://gotify", "a", token_rate=2)
+
+    assert sends.wait_stats() == {
+        "count": 3, "total": 1.0, "mean": pytest.approx(1 / 3), "max": 0.5
+    }
@@ -0,0 +1,85 @@
+import pytest
+
+from lunchhunt.web import LunchHuntApp
+
+# States of the save callback, in callback order
+SAVE_STATES = [
+    ("favorite-foods-list", "data"), ("menu-categories-dropdown", "value"),
+    ("offset-input", "value"), ("mensen-dropdown", "value"),
+    ("hour-input", "value"), ("minute-input", "value"),
+    ("alarm-days-map", "data"), ("server-url", "value"), ("token", "value"),
+    ("priority-input", "value"), ("secure-switch", "value"),
+    ("settings-file", "value"),
+]
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = LunchHuntApp(
+        settings_dir=str(tmp_path), refresh_interval=None, cron_jitter=0
+    )
+    yield app
+    app.tasks.shutdown()
+
+
+def save(app: LunchHuntApp, favorite_foods, alarm_days) -> dict:
+    values = [
+        favorite_foods, ["Mittagessen"], 30, ["EAP"], 11, 0, alarm_days,
+        "gotify.local", "t", 5, False, "me",
+    ]
+    response = app.app.server.test_client().post(
+        "/_dash-update-component",
+        json={
+            "output": "..save-output.children...save-task.data..",
+            "outputs": [
+                {"id": "save-output", "property": "children"},
+                {"id": "save-task", "property": "data"},
+            ],
+            "inputs": [
+                {"id": "save-settings", "property": "n_clicks", "value": 1}
+            ],
+            "state": [
+                {"id": id_, "property": prop, "value": value}
+                for (id_, prop), value in zip(SAVE_STATES, values)
+            ],
+            "changedPropIds": ["save-settings.n_clicks"],
+        }
+    )
+    assert response.status_code == 200
+    return response.json["response"]
+
+
+@pytest.mark.parametrize("favorite_foods, alarm_days, error", [
+    ("Pizza", {"monday": True}, "Favorite foods"),
+    (["Pizza", 3], {"monday": True}, "Favorite foods"),
+    (["Pizza"], ["monday"], "Alarm days"),
+    (["Pizza"], {"funday": True}, "Alarm days"),
+    (["Pizza"], {"monday": "yes"}, "Alarm days"),
+])
+def test_save_rejects_malformed_browser_values(
+        app, favorite_foods, alarm_days, error
+):
+    response = save(app, favorite_foods, alarm_days)
+
+    assert response["save-output"]["children"].startswith(error)
+    assert response["save-task"]["data"] is None
+    assert app.profiles.names() == []
+
+
+def test_form_values_fall_back_to_defaults(app):
+    defaults = app.form_values({})
+
+    values = app.form_values({
+        "scraper_settings": {"favorite_foods": ["Pizza", "Suppe"]},
+        "schedule_settings": {
+            "hour": 7, "alarm_days": {"monday": True, "friday": False}
+        },
+        "settings_file": "me.json",
+    })
+
+    assert set(values) == set(LunchHuntApp.FORM_FIELDS)
+    assert values["favorite_food"] == "Pizza; Suppe"
+    assert (values["hour"], values["minute"]) == (7, defaults["minute"])
+    assert values["alarm_days"] == ["monday"]
+    assert values["settings_file"] == "me"
+    assert values["mensa"] == defaults["mensa"]